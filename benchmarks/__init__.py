@@ -0,0 +1,23 @@
+"""
+Пакет benchmarks: воспроизводимые замеры производительности.
+
+- generator: синтетические схемы заданного размера и пары (A, B) с мутациями
+- run: прогон конвейера по этапам с выводом в JSON Lines
+- startup: холодный старт CLI и бюджет времени импорта
+
+Запуск:
+    python -m benchmarks.run --tables 100 1000 10000 --out bench.jsonl
+    python -m benchmarks.startup
+"""
+
+from .generator import (
+    MutationSpec,
+    SchemaSpec,
+    SyntheticSchemaGenerator,
+)
+
+__all__ = [
+    "MutationSpec",
+    "SchemaSpec",
+    "SyntheticSchemaGenerator",
+]
@@ -0,0 +1,273 @@
+"""
+benchmarks/generator.py
+
+Генератор синтетических схем PostgreSQL для замеров производительности.
+
+Схема A строится по SchemaSpec (число таблиц/колонок/FK, распределение
+входящих FK по таблицам, доля «обратных» ссылок), схема B — из A
+применением MutationSpec (удаления, смена типов, NOT NULL и т.д.).
+Генерация детерминирована: одинаковые spec и seed дают одинаковый SQL.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+# Типы колонок: (тип, вес). Смена типа выбирает другой тип из этого же списка.
+COLUMN_TYPES: List[Tuple[str, int]] = [
+    ("INTEGER", 6),
+    ("BIGINT", 3),
+    ("SMALLINT", 1),
+    ("VARCHAR(50)", 2),
+    ("VARCHAR(100)", 4),
+    ("VARCHAR(255)", 2),
+    ("TEXT", 4),
+    ("NUMERIC(10, 2)", 2),
+    ("BOOLEAN", 2),
+    ("DATE", 1),
+    ("TIMESTAMP", 2),
+    ("UUID", 1),
+]
+
+
+@dataclass
+class SchemaSpec:
+    """
+    Параметры исходной схемы.
+
+    fk_skew — показатель степени распределения Ципфа для выбора таблицы,
+    на которую ссылается FK: 0 — равномерно, 1 и больше — несколько
+    «хабов» (users, accounts...) собирают большую часть ссылок (fan-in).
+    max_fk_per_table ограничивает число исходящих FK таблицы (fan-out).
+    cycle_density — доля FK, ссылающихся на таблицы, объявленные позже;
+    при 0 граф ссылок ацикличен, при > 0 появляются циклы между таблицами.
+    """
+
+    tables: int = 100
+    columns_per_table: int = 8
+    foreign_keys: int = 150
+    fk_skew: float = 1.0
+    max_fk_per_table: int = 5
+    cycle_density: float = 0.0
+    table_level_fk_share: float = 0.3
+    unique_share: float = 0.05
+    not_null_share: float = 0.4
+    seed: int = 0
+
+
+@dataclass
+class MutationSpec:
+    """
+    Доли изменений при получении схемы B из A (от числа таблиц,
+    колонок или FK соответственно).
+    """
+
+    drop_tables: float = 0.01
+    add_tables: float = 0.01
+    drop_columns: float = 0.02
+    add_columns: float = 0.02
+    type_changes: float = 0.02
+    not_null_additions: float = 0.02
+    drop_foreign_keys: float = 0.01
+    seed: int = 1
+
+
+@dataclass
+class ColumnDef:
+    name: str
+    data_type: str
+    primary_key: bool = False
+    unique: bool = False
+    not_null: bool = False
+    references: Optional[str] = None  # имя таблицы (ссылка на её id)
+    table_level_fk: bool = False
+
+
+@dataclass
+class TableDef:
+    name: str
+    columns: List[ColumnDef] = field(default_factory=list)
+
+    def copy(self) -> "TableDef":
+        return TableDef(self.name, [ColumnDef(**vars(c)) for c in self.columns])
+
+
+class SyntheticSchemaGenerator:
+    """
+    Строит модель схемы (список TableDef), мутирует её и выводит SQL.
+    """
+
+    def __init__(self, spec: Optional[SchemaSpec] = None):
+        self.spec = spec or SchemaSpec()
+
+    # ==========================================================
+    # СХЕМА A
+    # ==========================================================
+
+    def generate(self) -> List[TableDef]:
+        spec = self.spec
+        rnd = random.Random(spec.seed)
+        n = spec.tables
+
+        types = [t for t, _ in COLUMN_TYPES]
+        type_weights = list(itertools.accumulate(w for _, w in COLUMN_TYPES))
+
+        tables: List[TableDef] = []
+        for i in range(n):
+            table = TableDef(f"t{i:06d}")
+            table.columns.append(ColumnDef("id", "INTEGER", primary_key=True))
+            for j in range(1, spec.columns_per_table):
+                table.columns.append(ColumnDef(
+                    f"c{j:03d}",
+                    rnd.choices(types, cum_weights=type_weights)[0],
+                    unique=rnd.random() < spec.unique_share,
+                    not_null=rnd.random() < spec.not_null_share,
+                ))
+            tables.append(table)
+
+        self._add_foreign_keys(tables, rnd)
+        return tables
+
+    def _add_foreign_keys(self, tables: List[TableDef], rnd: random.Random) -> None:
+        spec = self.spec
+        n = len(tables)
+        if n < 2 or spec.foreign_keys <= 0:
+            return
+
+        # Ципф по порядку объявления: ранние таблицы — «хабы»
+        cum = list(itertools.accumulate(1.0 / (rank ** spec.fk_skew) for rank in range(1, n + 1)))
+        fan_out = [0] * n
+
+        for k in range(spec.foreign_keys):
+            src = rnd.randrange(1, n)
+            if fan_out[src] >= spec.max_fk_per_table:
+                continue
+
+            if rnd.random() < spec.cycle_density and src < n - 1:
+                # ссылка «вперёд» — на таблицу, объявленную позже
+                dst = bisect.bisect_right(cum, rnd.uniform(cum[src], cum[-1]))
+            else:
+                dst = bisect.bisect_right(cum, rnd.uniform(0, cum[src - 1]))
+            dst = min(dst, n - 1)
+            if dst == src:
+                continue
+
+            fan_out[src] += 1
+            tables[src].columns.append(ColumnDef(
+                f"{tables[dst].name}_id_{k}",
+                "INTEGER",
+                references=tables[dst].name,
+                table_level_fk=rnd.random() < spec.table_level_fk_share,
+            ))
+
+    # ==========================================================
+    # СХЕМА B
+    # ==========================================================
+
+    def mutate(self, tables: List[TableDef], mutation: Optional[MutationSpec] = None) -> List[TableDef]:
+        """
+        Возвращает изменённую копию модели. Исходная модель не меняется.
+        """
+        m = mutation or MutationSpec()
+        rnd = random.Random(m.seed)
+        result = [t.copy() for t in tables]
+
+        def pick(items: List, share: float) -> List:
+            k = min(len(items), int(round(len(items) * share)))
+            return rnd.sample(items, k) if k else []
+
+        # --- удаление таблиц ---
+        dropped = {t.name for t in pick(result, m.drop_tables)}
+        result = [t for t in result if t.name not in dropped]
+
+        columns = [(t, c) for t in result for c in t.columns if not c.primary_key]
+        fk_columns = [(t, c) for t, c in columns if c.references]
+        plain_columns = [(t, c) for t, c in columns if not c.references]
+
+        # --- удаление FK (колонка остаётся) ---
+        for _, c in pick(fk_columns, m.drop_foreign_keys):
+            c.references = None
+
+        # --- смена типов ---
+        types = [t for t, _ in COLUMN_TYPES]
+        for _, c in pick(plain_columns, m.type_changes):
+            c.data_type = rnd.choice([t for t in types if t != c.data_type])
+
+        # --- NOT NULL ---
+        nullable = [(t, c) for t, c in plain_columns if not c.not_null]
+        for _, c in pick(nullable, m.not_null_additions):
+            c.not_null = True
+
+        # --- удаление колонок ---
+        removed: Dict[str, set] = {}
+        for t, c in pick(columns, m.drop_columns):
+            removed.setdefault(t.name, set()).add(c.name)
+        for t in result:
+            if t.name in removed:
+                t.columns = [c for c in t.columns if c.name not in removed[t.name]]
+
+        # --- новые колонки ---
+        for k, t in enumerate(pick(result, m.add_columns)):
+            t.columns.append(ColumnDef(f"added_{k:04d}", rnd.choice(types)))
+
+        # --- новые таблицы ---
+        for k in range(int(round(len(tables) * m.add_tables))):
+            result.append(TableDef(f"new_{k:06d}", [
+                ColumnDef("id", "INTEGER", primary_key=True),
+                ColumnDef("payload", "TEXT"),
+            ]))
+
+        return result
+
+    # ==========================================================
+    # SQL
+    # ==========================================================
+
+    @staticmethod
+    def render(tables: List[TableDef]) -> str:
+        parts: List[str] = []
+
+        for t in tables:
+            lines: List[str] = []
+            table_fks: List[str] = []
+
+            for c in t.columns:
+                line = f"    {c.name} {c.data_type}"
+                if c.primary_key:
+                    line += " PRIMARY KEY"
+                if c.not_null:
+                    line += " NOT NULL"
+                if c.unique:
+                    line += " UNIQUE"
+                if c.references:
+                    if c.table_level_fk:
+                        table_fks.append(f"    FOREIGN KEY ({c.name}) REFERENCES {c.references}(id)")
+                    else:
+                        line += f" REFERENCES {c.references}(id)"
+                lines.append(line)
+
+            body = ",\n".join(lines + table_fks)
+            parts.append(f"CREATE TABLE {t.name} (\n{body}\n);\n")
+
+        return "\n".join(parts)
+
+    def generate_pair(self, mutation: Optional[MutationSpec] = None) -> Tuple[str, str]:
+        """(sql_a, sql_b) для одного прогона."""
+        tables_a = self.generate()
+        tables_b = self.mutate(tables_a, mutation)
+        return self.render(tables_a), self.render(tables_b)
+
+
+__all__ = [
+    "COLUMN_TYPES",
+    "SchemaSpec",
+    "MutationSpec",
+    "ColumnDef",
+    "TableDef",
+    "SyntheticSchemaGenerator",
+]
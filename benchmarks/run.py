@@ -0,0 +1,206 @@
+"""
+benchmarks/run.py
+
+Замеры конвейера на синтетических схемах.
+
+Для каждого размера генерируется пара схем (A, B), затем N раз выполняется
+полный прогон: MigrationConflictDetector.detect (токенизация, парсинг,
+построение графов, сравнение, правила) и Reporter.export. По каждому
+этапу берётся медиана и минимум по повторам.
+
+Результаты пишутся в JSON Lines (одна строка на размер и этап), поэтому
+прогоны разных версий можно сравнивать:
+
+    python -m benchmarks.run --tables 100 1000 5000 --out bench.jsonl
+    python -m benchmarks.run --tables 100 1000 5000 --baseline bench.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.generator import MutationSpec, SchemaSpec, SyntheticSchemaGenerator
+from src.detection import MigrationConflictDetector, Reporter
+from src.utils.instrumentation import write_jsonl
+
+
+# Этапы верхнего уровня (без вложенных) — их CPU суммируется в total
+_TOP_LEVEL = ("cache", "parsing", "graph_building", "comparison", "rules", "report.export")
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_once(sql_a: str, sql_b: str, config: Dict[str, Any], export_format: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Один полный прогон. Возвращает метрики по этапам (формат Instrumentation.summary).
+    """
+    detector = MigrationConflictDetector(dict(config))
+    reporter = Reporter()
+
+    t0 = time.perf_counter()
+    report = detector.detect(sql_a, sql_b)
+    if "error" in report:
+        raise RuntimeError(report["error"]["message"])
+
+    with detector.instrumentation.stage("report.export") as st:
+        output = reporter.export(report, format=export_format)
+        st.count(bytes=len(output))
+
+    stages = detector.instrumentation.summary()
+    stages["total"] = {
+        "calls": 1,
+        "wall_time": time.perf_counter() - t0,
+        "cpu_time": sum(m["cpu_time"] for name, m in stages.items() if name in _TOP_LEVEL),
+        "counts": {"conflicts": report["summary"]["total_conflicts"]},
+    }
+    return stages
+
+
+def aggregate(runs: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Медиана/минимум по повторам для каждого этапа."""
+    result: Dict[str, Dict[str, Any]] = {}
+    for name in runs[0]:
+        samples = [r[name] for r in runs if name in r]
+        wall = [s["wall_time"] for s in samples]
+        cpu = [s["cpu_time"] for s in samples]
+        entry: Dict[str, Any] = {
+            "wall_median": statistics.median(wall),
+            "wall_min": min(wall),
+            "cpu_median": statistics.median(cpu),
+        }
+        peaks = [s["peak_memory"] for s in samples if "peak_memory" in s]
+        if peaks:
+            entry["peak_memory"] = max(peaks)
+        if "counts" in samples[0]:
+            entry["counts"] = samples[0]["counts"]
+        result[name] = entry
+    return result
+
+
+def load_results(path: str) -> Dict[tuple, Dict[str, Any]]:
+    results: Dict[tuple, Dict[str, Any]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                r = json.loads(line)
+                results[(r["tables"], r["stage"])] = r
+    return results
+
+
+def print_comparison(records: List[Dict[str, Any]], baseline: Dict[tuple, Dict[str, Any]]) -> None:
+    print(f"{'tables':>8}  {'stage':<20} {'base, s':>10} {'now, s':>10} {'ratio':>7}")
+    for r in records:
+        base = baseline.get((r["tables"], r["stage"]))
+        if not base or not base["wall_median"]:
+            continue
+        ratio = r["wall_median"] / base["wall_median"]
+        print(f"{r['tables']:>8}  {r['stage']:<20} {base['wall_median']:>10.4f} {r['wall_median']:>10.4f} {ratio:>6.2f}x")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Бенчмарк конвейера на синтетических схемах")
+    parser.add_argument("--tables", type=int, nargs="+", default=[100, 1000], help="Размеры схем (число таблиц)")
+    parser.add_argument("--columns", type=int, default=8, help="Колонок на таблицу")
+    parser.add_argument("--fk-ratio", type=float, default=1.5, help="Число FK на таблицу (в среднем)")
+    parser.add_argument("--fk-skew", type=float, default=1.0, help="Перекос fan-in (показатель Ципфа)")
+    parser.add_argument("--max-fk-per-table", type=int, default=5, help="Ограничение fan-out")
+    parser.add_argument("--cycle-density", type=float, default=0.0, help="Доля FK «вперёд» (циклы)")
+    parser.add_argument("--mutation-rate", type=float, default=0.02, help="Доля изменений каждого вида в B")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Повторов на размер")
+    parser.add_argument("--format", default="json", choices=["json", "text", "markdown", "html"],
+                        help="Формат Reporter.export")
+    parser.add_argument("--trace-memory", action="store_true", help="Пик памяти по этапам (tracemalloc)")
+    parser.add_argument("--out", help="Дописать результаты в файл JSON Lines")
+    parser.add_argument("--baseline", help="Сравнить с результатами из файла JSON Lines")
+    parser.add_argument("--dump-dir", help="Сохранить сгенерированные схемы в каталог")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    context = {
+        "timestamp": datetime.now().isoformat(),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    config = {"trace_memory": args.trace_memory}
+
+    records: List[Dict[str, Any]] = []
+
+    for n in args.tables:
+        schema_spec = SchemaSpec(
+            tables=n,
+            columns_per_table=args.columns,
+            foreign_keys=int(n * args.fk_ratio),
+            fk_skew=args.fk_skew,
+            max_fk_per_table=args.max_fk_per_table,
+            cycle_density=args.cycle_density,
+            seed=args.seed,
+        )
+        r = args.mutation_rate
+        mutation_spec = MutationSpec(
+            drop_tables=r / 2, add_tables=r / 2, drop_columns=r, add_columns=r,
+            type_changes=r, not_null_additions=r, drop_foreign_keys=r / 2, seed=args.seed + 1,
+        )
+
+        sql_a, sql_b = SyntheticSchemaGenerator(schema_spec).generate_pair(mutation_spec)
+
+        if args.dump_dir:
+            dump = Path(args.dump_dir)
+            dump.mkdir(parents=True, exist_ok=True)
+            (dump / f"schema_a_{n}.sql").write_text(sql_a, encoding="utf-8")
+            (dump / f"schema_b_{n}.sql").write_text(sql_b, encoding="utf-8")
+
+        runs = [run_once(sql_a, sql_b, config, args.format) for _ in range(max(1, args.repeat))]
+
+        for stage, metrics in aggregate(runs).items():
+            records.append({
+                **context,
+                "tables": n,
+                "sql_bytes": len(sql_a) + len(sql_b),
+                "schema": asdict(schema_spec),
+                "mutation": asdict(mutation_spec),
+                "repeat": len(runs),
+                "stage": stage,
+                **metrics,
+            })
+
+        total = next(rec for rec in records if rec["tables"] == n and rec["stage"] == "total")
+        print(f"tables={n}: total {total['wall_median']:.3f}s (median of {len(runs)})", file=sys.stderr)
+
+    if args.out:
+        write_jsonl(records, args.out)
+    else:
+        write_jsonl(records, sys.stdout)
+
+    if args.baseline:
+        print_comparison(records, load_results(args.baseline))
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
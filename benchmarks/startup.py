@@ -0,0 +1,173 @@
+"""
+benchmarks/startup.py
+
+Замер холодного старта CLI и бюджет времени импорта.
+
+Каждый сценарий запускается в новом интерпретаторе с -X importtime
+(N раз, берётся медиана). Время импорта — сумма cumulative-времени
+модулей верхнего уровня за вычетом старта пустого интерпретатора
+(python -c pass), поэтому не зависит от site и кодеков.
+
+Для каждого сценария есть бюджет (мс). Если медиана его превышает,
+код возврата 1 — бюджет можно проверять в CI и в pre-commit:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 9 --budget help=40 --out startup.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.generator import SchemaSpec, SyntheticSchemaGenerator
+from src.utils.instrumentation import write_jsonl
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Сценарий: (аргументы интерпретатора, бюджет импорта по умолчанию, мс).
+# Бюджет — около 1.5× измеренной медианы: запас на шум машины CI.
+# {a}/{b} подставляются путями к маленьким сгенерированным схемам.
+SCENARIOS: Dict[str, Tuple[List[str], float]] = {
+    "help": (["main.py", "--help"], 60.0),
+    "client": (["-c", "from src.detection import DetectorClient"], 90.0),
+    "parser": (["-c", "from src.parser import SQLParser"], 80.0),
+    "detector": (["-c", "from src.detection import MigrationConflictDetector as D; D()"], 150.0),
+    "gate": (["main.py", "--gate", "--a", "{a}", "--b", "{b}"], 150.0),
+}
+
+
+def parse_importtime(stderr: str) -> Tuple[float, int]:
+    """
+    Разбирает вывод -X importtime: (сумма cumulative модулей верхнего
+    уровня, мс; число импортированных модулей).
+    """
+    total_us = 0
+    modules = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # заголовок таблицы
+        modules += 1
+        name = fields[2]
+        # вложенные импорты сдвинуты вправо и уже учтены в cumulative родителя
+        if len(name) - len(name.lstrip()) <= 1:
+            total_us += int(fields[1])
+    return total_us / 1000.0, modules
+
+
+def run_scenario(args: List[str]) -> Dict[str, float]:
+    """Один холодный запуск: время импорта, число модулей и wall-time процесса."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - t0
+    # --gate возвращает 1, если слияние заблокировано; это не ошибка запуска
+    if proc.returncode not in (0, 1):
+        raise RuntimeError(f"{' '.join(args)}: код {proc.returncode}\n{proc.stderr[-2000:]}")
+
+    import_ms, modules = parse_importtime(proc.stderr)
+    return {"import_ms": import_ms, "modules": modules, "wall_ms": wall * 1000.0}
+
+
+def measure(args: List[str], repeat: int) -> Dict[str, float]:
+    runs = [run_scenario(args) for _ in range(max(1, repeat))]
+    return {
+        "import_ms": statistics.median(r["import_ms"] for r in runs),
+        "wall_ms": statistics.median(r["wall_ms"] for r in runs),
+        "modules": statistics.median(r["modules"] for r in runs),
+    }
+
+
+def parse_budgets(values: List[str]) -> Dict[str, float]:
+    budgets = {name: budget for name, (_, budget) in SCENARIOS.items()}
+    for value in values:
+        name, sep, ms = value.partition("=")
+        if not sep or name not in SCENARIOS:
+            raise ValueError(f"Некорректный бюджет: {value} (ожидается сценарий=мс)")
+        budgets[name] = float(ms)
+    return budgets
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Холодный старт CLI и бюджет времени импорта")
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS),
+                        help="Сценарии (по умолчанию — все)")
+    parser.add_argument("--repeat", type=int, default=5, help="Запусков на сценарий")
+    parser.add_argument("--budget", nargs="+", default=[], metavar="NAME=MS",
+                        help="Переопределить бюджет импорта сценария, мс")
+    parser.add_argument("--tables", type=int, default=10, help="Размер схем для сценария gate")
+    parser.add_argument("--out", help="Дописать результаты в файл JSON Lines")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        budgets = parse_budgets(args.budget)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    context = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sql_a, sql_b = SyntheticSchemaGenerator(SchemaSpec(tables=args.tables, seed=0)).generate_pair()
+        paths = {"a": Path(tmp) / "schema_a.sql", "b": Path(tmp) / "schema_b.sql"}
+        paths["a"].write_text(sql_a, encoding="utf-8")
+        paths["b"].write_text(sql_b, encoding="utf-8")
+
+        baseline = measure(["-c", "pass"], args.repeat)
+
+        records: List[Dict] = []
+        for name in args.scenario:
+            scenario_args = [arg.format(**paths) for arg in SCENARIOS[name][0]]
+            m = measure(scenario_args, args.repeat)
+            import_ms = max(0.0, m["import_ms"] - baseline["import_ms"])
+            records.append({
+                **context,
+                "scenario": name,
+                "repeat": args.repeat,
+                "import_ms": import_ms,
+                "modules": m["modules"] - baseline["modules"],
+                "wall_ms": m["wall_ms"],
+                "budget_ms": budgets[name],
+                "over_budget": import_ms > budgets[name],
+            })
+
+    print(f"{'scenario':<10} {'import, ms':>11} {'budget':>8} {'modules':>8} {'wall, ms':>9}", file=sys.stderr)
+    for r in records:
+        mark = "  OVER" if r["over_budget"] else ""
+        print(
+            f"{r['scenario']:<10} {r['import_ms']:>11.1f} {r['budget_ms']:>8.0f} "
+            f"{r['modules']:>8.0f} {r['wall_ms']:>9.1f}{mark}",
+            file=sys.stderr,
+        )
+
+    if args.out:
+        write_jsonl(records, args.out)
+
+    return 1 if any(r["over_budget"] for r in records) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,16 +7,33 @@ main.py
     python main.py --a schema_a.sql --b schema_b.sql
     python main.py --a schema_a.sql --b schema_b.sql --format markdown
     python main.py --a schema_a.sql --b schema_b.sql --format html --out report.html
+    python main.py --a dump_a.sql --b dump_b.sql --stream
+    python main.py --a schema_a.sql --b schema_b.sql --cache-dir .schema_cache
+    python main.py --a base.sql --b branch1.sql branch2.sql --out-dir reports/
+    python main.py --a base.sql --b "branches/*.sql" --jobs 4 --out-dir reports/
+    python main.py --a schema_a.sql --b schema_b.sql --metrics perf.jsonl --trace-memory
+    python main.py --a schema_a.sql --impact users public.orders.user_id
+    python main.py --a schema_a.sql --b schema_b.sql --gate
+    python main.py --serve --cache-dir .schema_cache
+    python main.py --connect --a schema_a.sql --b schema_b.sql --gate
 """
 
 from __future__ import annotations
 
 import argparse
+import glob
+import json
+import signal
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from src.detection.orchestrator import MigrationConflictDetector
-from src.detection import Reporter
+from src.core.constants import DEFAULT_SERVER_ADDRESS as DEFAULT_ADDRESS
+
+# Детектор, репортёр и клиент импортируются в ветках, которые их используют:
+# --help и --connect не загружают парсер, графы и правила
+if TYPE_CHECKING:
+    from src.detection import MigrationConflictDetector, Reporter
 
 
 def parse_args() -> argparse.Namespace:
@@ -26,14 +43,13 @@ def parse_args() -> argparse.Namespace:
 
     parser.add_argument(
         "--a",
-        required=True,
         help="SQL-файл исходной схемы (schema A)",
     )
 
     parser.add_argument(
         "--b",
-        required=True,
-        help="SQL-файл целевой схемы (schema B)",
+        nargs="+",
+        help="SQL-файл целевой схемы (schema B); несколько файлов или glob — пакетный режим",
     )
 
     parser.add_argument(
@@ -48,7 +64,107 @@ def parse_args() -> argparse.Namespace:
         help="Файл для сохранения отчёта (если не указан — вывод в stdout)",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Потоковое чтение схем блоками (для больших дампов: файл не загружается в память целиком)",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Каталог дискового кэша разобранных схем (повторный анализ той же схемы без парсинга)",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Пакетный режим: число процессов (по умолчанию — число CPU)",
+    )
+
+    parser.add_argument(
+        "--out-dir",
+        help="Пакетный режим: каталог для отчётов по кандидатам и aggregate.json",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        help="Дописать замеры по этапам и правилам в файл JSON Lines",
+    )
+
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Замерять пик памяти по этапам (tracemalloc; замедляет анализ)",
+    )
+
+    parser.add_argument(
+        "--gate",
+        action="store_true",
+        help="Проверка слияния (CI): правила до первого критического конфликта, "
+             "краткий вердикт в JSON; код возврата 1, если слияние заблокировано",
+    )
+
+    parser.add_argument(
+        "--impact",
+        nargs="+",
+        metavar="OBJECT",
+        help="Радиус поражения: что транзитивно затронет удаление объектов схемы A "
+             "(table, schema.table, table.column, schema.table.column); --b не нужен",
+    )
+
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const=DEFAULT_ADDRESS,
+        metavar="ADDRESS",
+        help="Запустить сервер с тёплыми графами схем: host:port на localhost "
+             f"или unix:/path/to.sock (по умолчанию {DEFAULT_ADDRESS})",
+    )
+
+    parser.add_argument(
+        "--connect",
+        nargs="?",
+        const=DEFAULT_ADDRESS,
+        metavar="ADDRESS",
+        help="Выполнить анализ на запущенном сервере (--serve) вместо текущего процесса "
+             f"(по умолчанию {DEFAULT_ADDRESS})",
+    )
+
+    args = parser.parse_args()
+    if args.serve:
+        return args
+    if args.connect and args.cache_dir:
+        parser.error("--cache-dir задаётся при запуске сервера (--serve), а не в --connect")
+    if not args.a:
+        parser.error("требуется --a")
+    if not args.b and not args.impact:
+        parser.error("требуется --b или --impact")
+    if args.gate and args.b and (len(args.b) > 1 or is_glob(args.b[0])):
+        parser.error("--gate принимает одну схему --b")
+    return args
+
+
+def is_glob(pattern: str) -> bool:
+    return any(ch in pattern for ch in "*?[")
+
+
+def expand_candidates(patterns: List[str]) -> List[str]:
+    """
+    Раскрывает glob-шаблоны в --b (для оболочек, которые их не раскрывают).
+    Один файл, указанный несколько раз (явно и шаблоном, разными путями),
+    анализируется один раз — остаётся первое вхождение.
+    """
+    paths: List[str] = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if is_glob(pattern) else [pattern]
+        for path in matches:
+            resolved = Path(path).resolve()
+            if resolved in seen:
+                continue
+            seen.add(resolved)
+            paths.append(path)
+    return paths
 
 
 def read_sql_file(path: str) -> str:
@@ -59,28 +175,205 @@ def read_sql_file(path: str) -> str:
         raise RuntimeError(f"Не удалось прочитать файл {path}: {e}")
 
 
+def run_batch(args: argparse.Namespace, detector: MigrationConflictDetector, reporter: Reporter) -> int:
+    from src.utils.instrumentation import summary_records, write_jsonl
+
+    paths_b = expand_candidates(args.b)
+    if not paths_b:
+        print("Не найдено ни одной схемы-кандидата", file=sys.stderr)
+        return 1
+
+    aggregate = detector.detect_batch(args.a, paths_b, max_workers=args.jobs)
+
+    if "error" in aggregate:
+        print(f"Критическая ошибка анализа: {aggregate['error']['message']}", file=sys.stderr)
+        return 1
+
+    reports = aggregate.pop("reports")
+
+    if args.metrics:
+        write_jsonl(summary_records(aggregate["performance"]["stages"], schema_a=args.a), args.metrics)
+        for path_b, report in zip(paths_b, reports):
+            stages = report.get("performance", {}).get("stages", {})
+            write_jsonl(summary_records(stages, schema_a=args.a, schema_b=path_b), args.metrics)
+
+    if args.out_dir:
+        out_dir = Path(args.out_dir)
+        ext = {"json": "json", "text": "txt", "markdown": "md", "html": "html"}[args.format]
+
+        for i, (path_b, report) in enumerate(zip(paths_b, reports)):
+            out_file = out_dir / f"{i:03d}_{Path(path_b).stem}.{ext}"
+            reporter.export(report, format=args.format, output_file=out_file)
+            aggregate["candidates"][i]["report"] = str(out_file)
+
+        aggregate_file = out_dir / "aggregate.json"
+        aggregate_file.write_text(json.dumps(aggregate, indent=2, ensure_ascii=False), encoding="utf-8")
+    else:
+        aggregate["reports"] = reports
+
+    output = json.dumps(aggregate, indent=2, ensure_ascii=False)
+    if args.out:
+        Path(args.out).write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+    return 0
+
+
+def run_gate(args: argparse.Namespace, detector: MigrationConflictDetector) -> int:
+    path_b = args.b[0]
+
+    try:
+        if args.stream:
+            verdict = detector.gate_files(args.a, path_b)
+        else:
+            verdict = detector.gate(read_sql_file(args.a), read_sql_file(path_b))
+    except Exception as e:
+        print(f"Критическая ошибка анализа: {e}", file=sys.stderr)
+        return 1
+
+    if args.metrics:
+        detector.instrumentation.export_jsonl(args.metrics, schema_a=args.a, schema_b=path_b)
+
+    output = json.dumps(verdict, indent=2, ensure_ascii=False)
+    if args.out:
+        Path(args.out).write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+    return 1 if verdict["summary"]["merge_blocked"] else 0
+
+
+def run_impact(args: argparse.Namespace, detector: MigrationConflictDetector) -> int:
+    report = detector.impact_file(args.a, args.impact)
+
+    if "error" in report:
+        print(f"Критическая ошибка анализа: {report['error']['message']}", file=sys.stderr)
+        return 1
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        Path(args.out).write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+    return 0 if not report["not_found"] else 1
+
+
+REPORTER_CONFIG = {
+    "tool_name": "PostgreSQL Migration Conflict Detector",
+    "version": "1.0.0",
+    "author": "Студентка СПбПУ",
+}
+
+
+def run_server(args: argparse.Namespace, config: Dict[str, Any]) -> int:
+    from src.detection.server import DetectorServer, DetectorService
+
+    server = DetectorServer(DetectorService(config, REPORTER_CONFIG), args.serve)
+    print(f"Сервер детектора: {server.url}", file=sys.stderr)
+
+    # SIGTERM — штатная остановка: serve_forever закрывает сокет
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_client(args: argparse.Namespace, config: Dict[str, Any]) -> int:
+    """
+    Тонкий клиент: запрос уходит серверу (--serve), пути передаются
+    абсолютными — сервер читает файлы сам.
+    """
+    if args.b and (len(args.b) > 1 or is_glob(args.b[0])):
+        print("Пакетный режим через сервер не поддерживается", file=sys.stderr)
+        return 1
+
+    payload: Dict[str, Any] = {"a": str(Path(args.a).resolve()), "config": config}
+    if args.impact:
+        op = "impact"
+        payload["objects"] = args.impact
+    else:
+        op = "gate" if args.gate else "detect"
+        payload["b"] = str(Path(args.b[0]).resolve())
+        payload["stream"] = args.stream
+        payload["format"] = args.format
+
+    from src.detection.client import DetectorClient, ServerError
+
+    try:
+        response = DetectorClient(args.connect).request(op, payload)
+    except ServerError as e:
+        print(f"Критическая ошибка анализа: {e}", file=sys.stderr)
+        return 1
+
+    output = response.get("output")
+    if output is None:
+        output = json.dumps(response["report"], indent=2, ensure_ascii=False)
+
+    if args.out:
+        path = Path(args.out)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+    return int(response.get("exit_code", 0))
+
+
 def main() -> int:
     args = parse_args()
 
-    # --- Чтение SQL ---
-    sql_a = read_sql_file(args.a)
-    sql_b = read_sql_file(args.b)
-
     # --- Детектор ---
-    detector = MigrationConflictDetector()
+    config: Dict[str, Any] = {}
+    if args.cache_dir:
+        config["cache_dir"] = args.cache_dir
+    if args.trace_memory:
+        config["trace_memory"] = True
+
+    # --- Сервер и клиент к нему ---
+    if args.serve:
+        return run_server(args, config)
+    if args.connect:
+        return run_client(args, config)
+
+    from src.detection import MigrationConflictDetector, Reporter
+
+    detector = MigrationConflictDetector(config)
+
+    # --- Репортёр ---
+    reporter = Reporter(REPORTER_CONFIG)
+
+    # --- Радиус поражения по схеме A ---
+    if args.impact:
+        return run_impact(args, detector)
+
+    # --- Проверка слияния: только вердикт ---
+    if args.gate:
+        return run_gate(args, detector)
+
+    # --- Пакетный режим: одна схема A против нескольких B ---
+    if len(args.b) > 1 or is_glob(args.b[0]):
+        return run_batch(args, detector, reporter)
+
+    path_b = args.b[0]
 
     try:
-        raw_report = detector.detect(sql_a, sql_b)
+        if args.stream:
+            raw_report = detector.detect_files(args.a, path_b)
+        else:
+            # --- Чтение SQL ---
+            sql_a = read_sql_file(args.a)
+            sql_b = read_sql_file(path_b)
+            raw_report = detector.detect(sql_a, sql_b)
     except Exception as e:
         print(f"Критическая ошибка анализа: {e}", file=sys.stderr)
         return 1
 
-    # --- Репортёр ---
-    reporter = Reporter({
-        "tool_name": "PostgreSQL Migration Conflict Detector",
-        "version": "1.0.0",
-        "author": "Студентка СПбПУ",
-    })
+    if args.metrics:
+        detector.instrumentation.export_jsonl(args.metrics, schema_a=args.a, schema_b=path_b)
 
     # --- Экспорт ---
     output = reporter.export(
@@ -0,0 +1,11 @@
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY,
+    name TEXT
+);
+
+CREATE FUNCTION ensure_audit() RETURNS void AS $$
+BEGIN
+    PERFORM 1;
+    CREATE TABLE IF NOT EXISTS audit_log (id INTEGER PRIMARY KEY, user_id INTEGER REFERENCES users(id));
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,11 @@
+CREATE TABLE departments (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE employees (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    department_id INTEGER REFERENCES departments(id),
+    manager_id INTEGER REFERENCES employees(id)
+);
@@ -0,0 +1,10 @@
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY,
+    name TEXT
+);
+
+CREATE FUNCTION ensure_audit() RETURNS void AS $fn$
+BEGIN
+    PERFORM 1;
+END;
+$fn$ LANGUAGE plpgsql;
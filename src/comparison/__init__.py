@@ -5,19 +5,28 @@ comparison — модуль сравнения схем (раздел 2.3).
 Экспортирует:
 - GraphComparator: сравнение графов и построение Δ
 - Delta: структура различий Δ = (O_added, O_removed, O_modified, E_added, E_removed, E_modified)
+- object_key: ключ сопоставления объектов графов A и B
 - VertexMatcher / MatchResult: сопоставление вершин (этап 2.3.1)
+
+Модули загружаются при первом обращении к имени (src/core/lazy.py).
 """
 
-from .comparator import GraphComparator
-from .delta import Delta
-from .matcher import VertexMatcher, MatchResult
+from src.core.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".comparator": ("GraphComparator",),
+    ".delta": ("Delta", "ModifiedObject", "ObjectKey", "object_key"),
+    ".matcher": ("VertexMatcher", "MatchResult"),
+})
 
 __all__ = [
     "GraphComparator",
     "Delta",
+    "ModifiedObject",
+    "ObjectKey",
+    "object_key",
     "VertexMatcher",
     "MatchResult",
 ]
 
 __version__ = "0.1.0"
-
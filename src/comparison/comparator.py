@@ -9,23 +9,11 @@ comparator.py
 
 from __future__ import annotations
 
-from typing import Dict, Tuple, Set
+from typing import Dict, Set
 
 from src.core.models import DatabaseObject
-from src.graph.schema_graph import SchemaGraph, Edge
-from src.comparison.delta import Delta, ModifiedObject
-
-
-def _object_key(obj: DatabaseObject):
-    schema = (obj.schema or "public").lower()
-    name = obj.name.lower()
-    obj_type = obj.type.value
-
-    table = ""
-    if obj_type == "column":
-        table = str(obj.attributes.get("table", "")).lower()
-
-    return (schema, obj_type, table, name)
+from src.graph.schema_graph import SchemaGraph
+from src.comparison.delta import Delta, ModifiedObject, ObjectKey
 
 
 class GraphComparator:
@@ -34,53 +22,75 @@ class GraphComparator:
     """
 
     def compare(self, graph_a: SchemaGraph, graph_b: SchemaGraph) -> Delta:
-        # --- Индексация вершин ---
-        objs_a: Dict[Tuple[str, str, str], DatabaseObject] = {
-            _object_key(o): o for o in graph_a.vertices.values()
-        }
-        objs_b: Dict[Tuple[str, str, str], DatabaseObject] = {
-            _object_key(o): o for o in graph_b.vertices.values()
-        }
-
-        keys_a = set(objs_a.keys())
-        keys_b = set(objs_b.keys())
+        # --- Индексация вершин: номер ключа -> вершина ---
+        # ключи интернированы при построении графов (SchemaGraph.vertex_keys);
+        # граф с другой таблицей ключей (например, из кэша) переводится в общую
+        graph_b.rekey(graph_a.key_table)
+        table = graph_a.key_table
+        vertices_a = graph_a.vertices
+        vertices_b = graph_b.vertices
+
+        # сигнатуры атрибутов — только если оба графа сравниваются повторно:
+        # для одноразового графа их подсчёт дороже прямого сравнения атрибутов
+        use_signatures = graph_a.reuse_signatures and graph_b.reuse_signatures
+        signature_a = graph_a.vertex_signature
+        signature_b = graph_b.vertex_signature
+
+        ids_a = graph_a.key_index()
+        ids_b = graph_b.key_index()
+
+        keys_a = ids_a.keys()
+        keys_b = ids_b.keys()
 
         # --- Δ объекты ---
-        added_keys = keys_b - keys_a
-        removed_keys = keys_a - keys_b
-        common_keys = keys_a & keys_b
-
-        objects_added: Set[DatabaseObject] = {objs_b[k] for k in added_keys}
-        objects_removed: Set[DatabaseObject] = {objs_a[k] for k in removed_keys}
+        added: Dict[ObjectKey, DatabaseObject] = {
+            table.key(k): vertices_b[ids_b[k]] for k in keys_b - keys_a
+        }
+        removed: Dict[ObjectKey, DatabaseObject] = {
+            table.key(k): vertices_a[ids_a[k]] for k in keys_a - keys_b
+        }
 
-        objects_modified = []
+        modified: Dict[ObjectKey, ModifiedObject] = {}
 
         # --- MODIFIED ---
-        for k in common_keys:
-            obj_a = objs_a[k]
-            obj_b = objs_b[k]
+        # поэлементно сравниваются только объекты с разными атрибутами
+        # (разными сигнатурами — у переиспользуемых графов)
+        for k in keys_a & keys_b:
+            id_a = ids_a[k]
+            id_b = ids_b[k]
+            obj_a = vertices_a[id_a]
+            obj_b = vertices_b[id_b]
+
+            if use_signatures:
+                if signature_a(id_a) == signature_b(id_b):
+                    continue
+            elif obj_a.attributes_dict() == obj_b.attributes_dict():
+                continue
 
             changed_fields = self._diff_attributes(obj_a, obj_b)
             if changed_fields:
-                objects_modified.append(
-                    ModifiedObject(
-                        before=obj_a,
-                        after=obj_b,
-                        changed_fields=changed_fields,
-                    )
+                modified[table.key(k)] = ModifiedObject(
+                    before=obj_a,
+                    after=obj_b,
+                    changed_fields=changed_fields,
                 )
 
         # --- Рёбра ---
-        edges_a: Set[Edge] = set(graph_a.edges)
-        edges_b: Set[Edge] = set(graph_b.edges)
+        # id вершин двух графов несопоставимы: рёбра сравниваются по кодам
+        # (ключ источника, ключ цели, отношение). В Δ попадают сами рёбра:
+        # добавленные — с id графа B, удалённые — с id графа A
+        edges_a, codes_a = graph_a.encoded_edges()
+        edges_b, codes_b = graph_b.encoded_edges()
+        set_a = set(codes_a)
+        set_b = set(codes_b)
 
-        edges_added = edges_b - edges_a
-        edges_removed = edges_a - edges_b
+        edges_added = {e for e, code in zip(edges_b, codes_b) if code not in set_a}
+        edges_removed = {e for e, code in zip(edges_a, codes_a) if code not in set_b}
 
         return Delta(
-            objects_added=objects_added,
-            objects_removed=objects_removed,
-            objects_modified=objects_modified,
+            added=added,
+            removed=removed,
+            modified=modified,
             edges_added=edges_added,
             edges_removed=edges_removed,
         )
@@ -96,8 +106,8 @@ class GraphComparator:
         """
         changed: Set[str] = set()
 
-        attrs_a = obj_a.attributes or {}
-        attrs_b = obj_b.attributes or {}
+        attrs_a = obj_a.attributes_dict()
+        attrs_b = obj_b.attributes_dict()
 
         all_keys = set(attrs_a.keys()) | set(attrs_b.keys())
 
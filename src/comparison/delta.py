@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Set, List, Dict
+from typing import Any, Dict, Iterator, List, Set, Tuple, ValuesView
 
-from src.core.models import DatabaseObject
+from src.core.models import DatabaseObject, ObjectType
+from src.graph.keys import ObjectKey, object_key
 from src.graph.schema_graph import Edge
 
 
@@ -17,39 +18,115 @@ class ModifiedObject:
     changed_fields: Set[str]
 
 
+# Части Δ по объектам — имена совпадают с ключами summary() и BaseRule.inputs
+OBJECT_BUCKETS = ("objects_added", "objects_removed", "objects_modified")
+
+
 @dataclass
 class Delta:
+    """
+    Δ = (O_added, O_removed, O_modified, E_added, E_removed).
+
+    Объекты хранятся по ключу сопоставления (object_key) в порядке ключей,
+    поэтому проверки принадлежности точны (одноимённые колонки разных
+    таблиц различаются), а обход детерминирован. При создании Δ один раз
+    раскладывается по типам объектов: правила обходят только свою часть.
+    """
 
-    # объекты
-    objects_added: Set[DatabaseObject] = field(default_factory=set)
-    objects_removed: Set[DatabaseObject] = field(default_factory=set)
-    objects_modified: List[ModifiedObject] = field(default_factory=list)
+    # объекты: ключ → объект
+    added: Dict[ObjectKey, DatabaseObject] = field(default_factory=dict)
+    removed: Dict[ObjectKey, DatabaseObject] = field(default_factory=dict)
+    modified: Dict[ObjectKey, ModifiedObject] = field(default_factory=dict)
 
     # рёбра
     edges_added: Set[Edge] = field(default_factory=set)
     edges_removed: Set[Edge] = field(default_factory=set)
 
+    def __post_init__(self) -> None:
+        self.added = dict(sorted(self.added.items()))
+        self.removed = dict(sorted(self.removed.items()))
+        self.modified = dict(sorted(self.modified.items()))
+
+        # часть Δ → тип объекта → элементы (в порядке ключей)
+        self._by_type: Dict[str, Dict[ObjectType, List[Any]]] = {}
+        for bucket, items in (
+            ("objects_added", self.added.values()),
+            ("objects_removed", self.removed.values()),
+            ("objects_modified", self.modified.values()),
+        ):
+            by_type: Dict[ObjectType, List[Any]] = {}
+            for item in items:
+                obj = item.before if isinstance(item, ModifiedObject) else item
+                by_type.setdefault(obj.type, []).append(item)
+            self._by_type[bucket] = by_type
+
+    # ==========
+    # ОБЪЕКТЫ
+    # ==========
+
+    @property
+    def objects_added(self) -> ValuesView[DatabaseObject]:
+        return self.added.values()
+
+    @property
+    def objects_removed(self) -> ValuesView[DatabaseObject]:
+        return self.removed.values()
+
+    @property
+    def objects_modified(self) -> ValuesView[ModifiedObject]:
+        return self.modified.values()
+
+    def iter_added(self, *types: ObjectType) -> Iterator[DatabaseObject]:
+        """Добавленные объекты заданных типов (без типов — все)."""
+        return self._iter("objects_added", types)
+
+    def iter_removed(self, *types: ObjectType) -> Iterator[DatabaseObject]:
+        """Удалённые объекты заданных типов (без типов — все)."""
+        return self._iter("objects_removed", types)
+
+    def iter_modified(self, *types: ObjectType) -> Iterator[ModifiedObject]:
+        """Изменённые объекты заданных типов (без типов — все)."""
+        return self._iter("objects_modified", types)
+
+    def _iter(self, bucket: str, types: Tuple[ObjectType, ...]) -> Iterator[Any]:
+        by_type = self._by_type[bucket]
+        if not types:
+            for items in by_type.values():
+                yield from items
+            return
+        for t in types:
+            yield from by_type.get(t, ())
+
+    def types_in(self, bucket: str) -> Set[Any]:
+        """
+        Типы элементов части Δ: ObjectType для объектов,
+        RelationType для рёбер (edges_added / edges_removed).
+        """
+        if bucket in self._by_type:
+            return set(self._by_type[bucket])
+        return {e.relation for e in getattr(self, bucket)}
+
     # ==========
     # ВСПОМОГАТЕЛЬНОЕ
     # ==========
 
     def modified_by_type(self, obj_type) -> List[ModifiedObject]:
-        return [
-            m for m in self.objects_modified
-            if m.before.type == obj_type
-        ]
+        return self._by_type["objects_modified"].get(obj_type, [])
 
     def has_removed(self, obj: DatabaseObject) -> bool:
-        return obj in self.objects_removed
+        return object_key(obj) in self.removed
 
     def has_added(self, obj: DatabaseObject) -> bool:
-        return obj in self.objects_added
+        return object_key(obj) in self.added
+
+    def has_modified(self, obj: DatabaseObject) -> bool:
+        return object_key(obj) in self.modified
 
     def summary(self) -> Dict[str, int]:
         return {
-            "objects_added": len(self.objects_added),
-            "objects_removed": len(self.objects_removed),
-            "objects_modified": len(self.objects_modified),
+            "objects_added": len(self.added),
+            "objects_removed": len(self.removed),
+            "objects_modified": len(self.modified),
             "edges_added": len(self.edges_added),
             "edges_removed": len(self.edges_removed),
         }
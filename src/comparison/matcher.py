@@ -10,6 +10,7 @@ from typing import Dict, List, Any, Optional, Tuple, Set
 from difflib import SequenceMatcher
 import hashlib
 
+from ..graph.keys import ObjectKey, object_key
 from ..graph.schema_graph import SchemaGraph
 from ..core.models import DatabaseObject, ObjectType
 from ..core.exceptions import VertexMatchingError
@@ -35,6 +36,9 @@ class VertexMatcher:
     Базовый прототип использует детерминированное сопоставление по ключу.
     """
 
+    # Предел размера кэша оценок сходства (при превышении кэш очищается)
+    _CACHE_LIMIT = 200_000
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
 
@@ -47,7 +51,9 @@ class VertexMatcher:
         # Порог для структурного/именного сходства (если включено)
         self.similarity_threshold: float = float(self.config.get("similarity_threshold", 0.8))
 
-        self._cache: Dict[str, Any] = {}
+        # Кэш оценок сходства экспериментального режима:
+        # ("name", x, y) -> сходство строк, ("attributes", sig_a, sig_b) -> сходство атрибутов
+        self._cache: Dict[Tuple[Any, ...], float] = {}
 
     # -------------------------
     # основной метод
@@ -85,19 +91,21 @@ class VertexMatcher:
         сопоставление по ключу эквивалентности.
         Возвращает список пар (id_a, id_b) = M_paired.
         """
+        # ключи интернированы при построении графа — сравниваются номера
+        graph_b.rekey(graph_a.key_table)
         key_to_ids_a = self._build_key_mapping(graph_a)
         key_to_ids_b = self._build_key_mapping(graph_b)
 
         pairs: List[Tuple[int, int]] = []
 
-        common_keys = set(key_to_ids_a.keys()) & set(key_to_ids_b.keys())
+        common_keys = key_to_ids_a.keys() & key_to_ids_b.keys()
         for key in common_keys:
             ids_a = key_to_ids_a[key]
             ids_b = key_to_ids_b[key]
 
             if self.strict_keys and (len(ids_a) != 1 or len(ids_b) != 1):
                 raise VertexMatchingError(
-                    f"Коллизия ключа '{key}': A имеет {ids_a}, B имеет {ids_b}. "
+                    f"Коллизия ключа '{':'.join(graph_a.key_table.key(key))}': A имеет {ids_a}, B имеет {ids_b}. "
                     f"В строгом режиме (НИР) ключ должен быть уникальным."
                 )
 
@@ -120,42 +128,26 @@ class VertexMatcher:
         return mapping
 
     # -------------------------
-    # Ключ эквивалентности (должен совпадать с comparator.py)
+    # Ключ эквивалентности — общий с comparator.py (src/graph/keys.py)
     # -------------------------
 
-    def _build_key_mapping(self, graph: SchemaGraph) -> Dict[str, List[int]]:
+    def _build_key_mapping(self, graph: SchemaGraph) -> Dict[int, List[int]]:
         """
-        Возвращает key -> [vertex_id, ...].
+        Возвращает номер ключа -> [vertex_id, ...].
         Так мы явно видим коллизии и не теряем вершины.
         """
-        mapping: Dict[str, List[int]] = {}
-        for vertex_id, vertex in graph.vertices.items():
-            key = self._vertex_key(vertex)
-            mapping.setdefault(key, []).append(vertex_id)
+        mapping: Dict[int, List[int]] = {}
+        for vertex_id, key_id in graph.vertex_keys.items():
+            mapping.setdefault(key_id, []).append(vertex_id)
         return mapping
 
-    def _vertex_key(self, vertex: DatabaseObject) -> str:
+    @staticmethod
+    def _vertex_key(vertex: DatabaseObject) -> ObjectKey:
         """
-        Детерминированный ключ эквивалентности.
-
-        Совместим с GraphComparator._vertex_key():
-        - базовый ключ: type:schema:name
-        - для COLUMN добавляется table (иначе неоднозначность)
-        - для ограничений добавляется table/from_table (унификация)
+        Детерминированный ключ эквивалентности — тот же, что у GraphComparator
+        (object_key): схема, тип, таблица (для колонок), имя.
         """
-        base = f"{vertex.type.value}:{vertex.schema}:{vertex.name}"
-
-        if vertex.type == ObjectType.COLUMN:
-            table = vertex.attributes.get("table")
-            if table:
-                return f"{base}:table:{table}"
-
-        if vertex.type in (ObjectType.PRIMARY_KEY, ObjectType.UNIQUE_CONSTRAINT, ObjectType.FOREIGN_KEY):
-            table = vertex.attributes.get("table") or vertex.attributes.get("from_table")
-            if table:
-                return f"{base}:table:{table}"
-
-        return base
+        return object_key(vertex)
 
     # -------------------------
     # Экспериментальные стратегии (выключены по умолчанию)
@@ -171,59 +163,173 @@ class VertexMatcher:
         """
         Осторожное дополнение соответствий, если enable_experimental_matching=True.
         это расширение НИР.
+
+        Поиск переименований без полного перебора пар:
+        1) блоки — несопоставленные вершины одного типа, схемы и таблицы
+           (для колонок и ограничений); сначала сопоставляются таблицы,
+           и переименованная таблица задаёт блок для своих колонок;
+        2) в блоке кандидаты для вершины A — вершины B с общими
+           триграммами имени, из них оцениваются top_k с наибольшим
+           числом общих триграмм;
+        3) пары с оценкой не ниже порога назначаются жадно, от лучших.
         """
-        # Список кандидатов: только не сопоставленные вершины одинакового типа
-        by_type_a = self._group_unmatched_by_type(graph_a, already_a)
-        by_type_b = self._group_unmatched_by_type(graph_b, already_b)
+        top_k = max(1, int(self.config.get("matching_top_k", 10)))
+        max_postings = max(1, int(self.config.get("matching_max_gram_postings", 1000)))
 
         extra_pairs: List[Tuple[int, int]] = []
 
-        for t, vertices_a in by_type_a.items():
-            vertices_b = by_type_b.get(t, [])
-            if not vertices_b:
-                continue
+        # переименованные таблицы: (схема, имя в A) -> имя в B
+        table_renames: Dict[Tuple[str, str], str] = {}
 
-            matched_b: Set[int] = set()
+        types = sorted(
+            {v.type.value for vertex_id, v in graph_a.vertices.items() if vertex_id not in already_a},
+            key=lambda t: (t != ObjectType.TABLE.value, t),
+        )
 
-            for id_a, v_a in vertices_a:
-                best_id_b: Optional[int] = None
-                best_sim = 0.0
+        for t in types:
+            blocks_b = self._group_unmatched(graph_b, already_b, t, {})
+            if not blocks_b:
+                continue
+            blocks_a = self._group_unmatched(graph_a, already_a, t, table_renames)
+
+            for block, vertices_a in blocks_a.items():
+                vertices_b = blocks_b.get(block)
+                if not vertices_b:
+                    continue
 
-                for id_b, v_b in vertices_b:
-                    if id_b in matched_b:
-                        continue
-                    sim = self._calculate_vertex_similarity(v_a, v_b)
-                    if sim >= self.similarity_threshold and sim > best_sim:
-                        best_sim = sim
-                        best_id_b = id_b
+                block_pairs = self._match_block(graph_a, graph_b, vertices_a, vertices_b, top_k, max_postings)
+                extra_pairs.extend(block_pairs)
 
-                if best_id_b is not None:
-                    extra_pairs.append((id_a, best_id_b))
-                    matched_b.add(best_id_b)
+                if t == ObjectType.TABLE.value:
+                    for id_a, id_b in block_pairs:
+                        v_a, v_b = graph_a.vertices[id_a], graph_b.vertices[id_b]
+                        table_renames[(block[0], v_a.name.lower())] = v_b.name.lower()
 
         extra_pairs.sort(key=lambda p: (p[0], p[1]))
         return extra_pairs
 
-    def _group_unmatched_by_type(
-        self, graph: SchemaGraph, already: Set[int]
-    ) -> Dict[str, List[Tuple[int, DatabaseObject]]]:
-        groups: Dict[str, List[Tuple[int, DatabaseObject]]] = {}
+    def _group_unmatched(
+        self,
+        graph: SchemaGraph,
+        already: Set[int],
+        obj_type: str,
+        table_renames: Dict[Tuple[str, str], str],
+    ) -> Dict[Tuple[str, str], List[Tuple[int, DatabaseObject]]]:
+        """
+        Несопоставленные вершины типа obj_type: (схема, таблица) -> [(id, вершина)].
+        Таблица вершины переводится в имя из B, если таблица переименована.
+        """
+        groups: Dict[Tuple[str, str], List[Tuple[int, DatabaseObject]]] = {}
         for vertex_id, vertex in graph.vertices.items():
-            if vertex_id in already:
+            if vertex_id in already or vertex.type.value != obj_type:
                 continue
-            groups.setdefault(vertex.type.value, []).append((vertex_id, vertex))
+
+            schema = (vertex.schema or "public").lower()
+            table = ""
+            if vertex.type != ObjectType.TABLE:
+                table = str(vertex.attributes.get("table") or "").lower()
+                table = table_renames.get((schema, table), table)
+
+            groups.setdefault((schema, table), []).append((vertex_id, vertex))
         return groups
 
-    def _calculate_vertex_similarity(self, a: DatabaseObject, b: DatabaseObject) -> float:
+    @staticmethod
+    def _name_grams(name: str) -> Set[str]:
+        """Триграммы имени с границами слова (как в pg_trgm)."""
+        padded = f"  {name.lower()} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _match_block(
+        self,
+        graph_a: SchemaGraph,
+        graph_b: SchemaGraph,
+        vertices_a: List[Tuple[int, DatabaseObject]],
+        vertices_b: List[Tuple[int, DatabaseObject]],
+        top_k: int,
+        max_postings: int,
+    ) -> List[Tuple[int, int]]:
+        # инвертированный индекс B: триграмма -> позиции в vertices_b
+        postings: Dict[str, List[int]] = {}
+        for pos, (_, v_b) in enumerate(vertices_b):
+            for gram in self._name_grams(v_b.name):
+                postings.setdefault(gram, []).append(pos)
+
+        scored: List[Tuple[float, int, int]] = []
+
+        for id_a, v_a in vertices_a:
+            grams = [g for g in self._name_grams(v_a.name) if g in postings]
+            if not grams:
+                continue
+
+            # слишком частые триграммы (общий префикс) не различают кандидатов;
+            # если частые все — берётся самая редкая
+            selective = [g for g in grams if len(postings[g]) <= max_postings]
+            if not selective:
+                selective = [min(grams, key=lambda g: (len(postings[g]), g))]
+
+            shared: Dict[int, int] = {}
+            for gram in selective:
+                for pos in postings[gram]:
+                    shared[pos] = shared.get(pos, 0) + 1
+
+            candidates = sorted(shared, key=lambda pos: (-shared[pos], pos))[:top_k]
+            for pos in candidates:
+                id_b, v_b = vertices_b[pos]
+                sim = self._calculate_vertex_similarity(v_a, v_b, graph_a, graph_b)
+                if sim >= self.similarity_threshold:
+                    scored.append((sim, id_a, id_b))
+
+        # жадное назначение: сначала пары с наибольшим сходством
+        scored.sort(key=lambda x: (-x[0], x[1], x[2]))
+        matched_a: Set[int] = set()
+        matched_b: Set[int] = set()
+        pairs: List[Tuple[int, int]] = []
+        for _, id_a, id_b in scored:
+            if id_a in matched_a or id_b in matched_b:
+                continue
+            matched_a.add(id_a)
+            matched_b.add(id_b)
+            pairs.append((id_a, id_b))
+        return pairs
+
+    def _calculate_vertex_similarity(
+        self,
+        a: DatabaseObject,
+        b: DatabaseObject,
+        graph_a: Optional[SchemaGraph] = None,
+        graph_b: Optional[SchemaGraph] = None,
+    ) -> float:
         if a.type != b.type:
             return 0.0
 
-        name_sim = self._name_similarity(a.name, b.name)
-        attr_sim = self._attributes_similarity(a.attributes or {}, b.attributes or {})
+        name_sim = self._name_similarity_cached(a.name.lower(), b.name.lower())
+
+        # сходство атрибутов кэшируется по сигнатурам вершин (если известны графы)
+        attr_key = None
+        if graph_a is not None and graph_b is not None:
+            attr_key = ("attributes", graph_a.vertex_signature(a.id), graph_b.vertex_signature(b.id))
+        attr_sim = self._cache.get(attr_key) if attr_key is not None else None
+        if attr_sim is None:
+            attr_sim = self._attributes_similarity(a.attributes_dict(), b.attributes_dict())
+            if attr_key is not None:
+                self._remember(attr_key, attr_sim)
 
         weights = self.config.get("similarity_weights", {"name": 0.6, "attributes": 0.4})
         return float(weights.get("name", 0.6)) * name_sim + float(weights.get("attributes", 0.4)) * attr_sim
 
+    def _remember(self, key: Tuple[Any, ...], value: float) -> None:
+        if len(self._cache) >= self._CACHE_LIMIT:
+            self._cache.clear()
+        self._cache[key] = value
+
+    def _name_similarity_cached(self, x: str, y: str) -> float:
+        key = ("name", x, y)
+        sim = self._cache.get(key)
+        if sim is None:
+            sim = self._name_similarity(x, y)
+            self._remember(key, sim)
+        return sim
+
     @staticmethod
     def _name_similarity(x: str, y: str) -> float:
         return SequenceMatcher(None, x.lower(), y.lower()).ratio()
@@ -245,7 +351,7 @@ class VertexMatcher:
             if vx == vy:
                 score += 1.0
             elif isinstance(vx, str) and isinstance(vy, str):
-                score += self._name_similarity(vx, vy)
+                score += self._name_similarity_cached(vx.lower(), vy.lower())
 
         return score / float(len(keys_all))
 
@@ -1,16 +1,24 @@
 # src/core/__init__.py
 
-from .models import (
-    DatabaseObject,
-    Table,
-    Column,
-    ObjectType,
-    RelationType,
-)
+# Имена загружаются при первом обращении (см. src/core/lazy.py)
 
-from .exceptions import (
-    ParsingError,
-)
+from .lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    # models
+    ".models": (
+        "DatabaseObject",
+        "Table",
+        "Column",
+        "ObjectType",
+        "RelationType",
+    ),
+
+    # exceptions
+    ".exceptions": (
+        "ParsingError",
+    ),
+})
 
 __all__ = [
     # models
@@ -23,4 +31,3 @@ __all__ = [
     # exceptions
     "ParsingError",
 ]
-
@@ -2,6 +2,8 @@
 Константы системы обнаружения конфликтов миграций PostgreSQL.
 """
 
+import os
+
 # Версия системы
 VERSION = "1.0.0"
 AUTHOR = "Студентка СПбПУ"
@@ -119,6 +121,15 @@ SYSTEM_LIMITS = {
     'TIMEOUT_SECONDS': 30  # Таймаут выполнения (секунды)
 }
 
+# Адрес сервера детектора по умолчанию (main.py --serve / --connect):
+# Unix-сокет с правами 0600 в каталоге пользователя. К TCP на localhost
+# может подключиться любой локальный пользователь, поэтому TCP — только
+# там, где Unix-сокетов нет
+DEFAULT_SERVER_ADDRESS = (
+    "unix:" + os.path.join(os.environ.get("XDG_RUNTIME_DIR") or os.path.expanduser("~"), ".migration-detector.sock")
+    if os.name == "posix" else "127.0.0.1:8765"
+)
+
 # Форматы вывода
 OUTPUT_FORMATS = {
     'JSON': 'json',
@@ -0,0 +1,45 @@
+# src/core/lazy.py
+
+"""
+Ленивый экспорт имён пакета (PEP 562).
+
+__init__ пакета объявляет, из какого модуля берётся каждое имя, и не
+импортирует модули сам: модуль загружается при первом обращении
+к имени (from src.parser import SQLParser или src.parser.SQLParser).
+Так main.py --help и короткие запуски не платят за импорт подсистем,
+которые им не нужны.
+"""
+
+from __future__ import annotations
+
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+
+def lazy_exports(
+    package: str,
+    modules: Mapping[str, Sequence[str]],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Возвращает (__getattr__, __dir__) для пакета package.
+    modules: относительное имя модуля → экспортируемые из него имена.
+    Загруженное имя кэшируется в пространстве имён пакета.
+    """
+    origin: Dict[str, str] = {name: module for module, names in modules.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        module = origin.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(origin))
+
+    return __getattr__, __dir__
+
+
+__all__ = ["lazy_exports"]
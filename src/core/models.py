@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from enum import Enum
 
 
@@ -30,22 +31,56 @@ class RelationType(Enum):
     TRIGGERS = "triggers"
 
 
-@dataclass
+def _intern(value: Any) -> Any:
+    """Имена схем/таблиц/типов повторяются тысячи раз — храним одну копию."""
+    return sys.intern(value) if type(value) is str else value
+
+
 class DatabaseObject:
-    id: int
-    type: ObjectType
-    name: str
-    schema: str = "public"
-    attributes: Any = field(default_factory=dict)
+    """
+    Объект схемы БД (вершина графа).
+
+    Классы модели используют __slots__: у объектов нет __dict__,
+    а повторяющиеся строки (схема, имя) интернированы. Для больших
+    схем (сотни тысяч колонок) это основной расход памяти.
+    """
 
-    def __post_init__(self):
+    __slots__ = ("id", "type", "name", "schema", "_attributes")
+
+    def __init__(
+        self,
+        id: int,
+        type: ObjectType,
+        name: str,
+        schema: str = "public",
+        attributes: Any = None,
+    ):
+        self.id = id
+        self.type = type
+        self.name = _intern(name)
+        self.schema = _intern(schema)
+        self.attributes = attributes
+
+    @property
+    def attributes(self) -> Dict[str, Any]:
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, value: Any) -> None:
         # ГАРАНТИЯ: attributes ВСЕГДА dict
-        if self.attributes is None:
-            self.attributes = {}
-        elif not isinstance(self.attributes, dict):
-            self.attributes = {
-                "value": self.attributes
+        if value is None:
+            value = {}
+        elif isinstance(value, Mapping) and not isinstance(value, dict):
+            value = dict(value)
+        elif not isinstance(value, dict):
+            value = {
+                "value": value
             }
+        self._attributes = value
+
+    def attributes_dict(self) -> Dict[str, Any]:
+        """Атрибуты в виде dict (только для чтения: может быть внутренним хранилищем)."""
+        return self._attributes
 
     def get_key(self) -> str:
         return f"{self.type.value}:{self.schema}:{self.name}"
@@ -61,8 +96,118 @@ class DatabaseObject:
     def __hash__(self):
         return hash((self.type, self.schema, self.name))
 
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__qualname__}(id={self.id!r}, type={self.type!r}, "
+            f"name={self.name!r}, schema={self.schema!r}, attributes={self.attributes!r})"
+        )
+
+
+# ==========================================================
+# КОЛОНКИ: КОМПАКТНОЕ ХРАНЕНИЕ АТРИБУТОВ
+# ==========================================================
+# Атрибуты колонки хранятся не в dict, а в слотах объекта:
+# строковые/составные значения — в отдельных слотах, булевы флаги —
+# битами одного int. Column.attributes возвращает представление
+# ColumnAttributes с интерфейсом dict поверх этих слотов.
+
+# ключ → (бит присутствия, бит флага или 0, слот или None);
+# порядок — тот, в котором атрибуты заполняет парсер
+_COLUMN_FIELDS: Dict[str, Tuple[int, int, Optional[str]]] = {
+    "definition": (1, 0, "_definition"),
+    "data_type": (2, 0, "_data_type"),
+    "table": (4, 0, "_table"),
+    "is_primary_key": (8, 1, None),
+    "is_unique": (16, 2, None),
+    "not_null": (32, 4, None),
+    "foreign_key": (64, 0, "_foreign_key"),
+    "is_nullable": (128, 8, None),
+}
+_INTERNED_KEYS = frozenset({"data_type", "table"})
+_MISSING = object()
+
+
+class ColumnAttributes(MutableMapping):
+    """
+    Представление атрибутов колонки с интерфейсом dict.
+    Чтение и запись идут напрямую в слоты Column.
+    """
+
+    __slots__ = ("_column",)
+
+    def __init__(self, column: "Column"):
+        self._column = column
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._column._get_attr(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # горячий путь: дублирует Column._get_attr без лишнего вызова
+        column = self._column
+        field = _COLUMN_FIELDS.get(key)
+        if field is not None and column._present & field[0]:
+            if field[1]:
+                return column._flags & field[1] != 0
+            return getattr(column, field[2])
+
+        extra = column._extra
+        if extra is not None:
+            return extra.get(key, default)
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return self._column._get_attr(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._column._set_attr(key, value)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        value = self._column._get_attr(key, _MISSING)
+        if value is _MISSING:
+            self._column._set_attr(key, default)
+            value = default
+        return value
+
+    def __delitem__(self, key: str) -> None:
+        if not self._column._del_attr(key):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._column.attributes_dict())
+
+    def __len__(self) -> int:
+        column = self._column
+        return bin(column._present).count("1") + len(column._extra or ())
+
+    def __bool__(self) -> bool:
+        return bool(self._column._present or self._column._extra)
+
+    def keys(self):
+        return self._column.attributes_dict().keys()
+
+    def items(self):
+        return self._column.attributes_dict().items()
+
+    def values(self):
+        return self._column.attributes_dict().values()
+
+    def copy(self) -> Dict[str, Any]:
+        return self._column.attributes_dict()
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
 
 class Column(DatabaseObject):
+    __slots__ = (
+        "_definition", "_data_type", "_table", "_foreign_key",
+        "_present", "_flags", "_extra",
+        "default_value", "_constraints",
+    )
+
     def __init__(
         self,
         *,
@@ -77,30 +222,225 @@ class Column(DatabaseObject):
         attributes: Optional[Dict[str, Any]] = None,
 
     ):
-        super().__init__(
-            id=id,
-            type=ObjectType.COLUMN,
-            name=name,
-            schema=schema,
-            attributes=attributes or {},
-        )
+        self.id = id
+        self.type = ObjectType.COLUMN
+        self.name = _intern(name)
+        self.schema = _intern(schema)
+
+        self.attributes = attributes
 
-        self.data_type = data_type
-        self.is_nullable = is_nullable
         self.default_value = default_value
-        self.constraints = constraints or []
+        self._constraints = constraints or None
+
+        present = self._present
+        if not present & 4:
+            self._set_attr("table", table)
+        if not present & 2:
+            self._set_attr("data_type", data_type)
+        if not present & 128:
+            self._set_attr("is_nullable", is_nullable)
+        if not present & 32:
+            self._set_attr("not_null", not is_nullable)
+
+    @classmethod
+    def from_fields(
+        cls,
+        *,
+        name: str,
+        table: Optional[str],
+        data_type: str,
+        definition: str,
+        is_primary_key: bool = False,
+        is_unique: bool = False,
+        not_null: bool = False,
+        foreign_key: Optional[Dict[str, Any]] = None,
+        schema: Optional[str] = None,
+    ) -> "Column":
+        """
+        Быстрое создание колонки парсером: слоты заполняются напрямую,
+        без промежуточного dict. Набор атрибутов — как у Column(attributes=...)
+        из парсера: definition, data_type, table, is_primary_key, is_unique,
+        not_null, [foreign_key], is_nullable.
+        """
+        column = cls.__new__(cls)
+        column.id = 0
+        column.type = ObjectType.COLUMN
+        column.name = _intern(name)
+        column.schema = _intern(schema)
+        column.default_value = None
+        column._constraints = None
+
+        column._definition = definition
+        column._data_type = _intern(data_type)
+        column._table = _intern(table)
+        column._foreign_key = foreign_key
+        column._present = 255 if foreign_key is not None else 255 & ~64
+        column._flags = (
+            (1 if is_primary_key else 0)
+            | (2 if is_unique else 0)
+            | (4 if not_null else 0)
+            | 8  # is_nullable: как и раньше, по умолчанию True
+        )
+        column._extra = None
+        return column
+
+    # ---------- атрибуты ----------
+
+    @property
+    def attributes(self) -> ColumnAttributes:
+        return ColumnAttributes(self)
+
+    @attributes.setter
+    def attributes(self, value: Any) -> None:
+        # value может быть представлением этой же колонки — копируем до сброса
+        if value is None:
+            items: Any = ()
+        elif isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, Mapping):
+            items = list(value.items())
+        else:
+            items = (("value", value),)
 
-        self.attributes.setdefault("table", table)
-        self.attributes.setdefault("data_type", self.data_type)
-        self.attributes.setdefault("is_nullable", self.is_nullable)
-        self.attributes.setdefault("not_null", not self.is_nullable)
+        slots: Dict[str, Any] = {"_definition": None, "_data_type": None, "_table": None, "_foreign_key": None}
+        present = flags = 0
+        extra: Optional[Dict[str, Any]] = None
+
+        for key, item in items:
+            field = _COLUMN_FIELDS.get(key)
+            if field is not None:
+                bit, flag, slot = field
+                if slot is not None:
+                    slots[slot] = _intern(item) if key in _INTERNED_KEYS else item
+                    present |= bit
+                    continue
+                if type(item) is bool:
+                    present |= bit
+                    if item:
+                        flags |= flag
+                    continue
+            if extra is None:
+                extra = {}
+            extra[key] = item
+
+        self._definition = slots["_definition"]
+        self._data_type = slots["_data_type"]
+        self._table = slots["_table"]
+        self._foreign_key = slots["_foreign_key"]
+        self._present = present
+        self._flags = flags
+        self._extra = extra
+
+    def attributes_dict(self) -> Dict[str, Any]:
+        present = self._present
+        flags = self._flags
+        d: Dict[str, Any] = {}
+        if present & 1:
+            d["definition"] = self._definition
+        if present & 2:
+            d["data_type"] = self._data_type
+        if present & 4:
+            d["table"] = self._table
+        if present & 8:
+            d["is_primary_key"] = flags & 1 != 0
+        if present & 16:
+            d["is_unique"] = flags & 2 != 0
+        if present & 32:
+            d["not_null"] = flags & 4 != 0
+        if present & 64:
+            d["foreign_key"] = self._foreign_key
+        if present & 128:
+            d["is_nullable"] = flags & 8 != 0
+        if self._extra:
+            d.update(self._extra)
+        return d
+
+    def _get_attr(self, key: str, default: Any) -> Any:
+        field = _COLUMN_FIELDS.get(key)
+        if field is not None and self._present & field[0]:
+            if field[1]:
+                return self._flags & field[1] != 0
+            return getattr(self, field[2])
+
+        extra = self._extra
+        if extra is not None:
+            return extra.get(key, default)
+        return default
+
+    def _set_attr(self, key: str, value: Any) -> None:
+        field = _COLUMN_FIELDS.get(key)
+        if field is not None:
+            bit, flag, slot = field
+            if slot is not None:
+                setattr(self, slot, _intern(value) if key in _INTERNED_KEYS else value)
+            elif type(value) is bool:
+                self._flags = self._flags | flag if value else self._flags & ~flag
+            else:
+                # флаг с не-bool значением хранится как есть, в _extra
+                self._present &= ~bit
+                field = None
+
+        if field is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+            return
+
+        self._present |= field[0]
+        if self._extra is not None:
+            self._extra.pop(key, None)
+
+    def _del_attr(self, key: str) -> bool:
+        field = _COLUMN_FIELDS.get(key)
+        if field is not None and self._present & field[0]:
+            self._present &= ~field[0]
+            if field[1]:
+                self._flags &= ~field[1]
+            else:
+                setattr(self, field[2], None)
+            return True
+
+        if self._extra is not None and key in self._extra:
+            del self._extra[key]
+            return True
+        return False
+
+    # ---------- поля, совпадающие с атрибутами ----------
+
+    @property
+    def data_type(self) -> str:
+        return self._get_attr("data_type", "")
+
+    @data_type.setter
+    def data_type(self, value: str) -> None:
+        self._set_attr("data_type", value)
+
+    @property
+    def is_nullable(self) -> bool:
+        return self._get_attr("is_nullable", True)
+
+    @is_nullable.setter
+    def is_nullable(self, value: bool) -> None:
+        self._set_attr("is_nullable", value)
+
+    @property
+    def constraints(self) -> List[str]:
+        if self._constraints is None:
+            self._constraints = []
+        return self._constraints
+
+    @constraints.setter
+    def constraints(self, value: Optional[List[str]]) -> None:
+        self._constraints = value or None
 
     def get_key(self) -> str:
-        table = self.attributes.get("table")
+        table = self._get_attr("table", None)
         return f"column:{self.schema}:{table}.{self.name}"
 
 
 class Table(DatabaseObject):
+    __slots__ = ("columns", "constraints")
+
     def __init__(
         self,
         *,
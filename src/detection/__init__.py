@@ -8,14 +8,28 @@
 - ConflictDetector — фасад уровня приложения
 - MigrationConflictDetector — orchestrator конвейера
 - Reporter — формирование и экспорт отчётов
+- DetectorServer / DetectorClient — долгоживущий сервер с тёплыми графами и клиент к нему
+
+Модули загружаются при первом обращении к имени (src/core/lazy.py):
+клиенту сервера не нужны парсер, графы и правила.
 """
 
-from .detector import ConflictDetector
-from .orchestrator import MigrationConflictDetector
-from .reporter import Reporter
+from src.core.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".detector": ("ConflictDetector",),
+    ".orchestrator": ("MigrationConflictDetector",),
+    ".reporter": ("Reporter",),
+    ".server": ("DetectorServer", "DetectorService"),
+    ".client": ("DetectorClient", "ServerError"),
+})
 
 __all__ = [
     "ConflictDetector",
     "MigrationConflictDetector",
     "Reporter",
+    "DetectorServer",
+    "DetectorService",
+    "DetectorClient",
+    "ServerError",
 ]
@@ -0,0 +1,98 @@
+"""
+Клиент сервера детектора (src/detection/server.py).
+
+Только стандартная библиотека и константы: клиенту не нужны парсер,
+графы и правила, поэтому запрос к тёплому серверу не платит за их импорт.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import socket
+from typing import Any, Dict, Optional
+
+from src.core.constants import DEFAULT_SERVER_ADDRESS as DEFAULT_ADDRESS
+
+
+UNIX_PREFIX = "unix:"
+
+
+class ServerError(Exception):
+    """Сервер недоступен или вернул ошибку."""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class DetectorClient:
+    """
+    Отправляет запросы серверу: адрес "host:port", "port"
+    или "unix:/path/to.sock" (как в DetectorServer).
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: Optional[float] = None):
+        self.address = address
+        self.timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        address = self.address
+        if address.startswith(UNIX_PREFIX):
+            return _UnixHTTPConnection(address[len(UNIX_PREFIX):], self.timeout)
+        if "/" in address:
+            return _UnixHTTPConnection(address, self.timeout)
+
+        host, _, port = address.rpartition(":")
+        return http.client.HTTPConnection(host.strip("[]") or "127.0.0.1", int(port), timeout=self.timeout)
+
+    def request(self, op: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Выполняет запрос op; payload=None — GET (health).
+        Возвращает тело ответа; ошибка транспорта или HTTP — ServerError.
+        """
+        conn = self._connection()
+        try:
+            if payload is None:
+                conn.request("GET", f"/{op}")
+            else:
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                conn.request("POST", f"/{op}", body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            data = response.read()
+        except OSError as e:
+            raise ServerError(f"Сервер {self.address} недоступен: {e}")
+        finally:
+            conn.close()
+
+        try:
+            result = json.loads(data)
+        except ValueError:
+            raise ServerError(f"Некорректный ответ сервера (HTTP {response.status})")
+
+        if response.status != 200:
+            raise ServerError(result.get("error") or f"HTTP {response.status}")
+        return result
+
+    def detect(self, **payload: Any) -> Dict[str, Any]:
+        return self.request("detect", payload)
+
+    def gate(self, **payload: Any) -> Dict[str, Any]:
+        return self.request("gate", payload)
+
+    def impact(self, **payload: Any) -> Dict[str, Any]:
+        return self.request("impact", payload)
+
+    def health(self) -> Dict[str, Any]:
+        return self.request("health")
+
+
+__all__ = ["DEFAULT_ADDRESS", "DetectorClient", "ServerError"]
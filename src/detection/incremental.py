@@ -0,0 +1,363 @@
+"""
+Инкрементальное повторное обнаружение конфликтов.
+
+Между запусками хранится состояние (IncrementalState): для каждой схемы —
+операторы (по тексту и номеру его повторения), разобранные из них объекты, граф и индекс его
+вершин по ключу сравнения; общая дельта по ключам и результаты правил.
+
+Следующий запуск:
+1) делит SQL на операторы (без токенизации) и разбирает только те,
+   которых не было в прошлый раз;
+2) заменяет в графе таблицы изменённых операторов (GraphBuilder.patch_tables);
+3) переклассифицирует в Δ только затронутые ключи;
+4) перезапускает только правила, входы которых (BaseRule.inputs) изменились.
+
+Если точечное обновление невозможно (дубликаты таблиц, коллизии ключей),
+выполняется полная пересборка — результат от этого не меняется.
+"""
+
+from __future__ import annotations
+
+from collections import ChainMap, Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, cast
+
+from src.core.models import DatabaseObject, ObjectType, Table
+from src.comparison.comparator import GraphComparator
+from src.comparison.delta import Delta, ModifiedObject, ObjectKey, object_key
+from src.graph.builder import GraphBuilder, GraphPatch
+from src.graph.schema_graph import Edge, SchemaGraph
+
+
+# Оператор снимка: (текст, номер повторения текста в схеме) — одинаковые
+# операторы (SET ...; повторённый COMMENT) различаются номером
+StatementKey = Tuple[str, int]
+
+# Классификация ключа в Δ: ("added" | "removed" | "modified", значение) или None
+Classification = Optional[Tuple[str, object]]
+
+_BUCKET = {
+    "added": "objects_added",
+    "removed": "objects_removed",
+    "modified": "objects_modified",
+}
+
+
+class IncrementalFallback(Exception):
+    """Точечное обновление невозможно — нужна полная пересборка."""
+
+
+@dataclass
+class SchemaSnapshot:
+    """
+    Состояние одной схемы между запусками.
+    """
+    name: str
+    statements: Dict[StatementKey, List[DatabaseObject]]
+    order: List[StatementKey]
+    graph: SchemaGraph
+    table_ids: Dict[Tuple[str, str], int]
+    index: Dict[ObjectKey, DatabaseObject] = field(default_factory=dict)
+    counts: Counter = field(default_factory=Counter)
+
+    @property
+    def objects(self) -> List[DatabaseObject]:
+        return [obj for key in self.order for obj in self.statements[key]]
+
+    @classmethod
+    def build(
+        cls,
+        name: str,
+        texts: List[str],
+        parse: Callable[[str], List[DatabaseObject]],
+        builder: GraphBuilder,
+    ) -> "SchemaSnapshot":
+        order = _statement_keys(texts)
+        statements = {key: parse(key[0]) for key in order}
+        objects = [obj for key in order for obj in statements[key]]
+        graph = builder.build_from_objects(objects, name)
+
+        snapshot = cls(name, statements, order, graph, builder.table_index(graph))
+        for obj in graph.vertices.values():
+            key = object_key(obj)
+            snapshot.index[key] = obj
+            snapshot.counts[key] += 1
+        return snapshot
+
+    def update(
+        self,
+        texts: List[str],
+        parse: Callable[[str], List[DatabaseObject]],
+        builder: GraphBuilder,
+    ) -> Tuple[GraphPatch, Set[ObjectKey], int]:
+        """
+        Применяет новый список операторов.
+        Возвращает (патч графа, затронутые ключи, число разобранных операторов).
+        """
+        order = _statement_keys(texts)
+        old = set(self.order)
+        new = set(order)
+
+        removed_tables = [
+            cast(Table, o) for key in self.order if key not in new
+            for o in self.statements[key] if o.type == ObjectType.TABLE
+        ]
+        for key in self.order:
+            if key not in new:
+                del self.statements[key]
+
+        parsed = 0
+        added_tables: List[Table] = []
+        for key in order:
+            if key not in old:
+                self.statements[key] = parse(key[0])
+                parsed += 1
+                added_tables.extend(cast(Table, o) for o in self.statements[key] if o.type == ObjectType.TABLE)
+
+        self.order = order
+
+        if not removed_tables and not added_tables:
+            return GraphPatch(), set(), parsed
+
+        objects = self.objects
+        names = Counter((o.schema or "public", o.name) for o in objects if o.type == ObjectType.TABLE)
+        if any(names[(t.schema or "public", t.name)] > 1 for t in removed_tables + added_tables):
+            raise IncrementalFallback("повторяющиеся таблицы")
+
+        patch = builder.patch_tables(self.graph, removed_tables, added_tables, objects, self.table_ids)
+        touched = self._reindex(patch)
+        return patch, touched, parsed
+
+    def _reindex(self, patch: GraphPatch) -> Set[ObjectKey]:
+        touched: Set[ObjectKey] = set()
+
+        for obj in patch.removed_vertices:
+            key = object_key(obj)
+            touched.add(key)
+            self.counts[key] -= 1
+            if self.counts[key] <= 0:
+                del self.counts[key]
+                self.index.pop(key, None)
+
+        # уцелевшая вершина с тем же ключом: неизвестно, какая «последняя»
+        if any(key in self.counts for key in touched):
+            raise IncrementalFallback("коллизия ключей")
+
+        added_now: Set[ObjectKey] = set()
+        for obj in patch.added_vertices:
+            key = object_key(obj)
+            if key in self.index and key not in added_now:
+                raise IncrementalFallback("коллизия ключей")
+            added_now.add(key)
+            touched.add(key)
+            self.index[key] = obj  # id растут — последний побеждает, как в compare()
+            self.counts[key] += 1
+
+        return touched
+
+
+def _statement_keys(texts: Iterable[str]) -> List[StatementKey]:
+    """
+    Ключи операторов по порядку: текст и номер его повторения.
+    Удаление одной из копий снимает последнюю, остальные остаются на месте.
+    """
+    seen: Counter = Counter()
+    keys: List[StatementKey] = []
+    for text in texts:
+        keys.append((text, seen[text]))
+        seen[text] += 1
+    return keys
+
+
+class IncrementalState:
+    """
+    Состояние инкрементального режима: две схемы, Δ по ключам
+    и результаты правил прошлого запуска.
+    """
+
+    def __init__(self, a: SchemaSnapshot, b: SchemaSnapshot):
+        self.a = a
+        self.b = b
+
+        self.added: Dict[ObjectKey, DatabaseObject] = {}
+        self.removed: Dict[ObjectKey, DatabaseObject] = {}
+        self.modified: Dict[ObjectKey, ModifiedObject] = {}
+
+        # графы снимков переживают запуски: атрибуты сверяются по сигнатурам
+        a.graph.reuse_signatures = b.graph.reuse_signatures = True
+
+        # рёбра по кодам (ключ источника, ключ цели, отношение) — как в compare()
+        b.graph.rekey(a.graph.key_table)
+        self.edge_codes_a: Dict[int, Set[Edge]] = self._edges_by_code(a.graph)
+        self.edge_codes_b: Dict[int, Set[Edge]] = self._edges_by_code(b.graph)
+
+        self.edges_added: Set[Edge] = {
+            e for code, edges in self.edge_codes_b.items() if code not in self.edge_codes_a for e in edges
+        }
+        self.edges_removed: Set[Edge] = {
+            e for code, edges in self.edge_codes_a.items() if code not in self.edge_codes_b for e in edges
+        }
+
+        # результаты правил прошлого запуска: rule_id → (conflicts, stat)
+        self.rule_results: Dict[str, tuple] = {}
+
+        self.reclassify(set(a.index) | set(b.index))
+
+    # ==========================================================
+    # Δ
+    # ==========================================================
+
+    def classification(self, key: ObjectKey) -> Classification:
+        if key in self.added:
+            return ("added", self.added[key])
+        if key in self.removed:
+            return ("removed", self.removed[key])
+        if key in self.modified:
+            return ("modified", self.modified[key])
+        return None
+
+    def reclassify(self, keys: Iterable[ObjectKey]) -> Set[str]:
+        """
+        Пересчитывает Δ для ключей keys.
+        Возвращает имена частей Δ, содержимое которых изменилось.
+        """
+        changed: Set[str] = set()
+
+        for key in keys:
+            before = self.classification(key)
+            self.added.pop(key, None)
+            self.removed.pop(key, None)
+            self.modified.pop(key, None)
+
+            obj_a = self.a.index.get(key)
+            obj_b = self.b.index.get(key)
+
+            if obj_a is None and obj_b is not None:
+                self.added[key] = obj_b
+            elif obj_b is None and obj_a is not None:
+                self.removed[key] = obj_a
+            elif obj_a is not None and obj_b is not None:
+                sig_a = self.a.graph.vertex_signature(obj_a.id)
+                sig_b = self.b.graph.vertex_signature(obj_b.id)
+                fields = GraphComparator._diff_attributes(obj_a, obj_b) if sig_a != sig_b else None
+                if fields:
+                    self.modified[key] = ModifiedObject(before=obj_a, after=obj_b, changed_fields=fields)
+
+            after = self.classification(key)
+            if not _same_classification(before, after):
+                for c in (before, after):
+                    if c is not None:
+                        changed.add(_BUCKET[c[0]])
+
+        return changed
+
+    @staticmethod
+    def _edges_by_code(graph: SchemaGraph) -> Dict[int, Set[Edge]]:
+        by_code: Dict[int, Set[Edge]] = {}
+        for e, code in zip(*graph.encoded_edges()):
+            by_code.setdefault(code, set()).add(e)
+        return by_code
+
+    def apply_edge_patch(self, side: str, patch: GraphPatch) -> Set[str]:
+        """
+        Поддерживает edges_added = E_B − E_A и edges_removed = E_A − E_B
+        (по кодам рёбер) после изменения графа стороны side ("a" | "b").
+        """
+        if side == "a":
+            graph = self.a.graph
+            mine, other = self.edge_codes_a, self.edge_codes_b
+            mine_only, other_only = self.edges_removed, self.edges_added
+        else:
+            graph = self.b.graph
+            mine, other = self.edge_codes_b, self.edge_codes_a
+            mine_only, other_only = self.edges_added, self.edges_removed
+
+        # концы удалённых рёбер могли уйти из графа вместе с вершинами
+        removed_keys = {o.id: graph.key_table.intern_object(o) for o in patch.removed_vertices}
+        keys = ChainMap(removed_keys, graph.vertex_keys)
+
+        touched: Set[int] = set()
+        for e in patch.removed_edges:
+            code = graph.edge_code(e, keys)
+            mine_only.discard(e)
+            edges = mine[code]
+            edges.discard(e)
+            if not edges:
+                del mine[code]
+            touched.add(code)
+        for e in patch.added_edges:
+            code = graph.edge_code(e)
+            mine.setdefault(code, set()).add(e)
+            touched.add(code)
+
+        for code in touched:
+            mine_edges = mine.get(code, set())
+            other_edges = other.get(code, set())
+            if mine_edges and other_edges:
+                mine_only -= mine_edges
+                other_only -= other_edges
+            elif mine_edges:
+                mine_only |= mine_edges
+            elif other_edges:
+                other_only |= other_edges
+
+        if patch.removed_edges or patch.added_edges:
+            return {"edges_added", "edges_removed"}
+        return set()
+
+    def delta(self) -> Delta:
+        return Delta(
+            added=dict(self.added),
+            removed=dict(self.removed),
+            modified=dict(self.modified),
+            edges_added=set(self.edges_added),
+            edges_removed=set(self.edges_removed),
+        )
+
+
+def structure_changed(patch: GraphPatch, graph: SchemaGraph) -> bool:
+    """
+    Изменилась ли структура графа с точностью до идентификаторов:
+    сравниваются рёбра патча в виде (ключ источника, ключ цели, отношение).
+    """
+    if patch.is_empty():
+        return False
+
+    removed_objs = {o.id: o for o in patch.removed_vertices}
+
+    def signature(edges: Set[Edge]) -> Counter:
+        def obj(i: int) -> DatabaseObject:
+            return removed_objs.get(i) or graph.vertices[i]
+        return Counter(
+            (object_key(obj(e.src)), object_key(obj(e.dst)), e.relation) for e in edges
+        )
+
+    before = {object_key(o): o.attributes for o in patch.removed_vertices}
+    after = {object_key(o): o.attributes for o in patch.added_vertices}
+    if before != after:
+        return True
+
+    return signature(patch.removed_edges) != signature(patch.added_edges)
+
+
+def _same_classification(a: Classification, b: Classification) -> bool:
+    if a is None or b is None:
+        return a is b
+    if a[0] != b[0]:
+        return False
+    if a[0] == "modified":
+        ma, mb = cast(ModifiedObject, a[1]), cast(ModifiedObject, b[1])
+        return (
+            ma.changed_fields == mb.changed_fields
+            and ma.before.attributes == mb.before.attributes
+            and ma.after.attributes == mb.after.attributes
+        )
+    return cast(DatabaseObject, a[1]).attributes == cast(DatabaseObject, b[1]).attributes
+
+
+__all__ = [
+    "IncrementalFallback",
+    "IncrementalState",
+    "SchemaSnapshot",
+    "structure_changed",
+]
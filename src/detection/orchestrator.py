@@ -2,15 +2,22 @@
 Координатор всего процесса обнаружения конфликтов.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
+import io
+import os
 import time
 from datetime import datetime
 
-from src.parser import SQLParser, SQLNormalizer
-from src.graph import GraphBuilder, SchemaGraph
+from src.parser import SQLParser, SQLNormalizer, SQLStreamReader
+from src.parser.tokenizer import Token
+from src.graph import GraphBuilder, SchemaGraph, GraphCache, KeyTable, MemoryGraphCache, impact_of
 from src.comparison import GraphComparator, Delta
 from src.rules import RuleRegistry, DEFAULT_RULES
-from src.core.models import DatabaseObject
+from src.core.models import DatabaseObject, ObjectType, RelationType
+from src.core.constants import DEFAULT_CONFIG, SYSTEM_LIMITS
+from src.core.exceptions import CacheError
+from src.utils.instrumentation import Instrumentation, StageMetrics
+from src.detection.incremental import IncrementalFallback, IncrementalState, SchemaSnapshot, structure_changed
 
 
 class MigrationConflictDetector:
@@ -26,9 +33,37 @@ class MigrationConflictDetector:
         self.normalizer = SQLNormalizer()
         self.graph_builder = GraphBuilder()
         self.comparator = GraphComparator()
+        self.stream_reader = SQLStreamReader(
+            chunk_size=int(self.config.get("stream_chunk_size", SQLStreamReader.DEFAULT_CHUNK_SIZE))
+        )
+
+        # Замеры по этапам и правилам (блок performance["stages"] отчёта)
+        self.instrumentation = Instrumentation(
+            enabled=bool(self.config.get("instrumentation", True)),
+            trace_memory=bool(self.config.get("trace_memory", False)),
+        )
 
         self.registry = RuleRegistry(self.config.get("rules", {}))
         self.registry.register_rules(DEFAULT_RULES)
+        self.registry.instrumentation = self.instrumentation
+
+        # Дисковый кэш разобранных схем: включается заданием cache_dir
+        self.cache: Optional[GraphCache] = None
+        cache_enabled = self.config.get("cache_enabled", DEFAULT_CONFIG["general"]["cache_enabled"])
+        if cache_enabled and self.config.get("cache_dir"):
+            self.cache = GraphCache(
+                self.config["cache_dir"],
+                max_entries=int(self.config.get("max_cache_size", SYSTEM_LIMITS["MAX_CACHE_SIZE"])),
+            )
+
+        # Кэш построенных графов в памяти (долгоживущий детектор, см. server.py):
+        # включается заданием memory_cache_size; проверяется раньше дискового
+        self.memory_cache: Optional[MemoryGraphCache] = None
+        if cache_enabled and self.config.get("memory_cache_size"):
+            self.memory_cache = MemoryGraphCache(int(self.config["memory_cache_size"]))
+
+        # Состояние инкрементального режима (detect_incremental)
+        self._incremental: Optional[IncrementalState] = None
 
         self.stats: Dict[str, float] = {
             "parsing_time": 0.0,
@@ -48,33 +83,238 @@ class MigrationConflictDetector:
         """
 
         total_start = time.perf_counter()
+        self.instrumentation.reset()
+        self._new_key_table()
 
         try:
-            # ---------- Этап 1: Парсинг ----------
-            t0 = time.perf_counter()
-            objects_a = self._parse_schema(sql_a)
-            objects_b = self._parse_schema(sql_b)
-            self.stats["parsing_time"] = time.perf_counter() - t0
-
-            # ---------- Этап 2: Построение графов ----------
-            t0 = time.perf_counter()
-            graph_a = self.graph_builder.build_from_objects(objects_a, "schema_a")
-            graph_b = self.graph_builder.build_from_objects(objects_b, "schema_b")
-            self.stats["graph_building_time"] = time.perf_counter() - t0
-
-            # ---------- Этап 3: Сравнение ----------
-            t0 = time.perf_counter()
-            delta = self.comparator.compare(graph_a, graph_b)
-            self.stats["comparison_time"] = time.perf_counter() - t0
+            graph_a, graph_b = self._build_graphs(sql_a, sql_b)
+            return self._detect_graphs(graph_a, graph_b, total_start)
 
-            # ---------- Этап 4: Применение правил ----------
-            t0 = time.perf_counter()
-            result = self.registry.apply_all(delta, graph_a, graph_b)
-            self.stats["rule_application_time"] = time.perf_counter() - t0
+        except Exception as e:
+            return self._generate_error_report(str(e))
+
+    def detect_files(self, path_a: str, path_b: str) -> Dict[str, Any]:
+        """
+        Потоковый режим: файлы схем читаются блоками, операторы
+        разбираются и добавляются в граф по одному. Весь SQL-текст
+        в память не загружается.
+        """
+
+        total_start = time.perf_counter()
+        self.instrumentation.reset()
+        self._new_key_table()
+
+        try:
+            graph_a, graph_b = self._build_file_graphs(path_a, path_b)
+            return self._detect_graphs(graph_a, graph_b, total_start)
+
+        except Exception as e:
+            return self._generate_error_report(str(e))
+
+    def gate(self, sql_a: str, sql_b: str) -> Dict[str, Any]:
+        """
+        Режим проверки слияния (CI): нужен только ответ merge_blocked.
+
+        Правила выполняются в порядке критичности до первого критического
+        конфликта (RuleRegistry.gate); отчёт — вердикт и этот конфликт,
+        без деталей по остальным правилам и анализа Δ.
+        Ошибка обработки блокирует слияние (_generate_error_report).
+        """
+
+        total_start = time.perf_counter()
+        self.instrumentation.reset()
+        self._new_key_table()
+
+        try:
+            graph_a, graph_b = self._build_graphs(sql_a, sql_b)
+            return self._gate_graphs(graph_a, graph_b, total_start)
+
+        except Exception as e:
+            return self._generate_error_report(str(e))
+
+    def gate_files(self, path_a: str, path_b: str) -> Dict[str, Any]:
+        """
+        gate() в потоковом режиме (как detect_files).
+        """
+
+        total_start = time.perf_counter()
+        self.instrumentation.reset()
+        self._new_key_table()
+
+        try:
+            graph_a, graph_b = self._build_file_graphs(path_a, path_b)
+            return self._gate_graphs(graph_a, graph_b, total_start)
+
+        except Exception as e:
+            return self._generate_error_report(str(e))
+
+    def detect_incremental(self, sql_a: str, sql_b: str) -> Dict[str, Any]:
+        """
+        Инкрементальный режим для повторных запусков на слегка изменённых схемах
+        (редактор, pre-commit): разбираются только изменённые операторы, граф
+        и Δ обновляются точечно, перезапускаются только правила с изменившимися
+        входами (BaseRule.inputs). Первый запуск — полный.
+
+        Результат совпадает с detect() для тех же схем; сведения о работе
+        режима — в performance["incremental"].
+        """
+
+        total_start = time.perf_counter()
+        instr = self.instrumentation
+        instr.reset()
+
+        try:
+            with instr.stage("splitting") as st:
+                texts_a = self._split_raw_statements(sql_a)
+                texts_b = self._split_raw_statements(sql_b)
+                st.count(statements=len(texts_a) + len(texts_b))
+
+            info: Dict[str, Any]
+            if self._incremental is None:
+                info = self._incremental_rebuild(texts_a, texts_b)
+            else:
+                try:
+                    info = self._incremental_update(texts_a, texts_b)
+                except IncrementalFallback as e:
+                    info = self._incremental_rebuild(texts_a, texts_b)
+                    info["fallback_reason"] = str(e)
+
+            state = self._incremental
+            changed_inputs = info.pop("changed_inputs")
+
+            delta = state.delta()
+            self.stats["comparison_time"] = instr.metrics("comparison").wall_time
+
+            with instr.stage("rules") as st:
+                previous = state.rule_results if changed_inputs is not None else None
+                state.rule_results = self.registry.run_rules(
+                    delta, state.a.graph, state.b.graph,
+                    previous=previous,
+                    changed_inputs=changed_inputs,
+                )
+                result = self.registry.merge_results(state.rule_results)
+                st.count(conflicts=len(result.get("conflicts", [])))
+            self.stats["rule_application_time"] = st.wall_time
+
+            info["changed_inputs"] = sorted(changed_inputs) if changed_inputs is not None else None
+            info["rules_rerun"] = [
+                rule_id for rule_id, res in state.rule_results.items()
+                if (previous is None or previous.get(rule_id) is not res) and not res[1].get("skipped")
+            ]
 
             self.stats["total_time"] = time.perf_counter() - total_start
+            report = self._generate_report(result, delta, state.a.graph, state.b.graph)
+            report["performance"]["incremental"] = info
+            return report
+
+        except Exception as e:
+            self._incremental = None
+            return self._generate_error_report(str(e))
+
+    def reset_incremental(self) -> None:
+        """Сбрасывает состояние инкрементального режима."""
+        self._incremental = None
+
+    def detect_batch(
+        self,
+        path_a: str,
+        paths_b: Sequence[str],
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Пакетный режим: одна базовая схема A против N схем-кандидатов.
 
-            return self._generate_report(result, delta, graph_a, graph_b)
+        Граф A строится один раз; сравнение и правила для кандидатов
+        выполняются в пуле процессов (граф A передаётся каждому процессу
+        один раз при инициализации). max_workers=1 — последовательно
+        в текущем процессе.
+
+        Возвращает агрегированный отчёт; полные отчёты по кандидатам —
+        в ключе "reports" (в порядке paths_b).
+        """
+
+        total_start = time.perf_counter()
+        self.instrumentation.reset()
+        self._new_key_table()
+
+        try:
+            graph_a = self._load_file_graph(path_a, "schema_a")
+        except Exception as e:
+            return self._generate_error_report(str(e))
+
+        if max_workers is None:
+            max_workers = self.config.get("batch_workers") or os.cpu_count() or 1
+        max_workers = max(1, min(int(max_workers), len(paths_b)))
+
+        if max_workers == 1:
+            _batch_worker_init(self.config, graph_a)
+            reports = [_batch_worker_run(path) for path in paths_b]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_batch_worker_init,
+                initargs=(self.config, graph_a),
+            ) as pool:
+                reports = list(pool.map(_batch_worker_run, paths_b))
+
+        return self._generate_batch_report(
+            path_a, list(paths_b), reports, graph_a, time.perf_counter() - total_start
+        )
+
+    def impact(
+        self,
+        sql_text: str,
+        names: Sequence[str],
+        relations: Optional[Iterable[RelationType]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Радиус поражения: какие объекты схемы транзитивно затронет
+        удаление каждого из объектов names.
+
+        Имена: "table", "schema.table", "table.column",
+        "schema.table.column"; для "a.b" сначала ищется таблица b
+        в схеме a, затем колонка b таблицы a. Поиск без учёта регистра.
+        relations — отношения, по которым распространяется удаление
+        (по умолчанию REFERENCES и DEPENDS_ON, см. ReachabilityIndex).
+        """
+
+        total_start = time.perf_counter()
+        self.instrumentation.reset()
+        self._new_key_table()
+
+        try:
+            key = self._text_key(sql_text)
+            cached = self._cache_get(key, "schema_a")
+            if cached:
+                graph = cached[1]
+            else:
+                objects = self._parse_schema(sql_text)
+                graph = self.graph_builder.build_from_objects(objects, "schema_a")
+                self._cache_put(key, objects, graph)
+            return self._impact_report(graph, names, relations, total_start)
+
+        except Exception as e:
+            return self._generate_error_report(str(e))
+
+    def impact_file(
+        self,
+        path: str,
+        names: Sequence[str],
+        relations: Optional[Iterable[RelationType]] = None,
+    ) -> Dict[str, Any]:
+        """
+        impact() для схемы из файла (с учётом кэша).
+        """
+
+        total_start = time.perf_counter()
+        self.instrumentation.reset()
+        self._new_key_table()
+
+        try:
+            graph = self._load_file_graph(path, "schema_a")
+            return self._impact_report(graph, names, relations, total_start)
 
         except Exception as e:
             return self._generate_error_report(str(e))
@@ -83,23 +323,400 @@ class MigrationConflictDetector:
     # INTERNAL METHODS
     # ==========================================================
 
+    def _new_key_table(self) -> None:
+        """
+        Своя таблица ключей на каждый запуск: графы A и B запуска сравниваются
+        по номерам ключей, а таблица не растёт в долгоживущем детекторе.
+        """
+        self.graph_builder.key_table = KeyTable()
+
+    def _split_raw_statements(self, sql_text: str) -> List[str]:
+        """Тексты операторов как есть (без токенизации) — ключи инкрементального режима."""
+        return list(self.stream_reader.iter_statements(io.StringIO(sql_text)))
+
+    def _incremental_rebuild(self, texts_a: List[str], texts_b: List[str]) -> Dict[str, Any]:
+        instr = self.instrumentation
+        self._incremental = None
+        self._new_key_table()
+
+        # парсинг идёт внутри построения снимков: этапы tokenizer/parser вложены
+        with instr.stage("graph_building"):
+            a = SchemaSnapshot.build("schema_a", texts_a, self._parse_schema, self.graph_builder)
+            b = SchemaSnapshot.build("schema_b", texts_b, self._parse_schema, self.graph_builder)
+
+        with instr.stage("comparison"):
+            self._incremental = IncrementalState(a, b)
+
+        self._split_parse_stats()
+        return {
+            "mode": "full",
+            "statements_reparsed": len(texts_a) + len(texts_b),
+            "changed_inputs": None,
+        }
+
+    def _incremental_update(self, texts_a: List[str], texts_b: List[str]) -> Dict[str, Any]:
+        instr = self.instrumentation
+        state = self._incremental
+        changed_inputs = set()
+        reparsed = 0
+
+        for side, snapshot, texts in (("a", state.a, texts_a), ("b", state.b, texts_b)):
+            with instr.stage("graph_building"):
+                patch, touched, parsed = snapshot.update(texts, self._parse_schema, self.graph_builder)
+            reparsed += parsed
+
+            if patch.is_empty():
+                continue
+
+            with instr.stage("comparison"):
+                changed_inputs |= state.reclassify(touched)
+                changed_inputs |= state.apply_edge_patch(side, patch)
+                if structure_changed(patch, snapshot.graph):
+                    changed_inputs.add(f"graph_{side}")
+
+        self._split_parse_stats()
+        return {
+            "mode": "incremental",
+            "statements_reparsed": reparsed,
+            "changed_inputs": changed_inputs,
+        }
+
+    def _split_parse_stats(self) -> None:
+        """parsing_time / graph_building_time, когда парсинг вложен в построение."""
+        instr = self.instrumentation
+        self.stats["parsing_time"] = sum(
+            instr.metrics(name).wall_time for name in ("tokenizer", "normalizer", "parser")
+        )
+        self.stats["graph_building_time"] = instr.metrics("graph_building").wall_time - self.stats["parsing_time"]
+
+    def _build_graphs(self, sql_a: str, sql_b: str) -> Tuple[SchemaGraph, SchemaGraph]:
+        """
+        Этапы 0-2 (кэш, парсинг, построение графов) для SQL-текстов.
+        """
+        instr = self.instrumentation
+
+        # ---------- Этап 0: Кэш ----------
+        with instr.stage("cache"):
+            key_a = self._text_key(sql_a)
+            key_b = self._text_key(sql_b)
+            cached_a = self._cache_get(key_a, "schema_a")
+            cached_b = self._cache_get(key_b, "schema_b")
+
+        # ---------- Этап 1: Парсинг ----------
+        with instr.stage("parsing") as st:
+            objects_a = cached_a[0] if cached_a else self._parse_schema(sql_a)
+            objects_b = cached_b[0] if cached_b else self._parse_schema(sql_b)
+            st.count(objects=len(objects_a) + len(objects_b))
+        self.stats["parsing_time"] = st.wall_time
+
+        # ---------- Этап 2: Построение графов ----------
+        with instr.stage("graph_building") as st:
+            graph_a = cached_a[1] if cached_a else self.graph_builder.build_from_objects(objects_a, "schema_a")
+            graph_b = cached_b[1] if cached_b else self.graph_builder.build_from_objects(objects_b, "schema_b")
+            self._count_graphs(st, graph_a, graph_b)
+        self.stats["graph_building_time"] = st.wall_time
+
+        if not cached_a:
+            self._cache_put(key_a, objects_a, graph_a)
+        if not cached_b:
+            self._cache_put(key_b, objects_b, graph_b)
+
+        return graph_a, graph_b
+
+    def _build_file_graphs(self, path_a: str, path_b: str) -> Tuple[SchemaGraph, SchemaGraph]:
+        """
+        Этапы 1-2 потокового режима: парсинг идёт внутри построения
+        (оператор за оператором), этап "parsing" вложен в "graph_building".
+        """
+        instr = self.instrumentation
+
+        with instr.stage("graph_building") as st:
+            graph_a = self._build_file_graph(path_a, "schema_a")
+            graph_b = self._build_file_graph(path_b, "schema_b")
+            self._count_graphs(st, graph_a, graph_b)
+
+        self.stats["parsing_time"] = instr.metrics("parsing").wall_time
+        self.stats["graph_building_time"] = st.wall_time - self.stats["parsing_time"]
+
+        return graph_a, graph_b
+
+    def _load_file_graph(self, path: str, name: str) -> SchemaGraph:
+        """
+        Читает SQL-файл целиком и строит граф (с учётом кэша).
+        """
+        with open(path, encoding="utf-8") as f:
+            sql_text = f.read()
+
+        key = self._text_key(sql_text)
+        cached = self._cache_get(key, name)
+        if cached:
+            return cached[1]
+
+        with self.instrumentation.stage("parsing") as st:
+            objects = self._parse_schema(sql_text)
+            st.count(objects=len(objects))
+        self.stats["parsing_time"] = st.wall_time
+
+        with self.instrumentation.stage("graph_building") as st:
+            graph = self.graph_builder.build_from_objects(objects, name)
+            self._count_graphs(st, graph)
+        self.stats["graph_building_time"] = st.wall_time
+
+        self._cache_put(key, objects, graph)
+        return graph
+
+    def _detect_graphs(
+        self,
+        graph_a: SchemaGraph,
+        graph_b: SchemaGraph,
+        total_start: float,
+    ) -> Dict[str, Any]:
+        """
+        Этапы 3-4 (сравнение и правила) по уже построенным графам.
+        """
+        instr = self.instrumentation
+
+        # ---------- Этап 3: Сравнение ----------
+        delta = self._compare(graph_a, graph_b)
+
+        # ---------- Этап 4: Применение правил ----------
+        with instr.stage("rules") as st:
+            result = self.registry.apply_all(delta, graph_a, graph_b)
+            st.count(conflicts=len(result.get("conflicts", [])))
+        self.stats["rule_application_time"] = st.wall_time
+
+        self.stats["total_time"] = time.perf_counter() - total_start
+
+        return self._generate_report(result, delta, graph_a, graph_b)
+
+    def _compare(self, graph_a: SchemaGraph, graph_b: SchemaGraph) -> Delta:
+        with self.instrumentation.stage("comparison") as st:
+            delta = self.comparator.compare(graph_a, graph_b)
+            st.count(
+                objects_added=len(delta.objects_added),
+                objects_removed=len(delta.objects_removed),
+                objects_modified=len(delta.objects_modified),
+            )
+        self.stats["comparison_time"] = st.wall_time
+        return delta
+
+    def _gate_graphs(
+        self,
+        graph_a: SchemaGraph,
+        graph_b: SchemaGraph,
+        total_start: float,
+    ) -> Dict[str, Any]:
+        """
+        Сравнение и правила в режиме проверки слияния (RuleRegistry.gate).
+        """
+        delta = self._compare(graph_a, graph_b)
+
+        with self.instrumentation.stage("rules") as st:
+            conflict, evaluated = self.registry.gate(delta, graph_a, graph_b)
+        self.stats["rule_application_time"] = st.wall_time
+
+        self.stats["total_time"] = time.perf_counter() - total_start
+
+        return {
+            "metadata": {
+                "timestamp": datetime.now().isoformat(),
+                "status": "OK",
+                "mode": "gate",
+            },
+            "summary": {
+                "merge_blocked": conflict is not None,
+                "rules_evaluated": evaluated,
+                "rules_enabled": len(self.registry.get_enabled_rules()),
+            },
+            "conflicts": [conflict] if conflict is not None else [],
+            "performance": {
+                "parsing_time": self.stats["parsing_time"],
+                "graph_building_time": self.stats["graph_building_time"],
+                "comparison_time": self.stats["comparison_time"],
+                "rule_application_time": self.stats["rule_application_time"],
+                "total_time": self.stats["total_time"],
+            },
+        }
+
     def _parse_schema(self, sql_text: str) -> List[DatabaseObject]:
         """
         Парсит SQL-схему в список объектов БД.
-        """
 
-        normalized = self.normalizer.normalize(sql_text)
-        statements = self.normalizer.split_statements(normalized)
+        Текст токенизируется один раз; срезы токенов по операторам
+        передаются в парсер без повторной нормализации.
+
+        Этапы: "tokenizer" — токенизация с нормализацией (комментарии,
+        пробелы, регистр ключевых слов и идентификаторов снимает сам
+        токенизатор), "normalizer" — отбор DDL-операторов, "parser".
+        """
 
         objects: List[DatabaseObject] = []
-        for stmt in statements:
-            if self.normalizer.is_ddl_statement(stmt):
-                parsed = self.parser.parse_to_objects(stmt)
+        for stmt_tokens in self.instrumentation.iterate(
+            "tokenizer", self.normalizer.iter_statements(sql_text), unit="statements"
+        ):
+            if self._is_ddl(stmt_tokens):
+                parsed = self._parse_tokens(stmt_tokens)
                 if parsed:
                     objects.extend(parsed)
 
         return objects
 
+    def _is_ddl(self, stmt_tokens: Sequence[Token]) -> bool:
+        with self.instrumentation.stage("normalizer") as st:
+            is_ddl = self.normalizer.is_ddl_tokens(stmt_tokens)
+            st.count(statements=1, ddl=int(is_ddl))
+        return is_ddl
+
+    def _parse_tokens(self, stmt_tokens: Sequence[Token]) -> List[DatabaseObject]:
+        with self.instrumentation.stage("parser") as st:
+            parsed = self.parser.parse_statement(stmt_tokens)
+            st.count(statements=1, objects=len(parsed))
+        return parsed
+
+    @staticmethod
+    def _count_graphs(st: StageMetrics, *graphs: SchemaGraph) -> None:
+        st.count(
+            vertices=sum(len(g.vertices) for g in graphs),
+            edges=sum(len(g.edges) for g in graphs),
+        )
+
+    def _build_file_graph(self, path: str, name: str) -> SchemaGraph:
+        """
+        Потоковое построение графа файла с учётом кэша.
+        """
+        key = self._file_key(path)
+        cached = self._cache_get(key, name)
+        if cached:
+            return cached[1]
+
+        graph = self.graph_builder.build_from_stream(self._iter_file_objects(path), name)
+        objects = [v for v in graph.vertices.values() if v.type == ObjectType.TABLE]
+        self._cache_put(key, objects, graph)
+        return graph
+
+    def _text_key(self, sql_text: str) -> Optional[str]:
+        if self.cache is None and self.memory_cache is None:
+            return None
+        return GraphCache.key_for_text(sql_text)
+
+    def _file_key(self, path: str) -> Optional[str]:
+        if self.cache is None and self.memory_cache is None:
+            return None
+        return GraphCache.key_for_file(path)
+
+    def _cache_get(self, key: Optional[str], name: str) -> Optional[Tuple[List[DatabaseObject], SchemaGraph]]:
+        if key is None:
+            return None
+
+        cached = self.memory_cache.get(key) if self.memory_cache is not None else None
+        if cached is None and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None and self.memory_cache is not None:
+                self.memory_cache.put(key, *cached)
+
+        if cached is None:
+            self.stats["cache_misses"] = self.stats.get("cache_misses", 0) + 1
+            return None
+
+        self.stats["cache_hits"] = self.stats.get("cache_hits", 0) + 1
+        objects, graph = cached
+        graph.name = name
+        return objects, graph
+
+    def _cache_put(self, key: Optional[str], objects: List[DatabaseObject], graph: SchemaGraph) -> None:
+        if key is None:
+            return
+        if self.memory_cache is not None:
+            self.memory_cache.put(key, objects, graph)
+        if self.cache is None:
+            return
+        try:
+            self.cache.put(key, objects, graph)
+        except CacheError:
+            # кэш — оптимизация: ошибка записи не должна ломать анализ
+            pass
+
+    def _impact_report(
+        self,
+        graph: SchemaGraph,
+        names: Sequence[str],
+        relations: Optional[Iterable[RelationType]],
+        total_start: float,
+    ) -> Dict[str, Any]:
+        build_start = time.perf_counter()
+        index = graph.reachability(relations)
+        index_time = time.perf_counter() - build_start
+
+        by_key = graph.key_index()
+        results: List[Dict[str, Any]] = []
+        not_found: List[str] = []
+        for name in names:
+            obj = self._resolve_object(graph, by_key, name)
+            if obj is None:
+                not_found.append(name)
+            else:
+                results.append(impact_of(graph, obj, index.relations))
+
+        return {
+            "metadata": {
+                "timestamp": datetime.now().isoformat(),
+                "status": "OK" if not not_found else "PARTIAL",
+                "mode": "impact",
+            },
+            "relations": sorted(r.value for r in index.relations),
+            "impact": results,
+            "not_found": not_found,
+            "performance": {
+                "vertices": len(graph.vertices),
+                "components": len(index.components),
+                "index_build_time": index_time,
+                "total_time": time.perf_counter() - total_start,
+            },
+        }
+
+    @staticmethod
+    def _resolve_object(graph: SchemaGraph, by_key: Dict[int, int], name: str) -> Optional[DatabaseObject]:
+        """
+        Объект графа по имени из impact(): ключ сопоставления собирается
+        из частей имени и ищется в таблице ключей графа (by_key — key_index()).
+        """
+        parts = [p.strip().strip('"').lower() for p in name.split(".")]
+        table_type = ObjectType.TABLE.value
+        column_type = ObjectType.COLUMN.value
+
+        if len(parts) == 1:
+            candidates = [("public", table_type, "", parts[0])] + [
+                ("public", t.value, "", parts[0]) for t in ObjectType if t.value not in (table_type, column_type)
+            ]
+        elif len(parts) == 2:
+            candidates = [
+                (parts[0], table_type, "", parts[1]),
+                ("public", column_type, parts[0], parts[1]),
+            ]
+        elif len(parts) == 3:
+            candidates = [(parts[0], column_type, parts[1], parts[2])]
+        else:
+            return None
+
+        for candidate in candidates:
+            key_id = graph.key_table.get(candidate)
+            if key_id is not None and key_id in by_key:
+                return graph.vertices[by_key[key_id]]
+        return None
+
+    def _iter_file_objects(self, path: str) -> Iterator[DatabaseObject]:
+        """
+        Потоковый парсинг файла: оператор за оператором.
+        Время разбора накапливается в этапе "parsing".
+        """
+        instr = self.instrumentation
+        for stmt_text in instr.iterate("stream_reader", self.stream_reader.iter_statements(path), unit="statements"):
+            with instr.stage("parsing") as st:
+                parsed = self._parse_schema(stmt_text)
+                st.count(objects=len(parsed))
+
+            yield from parsed
+
     # ==========================================================
     # REPORT GENERATION
     # ==========================================================
@@ -180,9 +797,82 @@ class MigrationConflictDetector:
                     },
                 },
                 "rules_applied": len(statistics),
+                "rules_skipped": sum(1 for st in statistics if st.get("skipped")),
             },
 
-            "performance": self.stats,
+            "performance": {
+                **self.stats,
+                "stages": self.instrumentation.summary(),
+            },
+        }
+
+    def _generate_batch_report(
+        self,
+        path_a: str,
+        paths_b: List[str],
+        reports: List[Dict[str, Any]],
+        graph_a: SchemaGraph,
+        total_time: float,
+    ) -> Dict[str, Any]:
+        """
+        Агрегированный отчёт пакетного режима.
+        """
+
+        candidates: List[Dict[str, Any]] = []
+        totals = {
+            "total_conflicts": 0,
+            "critical_conflicts": 0,
+            "high_conflicts": 0,
+            "medium_conflicts": 0,
+            "low_conflicts": 0,
+        }
+        by_rule: Dict[str, int] = {}
+
+        for path, report in zip(paths_b, reports):
+            summary = report.get("summary", {})
+            candidates.append({
+                "schema_b": path,
+                "status": "ERROR" if "error" in report else "OK",
+                "merge_blocked": bool(summary.get("merge_blocked")),
+                "total_conflicts": summary.get("total_conflicts", 0),
+                "critical_conflicts": summary.get("critical_conflicts", 0),
+            })
+            for k in totals:
+                totals[k] += int(summary.get(k, 0) or 0)
+            for rule, count in report.get("conflicts_structured", {}).get("by_rule", {}).items():
+                by_rule[rule] = by_rule.get(rule, 0) + count
+
+        blocked = sum(1 for c in candidates if c["merge_blocked"])
+
+        return {
+            "metadata": {
+                "timestamp": datetime.now().isoformat(),
+                "tool": "PostgreSQL Migration Conflict Detector",
+                "version": "1.0.0",
+                "mode": "batch",
+            },
+            "summary": {
+                "schema_a": path_a,
+                "candidates": len(candidates),
+                "merge_blocked_candidates": blocked,
+                "merge_blocked": blocked > 0,
+                **totals,
+            },
+            "candidates": candidates,
+            "by_rule": by_rule,
+            "analysis": {
+                "schema_a": {
+                    "vertices": len(graph_a.vertices),
+                    "edges": len(graph_a.edges),
+                },
+            },
+            "performance": {
+                "baseline_parsing_time": self.stats["parsing_time"],
+                "baseline_graph_building_time": self.stats["graph_building_time"],
+                "total_time": total_time,
+                "stages": self.instrumentation.summary(),
+            },
+            "reports": reports,
         }
 
     def _generate_error_report(self, error_message: str) -> Dict[str, Any]:
@@ -240,3 +930,33 @@ class MigrationConflictDetector:
             by_rule[rule] = by_rule.get(rule, 0) + 1
         return by_rule
 
+
+
+# ==========================================================
+# BATCH WORKERS
+# ==========================================================
+# Функции уровня модуля: их вызывает пул процессов. Состояние процесса
+# (детектор и базовый граф A) создаётся один раз в _batch_worker_init.
+
+_batch_detector: Optional[MigrationConflictDetector] = None
+_batch_graph_a: Optional[SchemaGraph] = None
+
+
+def _batch_worker_init(config: Dict[str, Any], graph_a: SchemaGraph) -> None:
+    global _batch_detector, _batch_graph_a
+    _batch_detector = MigrationConflictDetector(config)
+    # кандидаты строятся с таблицей ключей базовой схемы
+    _batch_detector.graph_builder.key_table = graph_a.key_table
+    _batch_graph_a = graph_a
+
+
+def _batch_worker_run(path_b: str) -> Dict[str, Any]:
+    detector = _batch_detector
+    total_start = time.perf_counter()
+    detector.instrumentation.reset()
+
+    try:
+        graph_b = detector._load_file_graph(path_b, "schema_b")
+        return detector._detect_graphs(_batch_graph_a, graph_b, total_start)
+    except Exception as e:
+        return detector._generate_error_report(str(e))
@@ -359,6 +359,15 @@ class Reporter:
             out.append(f"  Сравнение: {perf.get('comparison_time', 0):.4f}с")
             out.append(f"  Проверка правил: {perf.get('rule_application_time', 0):.4f}с")
 
+            stages = perf.get("stages") or {}
+            if stages:
+                out.append("  Этапы (wall / CPU / пик памяти):")
+                for name, m in stages.items():
+                    line = f"    {name}: {m.get('wall_time', 0):.4f}с / {m.get('cpu_time', 0):.4f}с"
+                    if m.get("peak_memory") is not None:
+                        line += f" / {m['peak_memory'] / 1024:.1f} КБ"
+                    out.append(line)
+
         hyp = report.get("hypothesis_validation")
         if hyp:
             out.append("\n" + "=" * 70)
@@ -0,0 +1,417 @@
+"""
+Долгоживущий сервер детектора.
+
+Запуск python main.py на каждую проверку платит за старт интерпретатора,
+импорты, компиляцию регулярных выражений токенизатора и нормализатора
+и полный разбор базовой схемы. Сервер держит детекторы
+(MigrationConflictDetector) и построенные графы схем в памяти
+(MemoryGraphCache), поэтому повторная проверка против той же базовой
+схемы сводится к разбору кандидата, сравнению и правилам.
+
+Протокол — JSON поверх HTTP/1.1 на localhost (host:port) или Unix-сокете
+(unix:/path/to.sock):
+
+    POST /detect  {"a": path | "sql_a": text, "b": path | "sql_b": text,
+                   "format": "json" | "text" | "markdown" | "html",
+                   "stream": bool, "config": {...}}
+    POST /gate    {"a"/"sql_a", "b"/"sql_b", "stream", "config"}
+    POST /impact  {"a"/"sql_a", "objects": [...], "config"}
+    GET  /health
+
+Ответ: {"report": отчёт, "exit_code": код как у main.py} и для format,
+отличного от json, — "output" (отчёт в этом формате).
+
+Пути читаются сервером, поэтому слушать можно только локальные адреса;
+по умолчанию — Unix-сокет с правами 0600 (подключиться может только
+владелец). На TCP-порт localhost может слать запросы и браузер, поэтому
+там принимаются только запросы с Host — локальным именем (защита от DNS
+rebinding) и POST с Content-Type: application/json (такой запрос с чужой
+страницы требует CORS preflight, на который сервер не отвечает). "config" запроса ограничен ключами REQUEST_CONFIG_KEYS:
+каталог кэша, размеры пулов и кэшей задаются только при запуске сервера
+(кэш графов читается через pickle — каталог из запроса означал бы
+выполнение чужого кода от имени сервера).
+
+Запросы обслуживаются последовательно: детекторы хранят состояние
+запуска (stats, instrumentation, таблица ключей) и не потокобезопасны.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from src.detection.client import DEFAULT_ADDRESS, UNIX_PREFIX
+from src.detection.orchestrator import MigrationConflictDetector
+from src.detection.reporter import Reporter
+from src.graph import MemoryGraphCache
+
+
+LOOPBACK_HOSTS = frozenset({"127.0.0.1", "localhost", "::1"})
+
+# Ключи конфигурации детектора, которые может переопределить запрос.
+# Остальные (cache_dir, cache_enabled, max_cache_size, memory_cache_size,
+# batch_workers, stream_chunk_size, ...) задаются только при запуске сервера
+REQUEST_CONFIG_KEYS = frozenset({"rules", "max_conflicts", "trace_memory", "instrumentation"})
+
+# Ключи конфигурации RuleRegistry ("rules") в запросе: без execution_mode
+# и max_workers — пулы процессов и потоков настраивает сервер
+REQUEST_RULES_KEYS = frozenset({
+    "rules",
+    "rule_order",
+    "custom_order",
+    "default_conflict_level",
+    "max_total_conflicts",
+    "enable_statistics",
+    "skip_empty_inputs",
+})
+
+
+class RequestError(Exception):
+    """Некорректный запрос клиента (HTTP 400)."""
+
+
+def parse_address(address: str) -> Tuple[str, Any]:
+    """
+    Разбирает адрес сервера: ("unix", путь) или ("tcp", (host, port)).
+    Допускаются "unix:/path", путь с "/", "host:port" и "port".
+    """
+    if address.startswith(UNIX_PREFIX):
+        return "unix", address[len(UNIX_PREFIX):]
+    if "/" in address:
+        return "unix", address
+
+    host, _, port = address.rpartition(":")
+    host = host.strip("[]") or "127.0.0.1"
+    if not port.isdigit():
+        raise ValueError(f"Некорректный адрес сервера: {address}")
+    return "tcp", (host, int(port))
+
+
+class DetectorService:
+    """
+    Обработка запросов сервера без транспорта: детекторы по конфигурации
+    и общий кэш графов в памяти.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        reporter_config: Optional[Dict[str, Any]] = None,
+        *,
+        memory_cache_size: int = 16,
+        max_detectors: int = 8,
+    ):
+        self.config = config or {}
+        self.reporter = Reporter(reporter_config or {})
+        self.memory_cache = MemoryGraphCache(memory_cache_size)
+        self.max_detectors = max_detectors
+
+        # конфигурация запроса (JSON) → детектор
+        self._detectors: Dict[str, MigrationConflictDetector] = {}
+        self.started = time.time()
+        self.requests = 0
+
+    # ==========
+    # ДЕТЕКТОРЫ
+    # ==========
+
+    def detector(self, overrides: Optional[Dict[str, Any]] = None) -> MigrationConflictDetector:
+        config = {**self.config, **(overrides or {})}
+        key = json.dumps(config, sort_keys=True, default=str)
+
+        detector = self._detectors.get(key)
+        if detector is None:
+            if len(self._detectors) >= self.max_detectors:
+                self._detectors.pop(next(iter(self._detectors)))
+            detector = MigrationConflictDetector(config)
+            detector.memory_cache = self.memory_cache
+            self._detectors[key] = detector
+        return detector
+
+    # ==========
+    # ЗАПРОСЫ
+    # ==========
+
+    def handle(self, op: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Выполняет запрос op ("detect" | "gate" | "impact" | "health").
+        Некорректный запрос — RequestError.
+        """
+        if op == "health":
+            return {
+                "status": "ok",
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started,
+                "requests": self.requests,
+                "detectors": len(self._detectors),
+                "cached_graphs": len(self.memory_cache),
+            }
+
+        handler = {"detect": self._detect, "gate": self._gate, "impact": self._impact}.get(op)
+        if handler is None:
+            raise RequestError(f"Неизвестный запрос: {op}")
+        if not isinstance(request, dict):
+            raise RequestError("Тело запроса должно быть JSON-объектом")
+
+        self.requests += 1
+        return handler(self.detector(_request_config(request.get("config"))), request)
+
+    def _detect(self, detector: MigrationConflictDetector, request: Dict[str, Any]) -> Dict[str, Any]:
+        fmt = request.get("format") or "json"
+        if request.get("stream"):
+            report = detector.detect_files(_path(request, "a"), _path(request, "b"))
+        else:
+            report = detector.detect(_sql(request, "a"), _sql(request, "b"))
+
+        response: Dict[str, Any] = {"report": report, "exit_code": 0}
+        if fmt != "json":
+            try:
+                response["output"] = self.reporter.export(report, format=fmt)
+            except ValueError as e:
+                raise RequestError(str(e))
+        return response
+
+    def _gate(self, detector: MigrationConflictDetector, request: Dict[str, Any]) -> Dict[str, Any]:
+        if request.get("stream"):
+            verdict = detector.gate_files(_path(request, "a"), _path(request, "b"))
+        else:
+            verdict = detector.gate(_sql(request, "a"), _sql(request, "b"))
+        return {"report": verdict, "exit_code": 1 if verdict["summary"]["merge_blocked"] else 0}
+
+    def _impact(self, detector: MigrationConflictDetector, request: Dict[str, Any]) -> Dict[str, Any]:
+        names = request.get("objects")
+        if not isinstance(names, list) or not names:
+            raise RequestError("objects должен быть непустым списком имён")
+        report = detector.impact(_sql(request, "a"), [str(n) for n in names])
+        failed = "error" in report or bool(report.get("not_found"))
+        return {"report": report, "exit_code": 1 if failed else 0}
+
+
+def _request_config(config: Any) -> Dict[str, Any]:
+    """
+    Конфигурация детектора из запроса: только ключи REQUEST_CONFIG_KEYS
+    (и REQUEST_RULES_KEYS внутри "rules"), иначе RequestError.
+    """
+    if config is None:
+        return {}
+    if not isinstance(config, dict):
+        raise RequestError("config должен быть JSON-объектом")
+
+    rejected = sorted(set(config) - REQUEST_CONFIG_KEYS)
+    rules = config.get("rules")
+    if rules is not None:
+        if not isinstance(rules, dict):
+            raise RequestError("config.rules должен быть JSON-объектом")
+        rejected += sorted(f"rules.{key}" for key in set(rules) - REQUEST_RULES_KEYS)
+        per_rule = rules.get("rules")
+        if per_rule is not None and not (
+            isinstance(per_rule, dict) and all(isinstance(v, dict) for v in per_rule.values())
+        ):
+            raise RequestError("config.rules.rules должен быть объектом {RULE_ID: {...}}")
+
+    if rejected:
+        raise RequestError(
+            "Запрос не может задавать ключи конфигурации: " + ", ".join(rejected)
+            + " (они задаются при запуске сервера)"
+        )
+    return config
+
+
+def _path(request: Dict[str, Any], side: str) -> str:
+    path = request.get(side)
+    if not isinstance(path, str) or not path:
+        raise RequestError(f"Не указан путь к схеме {side}")
+    return path
+
+
+def _sql(request: Dict[str, Any], side: str) -> str:
+    """SQL стороны side: текст из "sql_<side>" или содержимое файла "<side>"."""
+    text = request.get(f"sql_{side}")
+    if isinstance(text, str):
+        return text
+
+    path = _path(request, side)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except OSError as e:
+        raise RequestError(f"Не удалось прочитать файл {path}: {e}")
+
+
+# ==========================================================
+# HTTP
+# ==========================================================
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MigrationConflictDetector"
+
+    def do_GET(self) -> None:
+        if self._check_headers(post=False):
+            self._dispatch(None)
+
+    def do_POST(self) -> None:
+        if not self._check_headers(post=True):
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send(400, {"error": f"Некорректный JSON: {e}"})
+            return
+        self._dispatch(body)
+
+    def _check_headers(self, post: bool) -> bool:
+        """
+        Для TCP: Host — локальное имя, у POST — Content-Type: application/json.
+        Иначе отвечает ошибкой, закрывает соединение и возвращает False.
+        """
+        if getattr(self.server, "kind", None) != "tcp":
+            return True
+
+        host = _host_name(self.headers.get("Host") or "")
+        if host not in LOOPBACK_HOSTS:
+            self.close_connection = True
+            self._send(403, {"error": f"Недопустимый заголовок Host: {self.headers.get('Host')!r}"})
+            return False
+        if post and self.headers.get_content_type() != "application/json":
+            self.close_connection = True
+            self._send(415, {"error": "Ожидается Content-Type: application/json"})
+            return False
+        return True
+
+    def _dispatch(self, body: Any) -> None:
+        op = self.path.strip("/").split("?", 1)[0]
+        if (op == "health") != (body is None):
+            self._send(405, {"error": f"Метод не поддерживается для /{op}"})
+            return
+
+        service: DetectorService = self.server.service  # type: ignore[attr-defined]
+        try:
+            self._send(200, service.handle(op, body or {}))
+        except RequestError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # у Unix-сокета client_address — пустая строка
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+
+class _TCPServer(HTTPServer):
+    allow_reuse_address = True
+
+
+# UnixStreamServer есть только там, где есть AF_UNIX (нет на части Windows)
+if hasattr(socketserver, "UnixStreamServer"):
+    class _UnixServer(socketserver.UnixStreamServer):
+        pass
+else:
+    _UnixServer = None  # type: ignore[assignment,misc]
+
+
+def _host_name(header: str) -> str:
+    """Имя хоста из заголовка Host: без порта и скобок IPv6, в нижнем регистре."""
+    header = header.strip().lower()
+    if header.startswith("["):
+        return header[1:].partition("]")[0]
+    return header.partition(":")[0]
+
+
+class DetectorServer:
+    """
+    HTTP-сервер DetectorService на localhost или Unix-сокете.
+    """
+
+    def __init__(self, service: DetectorService, address: str = DEFAULT_ADDRESS, verbose: bool = False):
+        self.service = service
+        self.kind, self.address = parse_address(address)
+
+        if self.kind == "unix":
+            if _UnixServer is None:
+                raise ValueError("Unix-сокеты не поддерживаются на этой платформе: укажите host:port")
+            path = self.address
+            if os.path.exists(path):
+                _remove_stale_socket(path)
+            # сокет создаётся сразу с правами 0600: chmod после bind
+            # оставлял бы окно, в которое может подключиться кто угодно
+            umask = os.umask(0o177)
+            try:
+                self._server: socketserver.BaseServer = _UnixServer(path, _Handler)
+            finally:
+                os.umask(umask)
+        else:
+            host, port = self.address
+            if host not in LOOPBACK_HOSTS:
+                raise ValueError(f"Сервер слушает только локальные адреса, получено: {host}")
+            server_class = _TCPServer
+            if ":" in host:
+                server_class = type("_TCP6Server", (_TCPServer,), {"address_family": socket.AF_INET6})
+            self._server = server_class((host, port), _Handler)
+            self.address = self._server.server_address[:2]
+
+        self._server.kind = self.kind  # type: ignore[attr-defined]
+        self._server.service = service  # type: ignore[attr-defined]
+        self._server.verbose = verbose  # type: ignore[attr-defined]
+
+    @property
+    def url(self) -> str:
+        if self.kind == "unix":
+            return f"{UNIX_PREFIX}{self.address}"
+        host, port = self.address
+        return f"{host}:{port}"
+
+    def serve_forever(self) -> None:
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        self._server.shutdown()
+
+    def close(self) -> None:
+        self._server.server_close()
+        if self.kind == "unix" and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Удаляет файл сокета, если его никто не слушает."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(f"Сокет {path} уже используется другим сервером")
+
+
+__all__ = [
+    "DEFAULT_ADDRESS",
+    "REQUEST_CONFIG_KEYS",
+    "DetectorServer",
+    "DetectorService",
+    "RequestError",
+    "parse_address",
+]
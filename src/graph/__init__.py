@@ -6,25 +6,34 @@ graph — модуль представления и анализа графа 
 - 2.2.2 — построение графа из описания схемы
 - 2.2.3 — анализ графа (циклы, транзитивные зависимости)
 
+Модули загружаются при первом обращении к имени (src/core/lazy.py).
 """
 
-# =========================
-# Базовая структура графа
-# =========================
+from src.core.lazy import lazy_exports
 
-from .schema_graph import SchemaGraph
-
-# =========================
-# Построение графа
-# =========================
+__getattr__, __dir__ = lazy_exports(__name__, {
+    # =========================
+    # Базовая структура графа
+    # =========================
+    ".schema_graph": ("SchemaGraph", "FOREIGN_KEY_DEPENDENCIES", "FOREIGN_KEY_DEPENDENCIES_WITH_SELF"),
+    ".keys": ("KeyTable", "ObjectKey", "object_key"),
+    ".reachability": ("IMPACT_RELATIONS", "ReachabilityIndex", "impact_of"),
 
-from .builder import GraphBuilder
+    # =========================
+    # Построение графа
+    # =========================
+    ".builder": ("GraphBuilder", "GraphPatch"),
 
-# =========================
-# Анализ графа
-# =========================
+    # =========================
+    # Анализ графа
+    # =========================
+    ".analyzer": ("DeltaAnalyzer",),
 
-from .analyzer import DeltaAnalyzer
+    # =========================
+    # Кэш разобранных схем
+    # =========================
+    ".cache": ("GraphCache", "MemoryGraphCache"),
+})
 
 # =========================
 # Публичный API пакета
@@ -32,9 +41,19 @@ from .analyzer import DeltaAnalyzer
 
 __all__ = [
     "SchemaGraph",
+    "FOREIGN_KEY_DEPENDENCIES",
+    "FOREIGN_KEY_DEPENDENCIES_WITH_SELF",
+    "KeyTable",
+    "ObjectKey",
+    "object_key",
+    "IMPACT_RELATIONS",
+    "ReachabilityIndex",
+    "impact_of",
     "GraphBuilder",
+    "GraphPatch",
     "DeltaAnalyzer",
+    "GraphCache",
+    "MemoryGraphCache",
 ]
 
 __version__ = "0.1.0"
-
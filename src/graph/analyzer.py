@@ -12,16 +12,10 @@ class DeltaAnalyzer:
         self.delta = delta
 
     def modified_columns(self):
-        return [
-            m for m in self.delta.objects_modified
-            if m.before.type == ObjectType.COLUMN
-        ]
+        return self.delta.modified_by_type(ObjectType.COLUMN)
 
     def modified_tables(self):
-        return [
-            m for m in self.delta.objects_modified
-            if m.before.type == ObjectType.TABLE
-        ]
+        return self.delta.modified_by_type(ObjectType.TABLE)
 
     def has_type_changes(self) -> bool:
         return any(
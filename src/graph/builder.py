@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import List, Dict, Optional, Tuple, cast
+from dataclasses import dataclass, field
+from typing import Iterable, List, Dict, Optional, Set, Tuple, cast
 
 from src.core.models import (
     DatabaseObject,
@@ -11,7 +12,8 @@ from src.core.models import (
     Table,
     Column,
 )
-from src.graph.schema_graph import SchemaGraph
+from src.graph.keys import KeyTable
+from src.graph.schema_graph import Edge, SchemaGraph
 
 
 def _norm_ident(x: Optional[str]) -> str:
@@ -22,21 +24,38 @@ def _table_key(schema: str, table: str) -> Tuple[str, str]:
     return (_norm_ident(schema or "public"), _norm_ident(table))
 
 
+@dataclass
+class GraphPatch:
+    """
+    Результат точечного изменения графа (GraphBuilder.patch_tables).
+    """
+    removed_vertices: List[DatabaseObject] = field(default_factory=list)
+    added_vertices: List[DatabaseObject] = field(default_factory=list)
+    removed_edges: Set[Edge] = field(default_factory=set)
+    added_edges: Set[Edge] = field(default_factory=set)
+
+    def is_empty(self) -> bool:
+        return not (self.removed_vertices or self.added_vertices)
+
+
 class GraphBuilder:
     """
     Строит ориентированный граф схемы БД: G = (V, E).
     """
 
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, key_table: Optional[KeyTable] = None):
         self.verbose = verbose
         self.graph: Optional[SchemaGraph] = None
+        # общая таблица ключей всех строящихся графов: графы A и B
+        # сравниваются по номерам ключей без пересчёта
+        self.key_table: KeyTable = key_table if key_table is not None else KeyTable()
 
     def build_from_objects(
         self,
         objects: List[DatabaseObject],
         name: str = "",
     ) -> SchemaGraph:
-        self.graph = SchemaGraph(name=name)
+        self.graph = SchemaGraph(name=name, key_table=self.key_table)
         table_ids: Dict[Tuple[str, str], int] = {}
 
         # ---------- TABLES ----------
@@ -59,35 +78,159 @@ class GraphBuilder:
             if not table_id:
                 continue
 
-            for column in table.columns.values():
-                column_id = self._add_column(column, table_id)
-                if column_id is None:
-                    continue
-
-                self._add_column_constraints(
-                    column=column,
-                    column_id=column_id,
-                    table_id=table_id,
-                    table_name=table.name,
-                    schema=schema,
-                )
+            self._add_table_columns(table, table_id)
 
         # ---------- FOREIGN KEYS ----------
         self._add_foreign_key_objects(objects, table_ids)
 
         return self.graph
 
+    def build_from_stream(
+        self,
+        objects: Iterable[DatabaseObject],
+        name: str = "",
+    ) -> SchemaGraph:
+        """
+        Потоковое построение: объекты добавляются в граф по мере поступления
+        (например, из SQLStreamReader → SQLParser). Целиком список объектов
+        не материализуется; до конца потока откладываются только таблицы
+        с внешними ключами, т.к. FK может ссылаться на ещё не прочитанную таблицу.
+        """
+        self.graph = SchemaGraph(name=name, key_table=self.key_table)
+        table_ids: Dict[Tuple[str, str], int] = {}
+        pending_fk: List[DatabaseObject] = []
+
+        for obj in objects:
+            if obj.type != ObjectType.TABLE:
+                continue
+
+            table = cast(Table, obj)
+            table_id = self.graph.add_vertex(table)
+            table_ids[_table_key(table.schema or "public", table.name)] = table_id
+
+            self._add_table_columns(table, table_id)
+
+            if table.attributes.get("foreign_keys"):
+                pending_fk.append(table)
+
+        # ---------- FOREIGN KEYS ----------
+        self._add_foreign_key_objects(pending_fk, table_ids)
+
+        return self.graph
+
+    @staticmethod
+    def table_index(graph: SchemaGraph) -> Dict[Tuple[str, str], int]:
+        """(schema, table) → id вершины таблицы, как при построении графа."""
+        return {
+            _table_key(obj.schema or "public", obj.name): obj_id
+            for obj_id, obj in graph.vertices.items()
+            if obj.type == ObjectType.TABLE
+        }
+
+    def patch_tables(
+        self,
+        graph: SchemaGraph,
+        removed: List[Table],
+        added: List[Table],
+        tables: List[DatabaseObject],
+        table_ids: Dict[Tuple[str, str], int],
+    ) -> GraphPatch:
+        """
+        Точечно заменяет в графе таблицы removed на added (инкрементальный режим).
+
+        Удаляется вершина таблицы и всё, что в неё входит: колонки, PK/UQ,
+        FK самой таблицы и FK других таблиц, ссылающиеся на неё. Затем
+        добавляются новые таблицы, их FK и FK неизменённых таблиц (из tables —
+        полного нового списка), ссылающиеся на изменённые таблицы.
+        table_ids обновляется на месте.
+
+        Результат совпадает с build_from_objects(tables) с точностью
+        до идентификаторов вершин.
+        """
+        self.graph = graph
+        patch = GraphPatch()
+        changed: Set[Tuple[str, str]] = set()
+
+        # ---------- удаление ----------
+        for table in removed:
+            key = _table_key(table.schema or "public", table.name)
+            changed.add(key)
+            table_id = table_ids.pop(key, None)
+            if table_id is None:
+                continue
+
+            for e in graph.get_incoming(graph.vertices[table_id]):
+                obj = graph.vertices.get(e.src)
+                if obj is not None:
+                    patch.removed_vertices.append(obj)
+                    patch.removed_edges |= graph.remove_vertex(e.src)
+
+            patch.removed_vertices.append(graph.vertices[table_id])
+            patch.removed_edges |= graph.remove_vertex(table_id)
+
+        # ---------- добавление ----------
+        first_new_id = graph._next_id
+        added_keys: Set[Tuple[str, str]] = set()
+
+        for table in added:
+            key = _table_key(table.schema or "public", table.name)
+            changed.add(key)
+            added_keys.add(key)
+
+            table_id = graph.add_vertex(table)
+            table_ids[key] = table_id
+            self._add_table_columns(table, table_id)
+
+        self._add_foreign_key_objects(added, table_ids)
+
+        # FK неизменённых таблиц на изменённые
+        for obj in tables:
+            if obj.type != ObjectType.TABLE:
+                continue
+            table = cast(Table, obj)
+            if _table_key(table.schema or "public", table.name) in added_keys:
+                continue
+
+            fks = [
+                fk for fk in table.attributes.get("foreign_keys") or []
+                if _table_key(fk.get("referenced_schema", "public"), fk.get("referenced_table")) in changed
+            ]
+            if fks:
+                self._add_table_foreign_keys(table, fks, table_ids)
+
+        for obj_id in range(first_new_id, graph._next_id):
+            obj = graph.vertices.get(obj_id)
+            if obj is not None:
+                patch.added_vertices.append(obj)
+                patch.added_edges.update(graph.get_outgoing(obj))
+
+        return patch
+
     # ==========================================================
     # ВНУТРЕННИЕ МЕТОДЫ
     # ==========================================================
 
+    def _add_table_columns(self, table: Table, table_id: int) -> None:
+        schema = table.schema or "public"
+
+        for column in table.columns.values():
+            column_id = self._add_column(column, table_id)
+            if column_id is None:
+                continue
+
+            self._add_column_constraints(
+                column=column,
+                column_id=column_id,
+                table_id=table_id,
+                table_name=table.name,
+                schema=schema,
+            )
+
     def _add_column(self, column: Column, table_id: int) -> Optional[int]:
         if not self.graph:
             return None
 
-        column.attributes = column.attributes or {}
-        column.attributes["data_type"] = column.data_type
-
+        # data_type колонки и attributes["data_type"] — одно поле (Column)
         column_id = self.graph.add_vertex(column)
         self.graph.add_edge(column_id, table_id, RelationType.CONTAINS)
 
@@ -148,39 +291,65 @@ class GraphBuilder:
                 continue
 
             table = cast(Table, obj)
-            schema = table.schema or "public"
-            from_table_id = table_ids.get(_table_key(schema, table.name))
-            if not from_table_id:
+            self._add_table_foreign_keys(table, table.attributes.get("foreign_keys") or [], table_ids)
+
+    def _add_table_foreign_keys(
+        self,
+        table: Table,
+        foreign_keys: List[Dict],
+        table_ids: Dict[Tuple[str, str], int],
+    ) -> None:
+        if not self.graph:
+            return
+
+        schema = table.schema or "public"
+        from_table_id = table_ids.get(_table_key(schema, table.name))
+        if not from_table_id:
+            return
+
+        for fk in foreign_keys:
+            ref_table = fk.get("referenced_table")
+            ref_schema = fk.get("referenced_schema", "public")
+            ref_column = fk.get("referenced_column")
+
+            if not ref_table:
+                continue
+
+            to_table_id = table_ids.get(_table_key(ref_schema, ref_table))
+            if not to_table_id:
                 continue
 
-            foreign_keys = table.attributes.get("foreign_keys") or []
-
-            for fk in foreign_keys:
-                ref_table = fk.get("referenced_table")
-                ref_schema = fk.get("referenced_schema", "public")
-                ref_column = fk.get("referenced_column")
-
-                if not ref_table:
-                    continue
-
-                to_table_id = table_ids.get(_table_key(ref_schema, ref_table))
-                if not to_table_id:
-                    continue
-
-                fk_obj = DatabaseObject(
-                    id=0,
-                    type=ObjectType.FOREIGN_KEY,
-                    name=f"fk_{table.name}_{ref_table}",
-                    schema=schema,
-                    attributes={
-                        "from_table": table.name,
-                        "to_table": ref_table,
-                        "from_column": fk.get("column"),
-                        "to_column": ref_column,
-                    },
-                )
-
-                fk_id = self.graph.add_vertex(fk_obj)
-
-                self.graph.add_edge(fk_id, from_table_id, RelationType.DEPENDS_ON)
-                self.graph.add_edge(fk_id, to_table_id, RelationType.REFERENCES)
+            fk_obj = DatabaseObject(
+                id=0,
+                type=ObjectType.FOREIGN_KEY,
+                name=f"fk_{table.name}_{ref_table}",
+                schema=schema,
+                attributes={
+                    "from_table": table.name,
+                    "to_table": ref_table,
+                    "from_column": fk.get("column"),
+                    "to_column": ref_column,
+                },
+            )
+
+            fk_id = self.graph.add_vertex(fk_obj)
+
+            self.graph.add_edge(fk_id, from_table_id, RelationType.DEPENDS_ON)
+            self.graph.add_edge(fk_id, to_table_id, RelationType.REFERENCES)
+
+            # колонка, на которую ссылается FK: изменение users.id затрагивает FK
+            to_column_id = self._column_id(to_table_id, ref_column)
+            if to_column_id is not None:
+                self.graph.add_edge(fk_id, to_column_id, RelationType.REFERENCES)
+
+    def _column_id(self, table_id: int, column_name: Optional[str]) -> Optional[int]:
+        """id вершины колонки таблицы по имени (колонки входят в таблицу через CONTAINS)."""
+        if not self.graph or not column_name:
+            return None
+
+        name = _norm_ident(column_name)
+        for e in self.graph.get_incoming(self.graph.vertices[table_id], RelationType.CONTAINS):
+            obj = self.graph.vertices[e.src]
+            if obj.type == ObjectType.COLUMN and _norm_ident(obj.name) == name:
+                return e.src
+        return None
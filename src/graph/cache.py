@@ -0,0 +1,213 @@
+"""
+Кэш разобранных схем на диске (content-addressed).
+
+Ключ — SHA-256 исходного SQL (байты файла или текст в UTF-8),
+значение — список объектов парсера и построенный SchemaGraph,
+сериализованные pickle + zlib. Повторный запуск на уже виденной
+схеме пропускает парсинг и построение графа целиком.
+
+Кэш локальный и доверенный: содержимое каталога загружается через pickle,
+поэтому указывать на каталог, куда могут писать посторонние, нельзя.
+
+MemoryGraphCache — тот же интерфейс в памяти процесса: долгоживущий
+детектор (сервер, src/detection/server.py) отдаёт уже построенные графы
+без распаковки и без парсинга.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from src.core.constants import SYSTEM_LIMITS, VERSION
+from src.core.exceptions import CacheError
+from src.core.models import DatabaseObject
+from src.graph.keys import KeyTable
+from src.graph.schema_graph import SchemaGraph
+
+
+class GraphCache:
+    """
+    Дисковый LRU-кэш пар (objects, graph), ключ — хэш SQL.
+
+    Вытеснение: не более max_entries файлов; при превышении удаляются
+    записи с самым старым временем последнего обращения (mtime).
+    """
+
+    # Меняется при несовместимых изменениях моделей/графа
+    FORMAT_VERSION = 7
+    SUFFIX = ".graph"
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_entries: int = SYSTEM_LIMITS["MAX_CACHE_SIZE"],
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+
+    # -------------------------
+    # ключи
+    # -------------------------
+
+    @classmethod
+    def _hasher(cls):
+        h = hashlib.sha256()
+        h.update(f"{VERSION}:{cls.FORMAT_VERSION}:".encode("utf-8"))
+        return h
+
+    @classmethod
+    def key_for_text(cls, sql_text: str) -> str:
+        h = cls._hasher()
+        h.update(sql_text.encode("utf-8"))
+        return h.hexdigest()
+
+    @classmethod
+    def key_for_file(cls, path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+        h = cls._hasher()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    # -------------------------
+    # чтение / запись
+    # -------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str) -> Optional[Tuple[List[DatabaseObject], SchemaGraph]]:
+        """
+        Возвращает (objects, graph) или None.
+        Повреждённая запись считается промахом и удаляется.
+        """
+        path = self._path(key)
+        try:
+            payload = path.read_bytes()
+        except OSError:
+            return None
+
+        try:
+            objects, graph = pickle.loads(zlib.decompress(payload))
+        except Exception:
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path)  # LRU: отмечаем обращение
+        except OSError:
+            pass
+
+        return objects, graph
+
+    def put(self, key: str, objects: List[DatabaseObject], graph: SchemaGraph) -> None:
+        try:
+            payload = zlib.compress(pickle.dumps((objects, graph), protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            raise CacheError(f"Не удалось сериализовать граф: {e}", cache_key=key)
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # атомарная запись: временный файл + rename
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp, self._path(key))
+            except OSError:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            raise CacheError(f"Не удалось записать кэш: {e}", cache_key=key)
+
+        self._evict()
+
+    # -------------------------
+    # обслуживание
+    # -------------------------
+
+    def _entries(self) -> List[Path]:
+        if not self.cache_dir.is_dir():
+            return []
+        return list(self.cache_dir.glob(f"*{self.SUFFIX}"))
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+
+        def _mtime(p: Path) -> float:
+            try:
+                return p.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        for path in sorted(entries, key=_mtime)[:excess]:
+            path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+
+class MemoryGraphCache:
+    """
+    LRU-кэш пар (objects, graph) в памяти, ключ — как у GraphCache.
+
+    Графы отдаются без копирования. Сравнение переводит граф B в таблицу
+    ключей графа A (SchemaGraph.rekey), поэтому таблица ключей тёплого
+    графа пополняется ключами схем, с которыми его сравнивали. Если она
+    стала больше чем в growth_limit раз крупнее самого графа, при выдаче
+    граф переводится в новую таблицу только со своими ключами.
+    """
+
+    def __init__(self, max_entries: int = 16, growth_limit: float = 2.0):
+        self.max_entries = max_entries
+        self.growth_limit = growth_limit
+        self._entries: "OrderedDict[str, Tuple[List[DatabaseObject], SchemaGraph]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[List[DatabaseObject], SchemaGraph]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        graph = entry[1]
+        if len(graph.key_table) > self.growth_limit * len(graph.vertex_keys) + 1024:
+            graph.rekey(KeyTable())
+        # граф сравнивается повторно: сигнатуры атрибутов окупаются
+        graph.reuse_signatures = True
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, objects: List[DatabaseObject], graph: SchemaGraph) -> None:
+        self._entries[key] = (objects, graph)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+
+__all__ = ["GraphCache", "MemoryGraphCache"]
@@ -0,0 +1,70 @@
+# src/graph/keys.py
+
+"""
+Ключи сопоставления вершин графов A и B.
+
+Ключ объекта — (схема, тип, таблица — для колонок, имя) в нижнем регистре.
+KeyTable интернирует ключи в небольшие целые числа: граф хранит для
+каждой вершины номер её ключа (SchemaGraph.vertex_keys), поэтому
+сравнение и сопоставление графов, построенных с одной таблицей ключей,
+сводятся к операциям над множествами целых чисел.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from src.core.models import DatabaseObject
+
+
+# Ключ сопоставления объекта: (схема, тип, таблица — для колонок, имя)
+ObjectKey = Tuple[str, str, str, str]
+
+
+def object_key(obj: DatabaseObject) -> ObjectKey:
+    schema = (obj.schema or "public").lower()
+    name = obj.name.lower()
+    obj_type = obj.type.value
+
+    table = ""
+    if obj_type == "column":
+        table = str(obj.attributes.get("table", "")).lower()
+
+    return (schema, obj_type, table, name)
+
+
+class KeyTable:
+    """
+    Таблица интернирования ключей: ObjectKey ↔ номер (0, 1, 2, ...).
+
+    Одна таблица разделяется графами, которые сравниваются между собой
+    (GraphBuilder передаёт свою таблицу каждому строящемуся графу).
+    Номера не переиспользуются.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[ObjectKey, int] = {}
+        self._keys: List[ObjectKey] = []
+
+    def intern(self, key: ObjectKey) -> int:
+        key_id = self._ids.get(key)
+        if key_id is None:
+            key_id = len(self._keys)
+            self._ids[key] = key_id
+            self._keys.append(key)
+        return key_id
+
+    def intern_object(self, obj: DatabaseObject) -> int:
+        return self.intern(object_key(obj))
+
+    def get(self, key: ObjectKey) -> Optional[int]:
+        return self._ids.get(key)
+
+    def key(self, key_id: int) -> ObjectKey:
+        return self._keys[key_id]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ids
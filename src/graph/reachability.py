@@ -0,0 +1,184 @@
+# src/graph/reachability.py
+
+"""
+Индекс достижимости графа схемы: «что транзитивно затронет удаление X».
+
+Ребро src → dst означает «src зависит от dst», поэтому затронутые
+удалением X объекты — вершины, из которых X достижим. Кроме рёбер
+таблица зависит от своих FK (обратное ребро FK -DEPENDS_ON-> таблица):
+иначе изменение users доходило бы до fk_orders_users, но не до orders
+и не дальше по цепочке ссылок. Индекс строится один раз по подграфу
+выбранных отношений (по умолчанию REFERENCES и DEPENDS_ON):
+1) компоненты сильной связности (Тарьян) сжимаются в DAG;
+2) для каждой компоненты хранится битовое множество (int) компонент,
+   из которых она достижима; множества считаются в топологическом
+   порядке, каждое ребро DAG обрабатывается один раз.
+
+Запрос — чтение одного битового множества; время ответа пропорционально
+размеру ответа, а не графа.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional
+
+from src.core.models import DatabaseObject, ObjectType, RelationType
+
+if TYPE_CHECKING:
+    from src.graph.schema_graph import SchemaGraph
+
+
+# Отношения, по которым распространяется удаление объекта
+IMPACT_RELATIONS: FrozenSet[RelationType] = frozenset({RelationType.REFERENCES, RelationType.DEPENDS_ON})
+
+
+class ReachabilityIndex:
+    """
+    Транзитивное замыкание обратных зависимостей сжатого графа.
+
+    Индекс отражает граф на момент построения; SchemaGraph сбрасывает
+    свои индексы при любом изменении вершин и рёбер.
+    """
+
+    def __init__(self, graph: "SchemaGraph", relations: Optional[Iterable[RelationType]] = None):
+        self.relations: FrozenSet[RelationType] = (
+            IMPACT_RELATIONS if relations is None else frozenset(relations)
+        )
+
+        dependencies = _dependencies(graph, self.relations)
+
+        # Тарьян выдаёт компоненты в обратном топологическом порядке:
+        # компонента появляется после всех, от которых она зависит
+        components = graph.strongly_connected_components(successors=dependencies)
+
+        self.components: List[List[int]] = components
+        self.component_of: Dict[int, int] = {}
+        for c, members in enumerate(components):
+            for v in members:
+                self.component_of[v] = c
+
+        # dependents[c] — биты компонент, из которых достижима компонента c
+        dependents = [0] * len(components)
+        component_of = self.component_of
+
+        # от зависящих к тем, от кого они зависят: источники DAG — первыми
+        for c in range(len(components) - 1, -1, -1):
+            reach = dependents[c] | (1 << c)
+            targets = {
+                component_of[w]
+                for v in components[c]
+                for w in dependencies(v)
+            }
+            targets.discard(c)
+            for d in targets:
+                dependents[d] |= reach
+
+        self._dependents = dependents
+
+    # ==========
+    # ЗАПРОСЫ
+    # ==========
+
+    def dependent_ids(self, obj_id: int) -> Iterator[int]:
+        """
+        id вершин, из которых достижима obj_id (сама вершина не входит).
+        """
+        c = self.component_of.get(obj_id)
+        if c is None:
+            return
+
+        for v in self.components[c]:
+            if v != obj_id:
+                yield v
+
+        bits = self._dependents[c]
+        while bits:
+            low = bits & -bits
+            yield from self.components[low.bit_length() - 1]
+            bits ^= low
+
+    def count_dependents(self, obj_id: int) -> int:
+        c = self.component_of.get(obj_id)
+        if c is None:
+            return 0
+        total = len(self.components[c]) - 1
+        bits = self._dependents[c]
+        while bits:
+            low = bits & -bits
+            total += len(self.components[low.bit_length() - 1])
+            bits ^= low
+        return total
+
+    def depends_on(self, src_id: int, dst_id: int) -> bool:
+        """Зависит ли src_id транзитивно от dst_id."""
+        a = self.component_of.get(src_id)
+        b = self.component_of.get(dst_id)
+        if a is None or b is None:
+            return False
+        if a == b:
+            return src_id != dst_id or len(self.components[a]) > 1
+        return bool(self._dependents[b] >> a & 1)
+
+
+def _dependencies(graph: "SchemaGraph", relations: FrozenSet[RelationType]) -> Callable[[int], List[int]]:
+    """Функция «от чего зависит вершина» для индекса по отношениям relations."""
+    if RelationType.DEPENDS_ON not in relations:
+        return lambda obj_id: graph.successors(obj_id, relations)
+
+    vertices = graph.vertices
+
+    def dependencies(obj_id: int) -> List[int]:
+        result = graph.successors(obj_id, relations)
+        if vertices[obj_id].type == ObjectType.TABLE:
+            result += graph.foreign_keys_of(obj_id)
+        return result
+
+    return dependencies
+
+
+def impact_of(graph: "SchemaGraph", obj: DatabaseObject, relations: Optional[Iterable[RelationType]] = None) -> Dict:
+    """
+    Отчёт о транзитивных последствиях удаления obj: зависящие объекты
+    и таблицы, которым они принадлежат.
+    """
+    index = graph.reachability(relations)
+    dependents = [graph.vertices[i] for i in index.dependent_ids(obj.id)]
+    dependents.sort(key=lambda o: (o.type.value, o.schema or "", str(o.attributes.get("table", "")), o.name))
+
+    tables = set()
+    for dep in dependents:
+        table = _owner_table(graph, dep)
+        if table is not None and table is not obj:
+            tables.add((table.schema or "public", table.name))
+
+    return {
+        "object": _describe(obj),
+        "relations": sorted(r.value for r in index.relations),
+        "count": len(dependents),
+        "dependents": [_describe(o) for o in dependents],
+        "tables": [f"{schema}.{name}" for schema, name in sorted(tables)],
+    }
+
+
+def _owner_table(graph: "SchemaGraph", obj: DatabaseObject) -> Optional[DatabaseObject]:
+    # колонки и PK/UQ входят в таблицу через CONTAINS, FK — через DEPENDS_ON
+    table = graph.get_table_of_object(obj)
+    if table is not None:
+        return table
+    for dst in graph.successors(obj.id, RelationType.DEPENDS_ON):
+        target = graph.vertices[dst]
+        if target.type == ObjectType.TABLE:
+            return target
+    return None
+
+
+def _describe(obj: DatabaseObject) -> Dict[str, str]:
+    entry = {"type": obj.type.value, "schema": obj.schema or "public", "name": obj.name}
+    for attr in ("table", "from_table", "to_table"):
+        value = obj.attributes.get(attr)
+        if value:
+            entry[attr] = str(value)
+    return entry
+
+
+__all__ = ["IMPACT_RELATIONS", "ReachabilityIndex", "impact_of"]
@@ -1,29 +1,90 @@
 # src/graph/schema_graph.py
 
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Set, Optional, List
+from typing import Callable, Dict, FrozenSet, Set, Optional, List, Iterable, Mapping, Tuple
 from src.core.models import DatabaseObject, RelationType, ObjectType
+from src.graph.keys import KeyTable, ObjectKey
+from src.graph.reachability import IMPACT_RELATIONS, ReachabilityIndex
+from src.utils.validators import attrs_hash
+
+
+# Метка процесса для сигнатур вершин: hash() строк зависит от PYTHONHASHSEED,
+# поэтому сигнатуры графа из другого процесса (кэш, воркеры) пересчитываются
+_SIGNATURE_SEED = hash("SchemaGraph.vertex_signatures")
+
+# Код ребра: (номер ключа источника, номер ключа цели, отношение) в одном
+# целом числе фиксированной ширины — не зависит от id вершин, поэтому коды
+# рёбер двух графов с общей таблицей ключей сравнимы между собой
+EDGE_KEY_BITS = 32
+_RELATION_CODES: Dict[RelationType, int] = {relation: code for code, relation in enumerate(RelationType)}
+_RELATION_BITS = max(1, (len(_RELATION_CODES) - 1).bit_length())
+
+# Производный вид графа для поиска циклов (передаётся вместо набора отношений):
+# зависимости таблиц по внешним ключам. Строитель не даёт таблицам исходящих
+# рёбер (FK -DEPENDS_ON-> своя таблица, FK -REFERENCES-> чужая), поэтому цикл
+# A → B → A по самим рёбрам не виден. В этом виде таблица ведёт к своим FK,
+# а FK — к таблице, на которую ссылается: A → fk_a_b → B → fk_b_a → A.
+# FK, ссылающийся на свою же таблицу (иерархия: emp.manager_id → emp),
+# зависимости между таблицами не создаёт и в этот вид не входит;
+# вид FOREIGN_KEY_DEPENDENCIES_WITH_SELF включает и такие FK.
+FOREIGN_KEY_DEPENDENCIES = "foreign_keys"
+FOREIGN_KEY_DEPENDENCIES_WITH_SELF = "foreign_keys_with_self"
+_FOREIGN_KEY_VIEWS = (FOREIGN_KEY_DEPENDENCIES, FOREIGN_KEY_DEPENDENCIES_WITH_SELF)
 
 
 @dataclass(frozen=True)
 class Edge:
+    # __slots__ вручную: dataclass(slots=True) есть только с Python 3.10
+    __slots__ = ("src", "dst", "relation")
+
     src: int
     dst: int
     relation: RelationType
 
+    def __reduce__(self):
+        # frozen + __slots__: pickle восстанавливал бы слоты через setattr
+        return (Edge, (self.src, self.dst, self.relation))
+
 
 class SchemaGraph:
     """
     Ориентированный помеченный граф объектов схемы БД.
     """
 
-    def __init__(self, name: str = "") -> None:
+    def __init__(self, name: str = "", key_table: Optional[KeyTable] = None) -> None:
         self.name = name
         self._next_id: int = 1
         self.vertices: Dict[int, DatabaseObject] = {}
         self.edges: Set[Edge] = set()
 
+        # Интернированные ключи сопоставления: vertex_id -> номер в key_table.
+        # Вычисляются при добавлении вершины (см. src/graph/keys.py)
+        self.key_table: KeyTable = key_table if key_table is not None else KeyTable()
+        self.vertex_keys: Dict[int, int] = {}
+
+        # Сигнатуры атрибутов: vertex_id -> attributes_signature(obj),
+        # вычисляются лениво (vertex_signature). Окупаются только у графов,
+        # которые сравниваются повторно (reuse_signatures: тёплый кэш в памяти,
+        # инкрементальный режим); одноразовый граф дешевле сравнить по самим
+        # атрибутам (см. GraphComparator.compare)
+        self.vertex_signatures: Dict[int, int] = {}
+        self.signature_seed: int = _SIGNATURE_SEED
+        self.reuse_signatures: bool = False
+
+        # Индексы смежности: vertex_id -> [Edge]
+        # Поддерживаются в add_edge, чтобы соседей не искать перебором self.edges.
+        # Плоские списки, а не relation -> множество: уникальность рёбер
+        # обеспечивает self.edges, степень вершин мала, а пустые словари
+        # и множества на каждую вершину занимали большую часть памяти графа.
+        self._out: Dict[int, List[Edge]] = {}
+        self._in: Dict[int, List[Edge]] = {}
+
+        # Индексы достижимости по наборам отношений (см. reachability()).
+        # Сбрасываются при любом изменении вершин и рёбер
+        self._reachability: Dict[FrozenSet[RelationType], ReachabilityIndex] = {}
+
     # ==========
     # ВЕРШИНЫ
     # ==========
@@ -31,9 +92,106 @@ class SchemaGraph:
     def add_vertex(self, obj: DatabaseObject) -> int:
         obj.id = self._next_id
         self.vertices[self._next_id] = obj
+        self.vertex_keys[self._next_id] = self.key_table.intern_object(obj)
         self._next_id += 1
+        self._reachability.clear()
         return obj.id
 
+    def remove_vertex(self, obj_id: int) -> Set[Edge]:
+        """
+        Удаляет вершину вместе с инцидентными рёбрами.
+        Возвращает удалённые рёбра. Идентификаторы не переиспользуются.
+        """
+        if obj_id not in self.vertices:
+            return set()
+
+        removed: Set[Edge] = set()
+        for e in self._out.pop(obj_id, ()):
+            removed.add(e)
+            if e.dst != obj_id:
+                self._in[e.dst].remove(e)
+        for e in self._in.pop(obj_id, ()):
+            if e.src != obj_id:  # петля уже снята вместе с исходящими
+                removed.add(e)
+                self._out[e.src].remove(e)
+
+        self.edges -= removed
+        del self.vertices[obj_id]
+        del self.vertex_keys[obj_id]
+        self.vertex_signatures.pop(obj_id, None)
+        self._reachability.clear()
+        return removed
+
+    # ==========
+    # КЛЮЧИ СОПОСТАВЛЕНИЯ
+    # ==========
+
+    def key_index(self) -> Dict[int, int]:
+        """
+        Номер ключа -> id вершины. При совпадении ключей побеждает
+        вершина с большим id (как в GraphComparator.compare).
+        """
+        return {key_id: obj_id for obj_id, key_id in self.vertex_keys.items()}
+
+    def vertex_order(self, obj_id: int) -> Tuple[ObjectKey, int]:
+        """
+        Канонический порядок вершин — по ключам сопоставления, а не по id
+        и не по номерам ключей: те зависят от порядка построения графа
+        и интернирования (полный и инкрементальный запуски дают разные).
+        """
+        return self.key_table.key(self.vertex_keys[obj_id]), obj_id
+
+    def rekey(self, key_table: KeyTable) -> None:
+        """
+        Переводит номера ключей в другую таблицу (например, граф из кэша
+        сравнивается с графом, построенным в текущем запуске).
+        """
+        if key_table is self.key_table:
+            return
+        old = self.key_table
+        self.vertex_keys = {
+            obj_id: key_table.intern(old.key(key_id))
+            for obj_id, key_id in self.vertex_keys.items()
+        }
+        self.key_table = key_table
+
+    # ==========
+    # СИГНАТУРЫ АТРИБУТОВ
+    # ==========
+
+    @staticmethod
+    def attributes_signature(obj: DatabaseObject) -> int:
+        """
+        Сигнатура всех атрибутов объекта (без игнорируемых ключей):
+        равные атрибуты дают равные сигнатуры.
+        """
+        attrs = obj.attributes_dict()
+        try:
+            # плоские атрибуты (колонки, ограничения) — без attrs_signature
+            return hash(frozenset(attrs.items()))
+        except TypeError:
+            return attrs_hash(attrs, ignore_keys=())
+
+    def vertex_signature(self, obj_id: int) -> int:
+        """Сигнатура атрибутов вершины (вычисляется при первом обращении)."""
+        if self.signature_seed != _SIGNATURE_SEED:
+            self.ensure_signatures()
+        signature = self.vertex_signatures.get(obj_id)
+        if signature is None:
+            signature = self.vertex_signatures[obj_id] = self.attributes_signature(self.vertices[obj_id])
+        return signature
+
+    def ensure_signatures(self) -> None:
+        """
+        Сбрасывает сигнатуры вершин, вычисленные в другом процессе (граф
+        загружен из кэша или построен воркером): они пересчитаются
+        при обращении.
+        """
+        if self.signature_seed == _SIGNATURE_SEED:
+            return
+        self.vertex_signatures = {}
+        self.signature_seed = _SIGNATURE_SEED
+
     def get_vertex(self, obj_id: int) -> Optional[DatabaseObject]:
         return self.vertices.get(obj_id)
 
@@ -54,7 +212,59 @@ class SchemaGraph:
         if src_id not in self.vertices or dst_id not in self.vertices:
             raise ValueError("Both vertices must exist before adding an edge")
 
-        self.edges.add(Edge(src=src_id, dst=dst_id, relation=relation))
+        edge = Edge(src=src_id, dst=dst_id, relation=relation)
+        if edge in self.edges:
+            return
+        self.edges.add(edge)
+        self._reachability.clear()
+
+        self._out.setdefault(src_id, []).append(edge)
+        self._in.setdefault(dst_id, []).append(edge)
+
+    @staticmethod
+    def encode_edge(src_key: int, dst_key: int, relation: RelationType) -> int:
+        return (((src_key << EDGE_KEY_BITS) | dst_key) << _RELATION_BITS) | _RELATION_CODES[relation]
+
+    def edge_code(self, edge: Edge, keys: Optional[Mapping[int, int]] = None) -> int:
+        """
+        Код ребра по ключам его концов. keys — номера ключей вершин,
+        которых уже нет в графе (например, удалённых патчем).
+        """
+        keys = keys if keys is not None else self.vertex_keys
+        return self.encode_edge(keys[edge.src], keys[edge.dst], edge.relation)
+
+    def encoded_edges(self) -> Tuple[List[Edge], List[int]]:
+        """Все рёбра графа и их коды (списки одной длины, в одном порядке)."""
+        keys = self.vertex_keys
+        codes = _RELATION_CODES
+        src_shift = EDGE_KEY_BITS + _RELATION_BITS
+        dst_shift = _RELATION_BITS
+
+        edges = list(self.edges)
+        return edges, [
+            (keys[e.src] << src_shift) | (keys[e.dst] << dst_shift) | codes[e.relation]
+            for e in edges
+        ]
+
+    @staticmethod
+    def _select(
+        edges: Optional[List[Edge]],
+        relation,
+    ) -> Iterable[Edge]:
+        """
+        Выбирает рёбра из индекса смежности одной вершины.
+        relation: None (все), RelationType или set[RelationType].
+        """
+        if not edges:
+            return ()
+
+        if relation is None:
+            return edges
+
+        if isinstance(relation, (set, frozenset)):
+            return [e for e in edges if e.relation in relation]
+
+        return [e for e in edges if e.relation is relation]
 
     def get_outgoing(
         self,
@@ -62,33 +272,15 @@ class SchemaGraph:
         *,
         relation: Optional[RelationType] = None,
     ) -> Set[Edge]:
-        return {
-            e for e in self.edges
-            if e.src == obj.id and (relation is None or e.relation == relation)
-        }
+        return set(self._select(self._out.get(obj.id), relation))
 
     def get_incoming(
             self,
             obj: DatabaseObject,
             relation: Optional[RelationType] = None,
     ):
-        result = []
-
-        for edge in self.edges:
-            # входящее ребро = edge.dst == obj.id
-            if edge.dst != obj.id:
-                continue
-
-            if relation is None:
-                result.append(edge)
-            elif isinstance(relation, set):
-                if edge.relation in relation:
-                    result.append(edge)
-            else:
-                if edge.relation == relation:
-                    result.append(edge)
-
-        return result
+        # входящее ребро = edge.dst == obj.id
+        return list(self._select(self._in.get(obj.id), relation))
 
     # ==========
     # ЗАВИСИМОСТИ
@@ -101,11 +293,10 @@ class SchemaGraph:
         relations: Optional[Set[RelationType]] = None,
     ) -> Set[DatabaseObject]:
         result = set()
-        for e in self.get_outgoing(obj):
-            if relations is None or e.relation in relations:
-                target = self.vertices.get(e.dst)
-                if target:
-                    result.add(target)
+        for e in self.get_outgoing(obj, relation=relations):
+            target = self.vertices.get(e.dst)
+            if target:
+                result.add(target)
         return result
 
     def get_dependents(
@@ -115,11 +306,10 @@ class SchemaGraph:
         relations: Optional[Set[RelationType]] = None,
     ) -> Set[DatabaseObject]:
         result = set()
-        for e in self.get_incoming(obj):
-            if relations is None or e.relation in relations:
-                source = self.vertices.get(e.src)
-                if source:
-                    result.add(source)
+        for e in self.get_incoming(obj, relation=relations):
+            source = self.vertices.get(e.src)
+            if source:
+                result.add(source)
         return result
 
     # ==========
@@ -134,10 +324,10 @@ class SchemaGraph:
     ) -> Set[DatabaseObject]:
         visited: Set[int] = set()
         result: Set[DatabaseObject] = set()
-        queue: List[int] = [obj.id]
+        queue = deque([obj.id])
 
         while queue:
-            current_id = queue.pop(0)
+            current_id = queue.popleft()
             if current_id in visited:
                 continue
             visited.add(current_id)
@@ -146,56 +336,402 @@ class SchemaGraph:
             if not current_obj:
                 continue
 
-            for e in self.get_incoming(current_obj):
-                if relations is None or e.relation in relations:
-                    src_obj = self.vertices.get(e.src)
-                    if src_obj and src_obj.id not in visited:
-                        result.add(src_obj)
-                        queue.append(src_obj.id)
+            for e in self.get_incoming(current_obj, relation=relations):
+                src_obj = self.vertices.get(e.src)
+                if src_obj and src_obj.id not in visited:
+                    result.add(src_obj)
+                    queue.append(src_obj.id)
 
         return result
 
+    def reachability(self, relations: Optional[Iterable[RelationType]] = None) -> ReachabilityIndex:
+        """
+        Индекс транзитивных зависимых по отношениям relations
+        (по умолчанию REFERENCES и DEPENDS_ON). Строится один раз
+        и переиспользуется до изменения графа.
+        """
+        key = IMPACT_RELATIONS if relations is None else frozenset(relations)
+        index = self._reachability.get(key)
+        if index is None:
+            index = ReachabilityIndex(self, key)
+            self._reachability[key] = index
+        return index
+
     def get_table_of_object(self, obj):
         # если это таблица — возвращаем её
         if obj.type == ObjectType.TABLE:
             return obj
 
         # если это колонка или constraint — ищем родительскую таблицу
-        for edge in self.edges:
-            if edge.src == obj.id and edge.relation == RelationType.CONTAINS:
-                return self.vertices.get(edge.dst)
+        for edge in self._select(self._out.get(obj.id), RelationType.CONTAINS):
+            return self.vertices.get(edge.dst)
+
+        return None
+
+    def foreign_keys_of(self, table_id: int) -> List[int]:
+        """FK, объявленные в таблице (источники рёбер FK -DEPENDS_ON-> таблица)."""
+        vertices = self.vertices
+        return [
+            e.src for e in self._in.get(table_id, ())
+            if e.relation is RelationType.DEPENDS_ON and vertices[e.src].type == ObjectType.FOREIGN_KEY
+        ]
+
+    # ==========
+    # ЦИКЛЫ (R7)
+    # ==========
 
+    def successors(self, obj_id: int, relation=None) -> List[int]:
+        """Идентификаторы вершин, в которые ведут исходящие рёбра obj_id."""
+        return [e.dst for e in self._select(self._out.get(obj_id), relation)]
+
+    def predecessors(self, obj_id: int, relation=None) -> List[int]:
+        """Идентификаторы вершин, из которых в obj_id ведут входящие рёбра."""
+        return [e.src for e in self._select(self._in.get(obj_id), relation)]
+
+    def _fk_tables(self, fk_id: int, relation: RelationType) -> List[int]:
+        """Таблицы, в которые ведут рёбра FK отношения relation (своя / целевая)."""
+        vertices = self.vertices
+        return [
+            e.dst for e in self._out.get(fk_id, ())
+            if e.relation is relation and vertices[e.dst].type == ObjectType.TABLE
+        ]
+
+    def is_self_reference(self, fk_id: int) -> bool:
+        """FK ссылается на таблицу, в которой объявлен."""
+        owners = self._fk_tables(fk_id, RelationType.DEPENDS_ON)
+        return any(t in owners for t in self._fk_tables(fk_id, RelationType.REFERENCES))
+
+    def _fk_successors(self, obj_id: int, with_self: bool = False) -> List[int]:
+        obj_type = self.vertices[obj_id].type
+        if obj_type == ObjectType.TABLE:
+            fks = self.foreign_keys_of(obj_id)
+            return fks if with_self else [fk for fk in fks if not self.is_self_reference(fk)]
+        if obj_type == ObjectType.FOREIGN_KEY:
+            if not with_self and self.is_self_reference(obj_id):
+                return []
+            return self._fk_tables(obj_id, RelationType.REFERENCES)
+        return []
+
+    def _fk_predecessors(self, obj_id: int, with_self: bool = False) -> List[int]:
+        obj_type = self.vertices[obj_id].type
+        if obj_type == ObjectType.TABLE:
+            vertices = self.vertices
+            fks = [
+                e.src for e in self._in.get(obj_id, ())
+                if e.relation is RelationType.REFERENCES and vertices[e.src].type == ObjectType.FOREIGN_KEY
+            ]
+            return fks if with_self else [fk for fk in fks if not self.is_self_reference(fk)]
+        if obj_type == ObjectType.FOREIGN_KEY:
+            if not with_self and self.is_self_reference(obj_id):
+                return []
+            return self._fk_tables(obj_id, RelationType.DEPENDS_ON)
+        return []
+
+    def neighbours(self, relations=None, reverse: bool = False) -> Callable[[int], List[int]]:
+        """
+        Функция соседей вершины для обходов: по рёбрам отношений relations
+        (None — все) или по виду FOREIGN_KEY_DEPENDENCIES[_WITH_SELF].
+        reverse — соседи по входящим рёбрам.
+        """
+        if relations in _FOREIGN_KEY_VIEWS:
+            with_self = relations == FOREIGN_KEY_DEPENDENCIES_WITH_SELF
+            neighbours = self._fk_predecessors if reverse else self._fk_successors
+            return lambda obj_id: neighbours(obj_id, with_self)
+        if reverse:
+            return lambda obj_id: self.predecessors(obj_id, relations)
+        return lambda obj_id: self.successors(obj_id, relations)
+
+    def _view_edge(self, edge: Edge, relations) -> Optional[Tuple[int, int]]:
+        """Ребро графа как ребро вида relations: (u, v) или None."""
+        if relations not in _FOREIGN_KEY_VIEWS:
+            return (edge.src, edge.dst) if self._select([edge], relations) else None
+
+        if self.vertices[edge.src].type != ObjectType.FOREIGN_KEY:
+            return None
+        if self.vertices[edge.dst].type != ObjectType.TABLE:
+            return None
+        if relations == FOREIGN_KEY_DEPENDENCIES and self.is_self_reference(edge.src):
+            return None
+        if edge.relation is RelationType.REFERENCES:
+            return edge.src, edge.dst
+        if edge.relation is RelationType.DEPENDS_ON:
+            return edge.dst, edge.src
         return None
 
-    def find_cycles(self):
+    def strongly_connected_components(
+        self,
+        relations=None,
+        successors: Optional[Callable[[int], Iterable[int]]] = None,
+    ) -> List[List[int]]:
+        """
+        Компоненты сильной связности (алгоритм Тарьяна), O(V + E).
+
+        Обход — по рёбрам отношений relations (или виду
+        FOREIGN_KEY_DEPENDENCIES); successors задаёт соседей явно.
+        Реализация итеративная: глубина графа не ограничена
+        лимитом рекурсии Python.
+        """
+        if successors is None:
+            successors = self.neighbours(relations)
+
+        index: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in self.vertices:
+            if root in index:
+                continue
+
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(successors(root)))]
+
+            while work:
+                v, it = work[-1]
+
+                descended = False
+                for w in it:
+                    if w not in index:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack.add(w)
+                        work.append((w, iter(successors(w))))
+                        descended = True
+                        break
+                    if w in on_stack and index[w] < low[v]:
+                        low[v] = index[w]
+
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+
+                if low[v] == index[v]:
+                    component: List[int] = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(sorted(component))
+
+        return components
+
+    def find_cycles(
+        self,
+        *,
+        relations=None,
+        max_length: Optional[int] = None,
+        max_cycles: Optional[int] = None,
+    ) -> List[List[DatabaseObject]]:
         """
         Находит циклы зависимостей в графе.
-        Используется для правила R7.
+        Используется для правила R7: relations=FOREIGN_KEY_DEPENDENCIES —
+        циклы таблиц по внешним ключам, набор отношений — по самим рёбрам.
+
+        Каждая нетривиальная компонента сильной связности даёт ровно один
+        цикл — кратчайший цикл через её первую вершину в порядке
+        vertex_order (результат не зависит от порядка построения графа).
+        Цикл возвращается замкнутым: [v, ..., v].
+
+        max_length — не рассматривать циклы длиннее max_length рёбер;
+        max_cycles — остановиться после max_cycles найденных циклов.
         """
+        cycles: List[List[DatabaseObject]] = []
 
-        visited = set()
-        stack = set()
-        cycles = []
+        order = self.vertex_order
+        components = sorted(
+            (sorted(c, key=order) for c in self.strongly_connected_components(relations)),
+            key=lambda c: order(c[0]),
+        )
 
-        def visit(v_id, path):
-            if v_id in stack:
-                cycle_start = path.index(v_id)
-                cycles.append([self.vertices[i] for i in path[cycle_start:]])
-                return
+        for component in components:
+            if max_cycles is not None and len(cycles) >= max_cycles:
+                break
 
-            if v_id in visited:
-                return
+            path = self._shortest_cycle(component, relations, max_length)
+            if path:
+                cycles.append([self.vertices[i] for i in path])
 
-            visited.add(v_id)
-            stack.add(v_id)
+        return cycles
 
-            for e in self.edges:
-                if e.src == v_id:
-                    visit(e.dst, path + [e.dst])
+    def _shortest_cycle(
+        self,
+        component: List[int],
+        relations,
+        max_length: Optional[int],
+    ) -> Optional[List[int]]:
+        """BFS внутри компоненты от её первой вершины обратно к ней же."""
+        start = component[0]
+        members = set(component)
+        successors = self.neighbours(relations)
+
+        if len(component) == 1 and start not in successors(start):
+            return None  # одиночная вершина без петли — не цикл
+
+        parent: Dict[int, int] = {}
+        depth: Dict[int, int] = {start: 0}
+        frontier = [start]
+
+        while frontier:
+            next_frontier: List[int] = []
+            for v in frontier:
+                if max_length is not None and depth[v] + 1 > max_length:
+                    continue
+                for w in sorted(successors(v), key=self.vertex_order):
+                    if w == start:
+                        path = [start]
+                        while v != start:
+                            path.append(v)
+                            v = parent[v]
+                        path.append(start)
+                        path[1:-1] = reversed(path[1:-1])
+                        return path
+                    if w in members and w not in depth:
+                        depth[w] = depth[v] + 1
+                        parent[w] = v
+                        next_frontier.append(w)
+            frontier = next_frontier
 
-            stack.remove(v_id)
+        return None
 
-        for vid in self.vertices:
-            visit(vid, [vid])
+    def find_cycles_through(
+        self,
+        edges: Iterable[Edge],
+        *,
+        relations=None,
+        max_length: Optional[int] = None,
+        max_cycles: Optional[int] = None,
+    ) -> List[List[DatabaseObject]]:
+        """
+        Циклы, проходящие хотя бы через одно из рёбер edges
+        (R7 по Δ: только циклы через добавленные рёбра).
+
+        Для ребра u → v (ребро вида relations, см. _view_edge) цикл есть,
+        если u достижима из v: кратчайший путь
+        v ⇝ u ищется двунаправленным BFS (shortest_path), поэтому работа
+        пропорциональна окрестности рёбер, а не размеру графа.
+        На ребро — один кратчайший цикл; цикл, найденный через несколько
+        рёбер, возвращается один раз. Формат — как в find_cycles:
+        замкнутый [v, ..., v] от первой вершины в порядке vertex_order.
+        """
+        cycles: List[List[DatabaseObject]] = []
+        seen: Set[Tuple[int, ...]] = set()
+        order = self.vertex_order
+
+        edges = [e for e in edges if e in self.edges]
+        for e in sorted(edges, key=lambda e: (order(e.src), order(e.dst), e.relation.value)):
+            if max_cycles is not None and len(cycles) >= max_cycles:
+                break
+            view_edge = self._view_edge(e, relations)
+            if view_edge is None:
+                continue
+
+            u, v = view_edge
+            if u == v:
+                ring = [u]
+            else:
+                limit = None if max_length is None else max_length - 1
+                back = self.shortest_path(v, u, relations, limit)
+                if back is None:
+                    continue
+                ring = [u] + back[:-1]
+
+            if max_length is not None and len(ring) > max_length:
+                continue
+
+            start = ring.index(min(ring, key=order))
+            ring = ring[start:] + ring[:start]
+            if tuple(ring) in seen:
+                continue
+            seen.add(tuple(ring))
+            cycles.append([self.vertices[i] for i in ring + ring[:1]])
 
         return cycles
+
+    def shortest_path(
+        self,
+        src_id: int,
+        dst_id: int,
+        relations=None,
+        max_length: Optional[int] = None,
+    ) -> Optional[List[int]]:
+        """
+        Кратчайший путь src_id ⇝ dst_id по исходящим рёбрам отношений
+        relations (или виду FOREIGN_KEY_DEPENDENCIES): [src, ..., dst].
+
+        Двунаправленный BFS: на каждом шаге целиком раскрывается меньший
+        из двух фронтов (вперёд от src по исходящим, назад от dst по
+        входящим рёбрам). max_length — не длиннее max_length рёбер.
+        """
+        if src_id not in self.vertices or dst_id not in self.vertices:
+            return None
+        if src_id == dst_id:
+            return [src_id]
+
+        successors = self.neighbours(relations)
+        predecessors = self.neighbours(relations, reverse=True)
+        order = self.vertex_order
+
+        # вершина -> (предшественник на пути, глубина)
+        forward: Dict[int, Tuple[Optional[int], int]] = {src_id: (None, 0)}
+        backward: Dict[int, Tuple[Optional[int], int]] = {dst_id: (None, 0)}
+        frontier_f, frontier_b = [src_id], [dst_id]
+        depth_f = depth_b = 0
+
+        while frontier_f and frontier_b:
+            if max_length is not None and depth_f + depth_b >= max_length:
+                return None
+
+            go_forward = len(frontier_f) <= len(frontier_b)
+            if go_forward:
+                frontier, mine, other, depth = frontier_f, forward, backward, depth_f
+            else:
+                frontier, mine, other, depth = frontier_b, backward, forward, depth_b
+
+            # встреча фронтов: (длина пути, порядок вершины встречи, вершина)
+            best: Optional[Tuple[int, Tuple[ObjectKey, int], int]] = None
+            next_frontier: List[int] = []
+            for v in frontier:
+                adjacent = successors(v) if go_forward else predecessors(v)
+                for w in sorted(adjacent, key=order):
+                    if w in mine:
+                        continue
+                    mine[w] = (v, depth + 1)
+                    next_frontier.append(w)
+                    if w in other:
+                        candidate = (depth + 1 + other[w][1], order(w), w)
+                        if best is None or candidate < best:
+                            best = candidate
+
+            if best is not None:
+                meet = best[2]
+                path: List[int] = []
+                node: Optional[int] = meet
+                while node is not None:
+                    path.append(node)
+                    node = forward[node][0]
+                path.reverse()
+                node = backward[meet][0]
+                while node is not None:
+                    path.append(node)
+                    node = backward[node][0]
+                return path
+
+            if go_forward:
+                frontier_f, depth_f = next_frontier, depth_f + 1
+            else:
+                frontier_b, depth_b = next_frontier, depth_b + 1
+
+        return None
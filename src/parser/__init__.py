@@ -1,33 +1,41 @@
 """
 parser package — модуль парсинга DDL
+
+Модули загружаются при первом обращении к имени (src/core/lazy.py).
 """
 
-from .normalizer import SQLNormalizer
-from .sql_parser import SQLParser
-from .tokenizer import SQLTokenizer, Token, TokenType
+from src.core.lazy import lazy_exports
 
-from .ddl_operations import (
-    OperationType,
-    DDLOperation,
-    OperationAnalyzer,
-    CreateTableOperation,
-    DropTableOperation,
-    AlterTableOperation,
-    AddColumnOperation,
-    DropColumnOperation,
-    AlterColumnOperation,
-    AddConstraintOperation,
-    DropConstraintOperation,
-    RenameTableOperation,
-    RenameColumnOperation,
-)
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".normalizer": ("SQLNormalizer",),
+    ".sql_parser": ("SQLParser",),
+    ".tokenizer": ("SQLTokenizer", "Token", "TokenArray", "TokenType"),
+    ".stream": ("SQLStreamReader",),
+    ".ddl_operations": (
+        "OperationType",
+        "DDLOperation",
+        "OperationAnalyzer",
+        "CreateTableOperation",
+        "DropTableOperation",
+        "AlterTableOperation",
+        "AddColumnOperation",
+        "DropColumnOperation",
+        "AlterColumnOperation",
+        "AddConstraintOperation",
+        "DropConstraintOperation",
+        "RenameTableOperation",
+        "RenameColumnOperation",
+    ),
+})
 
 __all__ = [
     "SQLNormalizer",
     "SQLParser",
     "SQLTokenizer",
     "Token",
+    "TokenArray",
     "TokenType",
+    "SQLStreamReader",
     "OperationType",
     "DDLOperation",
     "OperationAnalyzer",
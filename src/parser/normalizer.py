@@ -5,17 +5,14 @@
 Гибридный подход:
 - грубая текстовая нормализация (regex)
 - точная токенная нормализация (через SQLTokenizer)
-- разбиение на операторы выполняется безопасно через sqlparse (если доступен)
+- разбиение на операторы выполняется по потоку токенов (iter_statements):
+  текст токенизируется один раз в компактный поток (TokenArray),
+  операторы передаются прямо в парсер без создания объектов Token
 """
 import re
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Sequence, Tuple
 
-from .tokenizer import SQLTokenizer, TokenType
-
-try:
-    import sqlparse
-except Exception:  # pragma: no cover
-    sqlparse = None
+from .tokenizer import SQLTokenizer, Token, TokenArray
 
 
 class SQLNormalizer:
@@ -144,72 +141,56 @@ class SQLNormalizer:
         return text
 
     def _token_level_normalization(self, text: str) -> str:
-        tokens = self.tokenizer.tokenize(text)
-
         # Обратная совместимость: если у токенизатора есть filter_tokens — используем
         if hasattr(self.tokenizer, "filter_tokens"):
-            tokens = self.tokenizer.filter_tokens(tokens)
-
-        tokens = [t for t in tokens if getattr(t, "type", None) != TokenType.EOF]
+            tokens: Sequence[Token] = self.tokenizer.filter_tokens(self.tokenizer.tokenize(text))
+            tokens = TokenArray.from_tokens(tokens)
+        else:
+            tokens = self.tokenizer.tokenize_compact(text)
 
         if not tokens:
             return ""
 
-        parts: List[str] = []
-
-        for i, tok in enumerate(tokens):
-            v = tok.value
-
-            parts.append(v)
-
-            # Решаем, нужен ли пробел после текущего токена
-            if i == len(tokens) - 1:
-                continue
-
-            next_tok = tokens[i + 1]
-
-            # Не ставим пробел перед некоторыми токенами
-            if next_tok.type in (TokenType.COMMA, TokenType.RPAREN, TokenType.DOT, TokenType.SEMICOLON):
-                continue
-
-            # Не ставим пробел после '(' и '.'
-            if tok.type in (TokenType.LPAREN, TokenType.DOT):
-                continue
-
-            # После запятой нужен пробел
-            if tok.type == TokenType.COMMA:
-                parts.append(" ")
-                continue
-
-            # Общий случай
-            parts.append(" ")
-
-        normalized = "".join(parts)
+        normalized = self.tokenizer.render(tokens)
 
         # Финальное сжатие пробелов
         normalized = re.sub(r"\s+", " ", normalized).strip()
         return normalized
 
-    def split_statements(self, sql_text: str) -> List[str]:
+    def iter_statements(self, sql_text: str) -> Iterator[TokenArray]:
         """
-        Делит SQL на операторы.
-        В гибриде корректнее использовать sqlparse.split().
+        Однопроходный конвейер: токенизация + деление на операторы.
+
+        Комментарии и пробелы отбрасываются токенизатором, ключевые слова
+        и идентификаторы нормализуются им же (лениво, при чтении значения),
+        поэтому отдельные regex-проходы normalize() здесь не нужны.
+        Выдаёт компактные потоки токенов по одному оператору.
         """
-        normalized = self.normalize(sql_text)
+        if not sql_text:
+            return iter(())
+        return self.tokenizer.iter_compact_statements(sql_text)
 
-        if not normalized.strip():
+    def split_statements(self, sql_text: str) -> List[str]:
+        """
+        Делит SQL на операторы (каждый — в нормализованном виде, с ';').
+        """
+        if not sql_text or not sql_text.strip():
             return []
 
-        if sqlparse is not None:
-            stmts = [s.strip() for s in sqlparse.split(normalized) if s.strip()]
-            return stmts
-
-        return [s.strip() for s in normalized.split(";") if s.strip()]
+        return [self.tokenizer.render(stmt) for stmt in self.iter_statements(sql_text)]
 
     def is_ddl_statement(self, sql_text: str) -> bool:
         normalized = self.normalize(sql_text).upper()
         return any(normalized.startswith(k + " ") for k in ("CREATE", "ALTER", "DROP", "TRUNCATE"))
 
+    @staticmethod
+    def is_ddl_tokens(tokens: Sequence[Token]) -> bool:
+        """То же, что is_ddl_statement, но для уже токенизированного оператора."""
+        if len(tokens) < 2:
+            return False
+        first = tokens.value_at(0) if isinstance(tokens, TokenArray) else tokens[0].value
+        return first.upper() in ("CREATE", "ALTER", "DROP", "TRUNCATE")
+
     def get_statement_type(self, sql_text: str) -> str:
         normalized = self.normalize(sql_text).upper()
         if normalized.startswith("CREATE TABLE"):
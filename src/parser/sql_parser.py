@@ -1,65 +1,165 @@
 """
 Основной парсер DDL-скриптов PostgreSQL.
 
+Парсер работает по потоку токенов SQLTokenizer (рекурсивный спуск),
+без регулярных выражений по тексту и без sqlparse.
+
 ВАЖНО:
 - поддерживает COLUMN-LEVEL FOREIGN KEY:
     email TEXT REFERENCES users(email)
 - поддерживает TABLE-LEVEL FOREIGN KEY:
     FOREIGN KEY (email) REFERENCES users(email)
+- поддерживает TABLE-LEVEL PRIMARY KEY / UNIQUE:
+    PRIMARY KEY (id), UNIQUE (email)
+- имена в двойных кавычках сохраняют регистр: "UserAccounts"
 """
 
 from __future__ import annotations
 
-import re
-from typing import List, Dict, Any, Optional
-
-import sqlparse
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
 from src.core.models import Column, Table, DatabaseObject
 from src.core.exceptions import ParsingError
+from src.parser.tokenizer import SQLTokenizer, Token, TokenArray, TokenType, TOKEN_CODES
+
+
+# Слова, с которых начинается ограничение колонки (конец типа данных)
+_COLUMN_CONSTRAINT_WORDS = {
+    "CONSTRAINT", "NOT", "NULL", "PRIMARY", "UNIQUE", "CHECK",
+    "DEFAULT", "REFERENCES", "COLLATE", "GENERATED",
+}
+
+# Слова, с которых начинается ограничение уровня таблицы
+_TABLE_CONSTRAINT_WORDS = {
+    "CONSTRAINT", "PRIMARY", "FOREIGN", "UNIQUE", "CHECK", "EXCLUDE", "LIKE",
+}
+
+
+# Коды типов токенов (парсер читает TokenArray без материализации Token)
+_LPAREN = TOKEN_CODES[TokenType.LPAREN]
+_RPAREN = TOKEN_CODES[TokenType.RPAREN]
+_COMMA = TOKEN_CODES[TokenType.COMMA]
+_DOT = TOKEN_CODES[TokenType.DOT]
+_QUOTED = TOKEN_CODES[TokenType.QUOTED_IDENTIFIER]
+_STRING = TOKEN_CODES[TokenType.STRING]
+_NOT_A_NAME = frozenset(TOKEN_CODES[t] for t in (
+    TokenType.LPAREN, TokenType.RPAREN, TokenType.COMMA, TokenType.SEMICOLON, TokenType.STRING,
+))
+
+
+def _word(tokens: TokenArray, i: int) -> Optional[str]:
+    """Ключевое слово токена (upper) или None для строк/идентификаторов в кавычках."""
+    code = tokens.code_at(i)
+    if code == _QUOTED or code == _STRING:
+        return None
+    return tokens.value_at(i).upper()
+
+
+def _ident(tokens: TokenArray, i: int) -> str:
+    """Имя объекта: quoted — как есть (без кавычек), иначе lower-case."""
+    if tokens.code_at(i) == _QUOTED:
+        return tokens.raw_at(i)[1:-1].replace('""', '"')
+    return tokens.value_at(i).lower()
+
+
+def _skip_group(tokens: TokenArray, i: int) -> int:
+    """tokens[i] — '('. Возвращает индекс за парной ')'."""
+    depth = 0
+    n = len(tokens)
+    while i < n:
+        t = tokens.code_at(i)
+        if t == _LPAREN:
+            depth += 1
+        elif t == _RPAREN:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ParsingError("Unbalanced parentheses", position=tokens.position_at(n - 1) if n else None)
+
+
+def _split_elements(tokens: TokenArray) -> List[TokenArray]:
+    """Делит содержимое скобок по запятым верхнего уровня."""
+    parts: List[TokenArray] = []
+    depth = 0
+    start = 0
+
+    for i in range(len(tokens)):
+        t = tokens.code_at(i)
+        if t == _LPAREN:
+            depth += 1
+        elif t == _RPAREN:
+            depth -= 1
+        elif t == _COMMA and depth == 0:
+            if i > start:
+                parts.append(tokens[start:i])
+            start = i + 1
+
+    if len(tokens) > start:
+        parts.append(tokens[start:])
+
+    return parts
 
 
 class SQLParser:
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
+        self.tokenizer = SQLTokenizer()
 
     # ==========================================================
     # PUBLIC API
     # ==========================================================
-    print(">>> SQLParser LOADED FROM src/parser/sql_parser.py <<<")
 
     def parse_to_objects(self, sql_text: str) -> List[DatabaseObject]:
-        statements = sqlparse.parse(sql_text)
         objects: List[DatabaseObject] = []
 
-        for stmt in statements:
-            stmt_str = str(stmt).strip()
-            if not stmt_str:
-                continue
-
-            if stmt_str.upper().startswith("CREATE TABLE"):
-                table = self._parse_create_table(stmt_str)
-                objects.append(table)
+        for stmt_tokens in self.tokenizer.iter_compact_statements(sql_text):
+            objects.extend(self.parse_statement(stmt_tokens))
 
         return objects
 
+    def parse_statement(self, tokens: Sequence[Token]) -> List[DatabaseObject]:
+        """
+        Разбирает один оператор, уже выделенный из потока токенов
+        (см. SQLNormalizer.iter_statements). Повторной токенизации нет.
+
+        Основной вход — TokenArray (компактный поток); список Token
+        переводится в него.
+        """
+        if not isinstance(tokens, TokenArray):
+            tokens = TokenArray.from_tokens(tokens)
+
+        if len(tokens) < 2:
+            return []
+
+        if _word(tokens, 0) == "CREATE" and _word(tokens, 1) == "TABLE":
+            return [self._parse_create_table(tokens)]
+
+        return []
+
     # ==========================================================
     # CREATE TABLE
     # ==========================================================
 
-    def _parse_create_table(self, stmt: str) -> Table:
-        m = re.search(
-            r"CREATE\s+TABLE\s+([A-Za-z0-9_\.]+)\s*\((.*)\)",
-            stmt,
-            re.IGNORECASE | re.DOTALL,
-        )
-        if not m:
-            raise ParsingError(f"Cannot parse CREATE TABLE: {stmt}")
+    def _parse_create_table(self, tokens: TokenArray) -> Table:
+        stmt = tokens.render()
+        n = len(tokens)
+        i = 2  # CREATE TABLE
 
-        full_name = m.group(1)
-        body = m.group(2)
+        # IF NOT EXISTS
+        if i + 2 < n and [_word(tokens, j) for j in range(i, i + 3)] == ["IF", "NOT", "EXISTS"]:
+            i += 3
 
-        schema, table_name = self._split_qualified_name(full_name)
+        try:
+            schema, table_name, i = self._parse_qualified_name(tokens, i)
+        except ParsingError:
+            raise ParsingError(f"Cannot parse CREATE TABLE: {stmt}", sql_fragment=stmt)
+
+        if i >= n or tokens.code_at(i) != _LPAREN:
+            raise ParsingError(f"Cannot parse CREATE TABLE: {stmt}", sql_fragment=stmt)
+
+        end = _skip_group(tokens, i)
+        body = tokens[i + 1:end - 1]
 
         table = Table(
             id=0,
@@ -71,16 +171,13 @@ class SQLParser:
             },
         )
 
-        elements = self._split_elements(body)
-
-        for el in elements:
-            el = el.strip()
+        # табличные PRIMARY KEY / UNIQUE применяются после разбора всех колонок
+        pk_columns: List[str] = []
+        unique_columns: List[List[str]] = []
 
-            # TABLE-LEVEL FK
-            if el.upper().startswith("FOREIGN KEY"):
-                fk = self._parse_table_level_fk(el)
-                if fk:
-                    table.attributes["foreign_keys"].append(fk)
+        for el in _split_elements(body):
+            if _word(el, 0) in _TABLE_CONSTRAINT_WORDS:
+                self._parse_table_constraint(el, table, pk_columns, unique_columns)
                 continue
 
             # COLUMN
@@ -94,75 +191,162 @@ class SQLParser:
                         column.attributes["foreign_key"]
                     )
 
+        for name in pk_columns:
+            column = table.columns.get(name)
+            if column is not None:
+                column.attributes["is_primary_key"] = True
+                column.attributes["is_unique"] = False
+
+        for names in unique_columns:
+            if len(names) != 1:
+                continue  # составной UNIQUE не относится к одной колонке
+            column = table.columns.get(names[0])
+            if column is not None and not column.attributes.get("is_primary_key"):
+                column.attributes["is_unique"] = True
+
         return table
 
     # ==========================================================
     # COLUMN
     # ==========================================================
 
-    def _parse_column(self, element: str, table_name: str) -> Optional[Column]:
-        parts = element.split()
-        if not parts:
+    def _parse_column(self, element: TokenArray, table_name: str) -> Optional[Column]:
+        if not element:
             return None
 
-        name = parts[0].strip('"')
-        data_type = parts[1].upper() if len(parts) > 1 else "UNKNOWN"
-        upper = element.upper()
+        n = len(element)
+        name = _ident(element, 0)
+
+        # ---------- тип данных: до первого ограничения ----------
+        i = 1
+        type_parts: List[str] = []
+        while i < n:
+            word = _word(element, i)
+            if word in _COLUMN_CONSTRAINT_WORDS:
+                break
+            if element.code_at(i) == _LPAREN:
+                end = _skip_group(element, i)
+                type_parts.append("(" + element[i + 1:end - 1].render() + ")")
+                i = end
+                continue
+            raw = element.value_at(i)
+            value = word if word else raw
+            if type_parts and raw not in ("[", "]"):
+                value = " " + value
+            type_parts.append(value)
+            i += 1
+
+        data_type = "".join(type_parts) or "UNKNOWN"
 
         attributes: Dict[str, Any] = {
-            "definition": element,
+            "definition": element.render(),
             "data_type": data_type,
             "table": table_name,
-            "is_primary_key": "PRIMARY KEY" in upper,
-            "is_unique": "UNIQUE" in upper and "PRIMARY KEY" not in upper,
-            "not_null": "NOT NULL" in upper,
+            "is_primary_key": False,
+            "is_unique": False,
+            "not_null": False,
         }
 
-        # COLUMN-LEVEL FOREIGN KEY
-        fk_match = re.search(
-            r"REFERENCES\s+([A-Za-z0-9_\.]+)\s*\(([^)]+)\)",
-            element,
-            re.IGNORECASE,
-        )
+        # ---------- ограничения колонки ----------
+        while i < n:
+            w = _word(element, i)
+
+            if element.code_at(i) == _LPAREN:
+                i = _skip_group(element, i)
+                continue
 
-        if fk_match:
-            ref_full = fk_match.group(1)
-            ref_col = fk_match.group(2).strip()
+            if w == "CONSTRAINT":
+                i += 2
+                continue
 
-            ref_schema, ref_table = self._split_qualified_name(ref_full)
+            if w == "NOT" and i + 1 < n and _word(element, i + 1) == "NULL":
+                attributes["not_null"] = True
+                i += 2
+                continue
 
-            attributes["foreign_key"] = {
-                "referenced_schema": ref_schema,
-                "referenced_table": ref_table,
-                "referenced_column": ref_col,
-            }
+            if w == "PRIMARY" and i + 1 < n and _word(element, i + 1) == "KEY":
+                attributes["is_primary_key"] = True
+                i += 2
+                continue
 
-        return Column(
-            id=0,
-            name=name,
-            schema=None,
-            data_type=data_type,
-            attributes=attributes,
-        )
+            if w == "UNIQUE":
+                attributes["is_unique"] = True
+                i += 1
+                continue
+
+            # COLUMN-LEVEL FOREIGN KEY
+            if w == "REFERENCES":
+                ref_schema, ref_table, i = self._parse_qualified_name(element, i + 1)
+                ref_col = None
+                if i < n and element.code_at(i) == _LPAREN:
+                    end = _skip_group(element, i)
+                    ref_col = element[i + 1:end - 1].render()
+                    i = end
+
+                attributes["foreign_key"] = {
+                    "referenced_schema": ref_schema,
+                    "referenced_table": ref_table,
+                    "referenced_column": ref_col,
+                }
+                continue
+
+            i += 1
+
+        if attributes["is_primary_key"]:
+            attributes["is_unique"] = False
+
+        # ключи attributes совпадают с параметрами Column.from_fields
+        return Column.from_fields(name=name, **attributes)
 
     # ==========================================================
-    # TABLE-LEVEL FK
+    # TABLE-LEVEL CONSTRAINTS
     # ==========================================================
 
-    def _parse_table_level_fk(self, element: str) -> Optional[Dict[str, Any]]:
-        m = re.search(
-            r"FOREIGN\s+KEY\s*\(([^)]+)\)\s+REFERENCES\s+([A-Za-z0-9_\.]+)\s*\(([^)]+)\)",
-            element,
-            re.IGNORECASE,
-        )
-        if not m:
+    def _parse_table_constraint(
+        self,
+        element: TokenArray,
+        table: Table,
+        pk_columns: List[str],
+        unique_columns: List[List[str]],
+    ) -> None:
+        i = 0
+        if _word(element, 0) == "CONSTRAINT":
+            i = 2
+
+        if i >= len(element):
+            return
+
+        w = _word(element, i)
+
+        if w == "FOREIGN":
+            fk = self._parse_table_level_fk(element[i:])
+            if fk:
+                table.attributes["foreign_keys"].append(fk)
+        elif w == "PRIMARY":
+            pk_columns.extend(self._column_list(element, i + 2))
+        elif w == "UNIQUE":
+            unique_columns.append(self._column_list(element, i + 1))
+        # CHECK / EXCLUDE / LIKE на структуру графа не влияют
+
+    def _parse_table_level_fk(self, element: TokenArray) -> Optional[Dict[str, Any]]:
+        # FOREIGN KEY ( cols ) REFERENCES name ( cols )
+        n = len(element)
+        if n < 3 or _word(element, 1) != "KEY" or element.code_at(2) != _LPAREN:
+            return None
+
+        end = _skip_group(element, 2)
+        col = element[3:end - 1].render()
+
+        if end >= n or _word(element, end) != "REFERENCES":
             return None
 
-        col = m.group(1).strip()
-        ref_full = m.group(2)
-        ref_col = m.group(3).strip()
+        ref_schema, ref_table, i = self._parse_qualified_name(element, end + 1)
 
-        ref_schema, ref_table = self._split_qualified_name(ref_full)
+        if i >= n or element.code_at(i) != _LPAREN:
+            return None
+
+        ref_end = _skip_group(element, i)
+        ref_col = element[i + 1:ref_end - 1].render()
 
         return {
             "column": col,
@@ -175,33 +359,21 @@ class SQLParser:
     # HELPERS
     # ==========================================================
 
-    def _split_elements(self, body: str) -> List[str]:
-        parts = []
-        depth = 0
-        current = []
-
-        for ch in body:
-            if ch == "(":
-                depth += 1
-            elif ch == ")":
-                depth -= 1
-
-            if ch == "," and depth == 0:
-                part = "".join(current).strip()
-                if part:
-                    parts.append(part)
-                current = []
-            else:
-                current.append(ch)
-
-        tail = "".join(current).strip()
-        if tail:
-            parts.append(tail)
-
-        return parts
-
-    def _split_qualified_name(self, full_name: str):
-        if "." in full_name:
-            schema, name = full_name.split(".", 1)
-            return schema.strip('"'), name.strip('"')
-        return "public", full_name.strip('"')
+    def _column_list(self, tokens: TokenArray, i: int) -> List[str]:
+        """( a, b, ... ) начиная с tokens[i] → ['a', 'b', ...]."""
+        if i >= len(tokens) or tokens.code_at(i) != _LPAREN:
+            return []
+        end = _skip_group(tokens, i)
+        return [_ident(el, 0) for el in _split_elements(tokens[i + 1:end - 1]) if el]
+
+    def _parse_qualified_name(self, tokens: TokenArray, i: int) -> Tuple[str, str, int]:
+        """[schema .] name начиная с tokens[i] → (schema, name, следующий индекс)."""
+        n = len(tokens)
+        if i >= n or tokens.code_at(i) in _NOT_A_NAME:
+            raise ParsingError("Expected object name", position=tokens.position_at(i) if i < n else None)
+
+        first = _ident(tokens, i)
+        if i + 2 < n and tokens.code_at(i + 1) == _DOT:
+            return first, _ident(tokens, i + 2), i + 3
+
+        return "public", first, i + 1
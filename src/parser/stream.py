@@ -0,0 +1,164 @@
+"""
+Потоковое чтение SQL-файлов.
+
+SQLStreamReader читает файл блоками фиксированного размера и выдаёт
+операторы по одному (текст до ';' включительно). Пиковая память
+определяется размером самого большого оператора, а не размером файла:
+в буфере хранится только незавершённый оператор и текущий блок.
+
+';' внутри строк (включая $tag$ ... $tag$), идентификаторов в кавычках
+и комментариев границей оператора не считается.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+from src.core.exceptions import ConflictFileNotFoundError, FileSystemError
+
+
+# Всё, что может изменить состояние сканера в обычном тексте
+_BOUNDARY_RE = re.compile(r"""[;'"$]|--|/\*""")
+
+# Открывающая метка строки в долларах и её незавершённое начало в конце блока
+_DOLLAR_TAG_RE = re.compile(r"\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$")
+_DOLLAR_PREFIX_RE = re.compile(r"\$(?:[A-Za-z_][A-Za-z0-9_]*)?\Z")
+_IDENT_CHAR_RE = re.compile(r"[A-Za-z0-9_]")
+
+
+class SQLStreamReader:
+    """
+    Делит SQL-поток на операторы без загрузки файла целиком.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8"):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size должен быть положительным")
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+
+    def iter_statements(self, source: Union[str, Path, IO[str]]) -> Iterator[str]:
+        """
+        Выдаёт операторы из файла (путь) или текстового потока.
+        """
+        if isinstance(source, (str, Path)):
+            try:
+                f = open(source, encoding=self.encoding)
+            except FileNotFoundError:
+                raise ConflictFileNotFoundError(str(source))
+            except OSError as e:
+                raise FileSystemError(f"Не удалось прочитать файл {source}: {e}", str(source), "read")
+
+            with f:
+                yield from self._iter_from_stream(f)
+            return
+
+        yield from self._iter_from_stream(source)
+
+    def _iter_from_stream(self, f: IO[str]) -> Iterator[str]:
+        buf = ""
+        start = 0  # начало текущего оператора в buf
+        pos = 0  # позиция сканирования в buf
+        # None | "'" | '"' | "--" | "/*" | "$tag$" (закрывающая метка)
+        state: Optional[str] = None
+        # позиция сразу за последним '$' внутри имени: price$$x — одно имя
+        name_dollar_end = -1
+
+        while True:
+            chunk = f.read(self.chunk_size)
+            eof = not chunk
+
+            if chunk:
+                # отбрасываем уже выданные операторы
+                buf = buf[start:] + chunk
+                pos -= start
+                name_dollar_end -= start
+                start = 0
+
+            while True:
+                if state is None:
+                    m = _BOUNDARY_RE.search(buf, pos)
+                    if not m:
+                        # последний символ может оказаться началом '--' или '/*'
+                        pos = max(pos, len(buf) - 1)
+                        break
+
+                    if m.group() == ";":
+                        stmt = buf[start:m.end()]
+                        if stmt.strip():
+                            yield stmt
+                        start = pos = m.end()
+                    elif m.group() == "$":
+                        i = m.start()
+                        if i and (_IDENT_CHAR_RE.match(buf, i - 1) or i == name_dollar_end):
+                            # '$' после буквы, цифры, '_' или '$' имени — продолжение
+                            # имени (a$b, price$$), как IDENTIFIER токенизатора
+                            pos = name_dollar_end = m.end()
+                            continue
+
+                        tag = _DOLLAR_TAG_RE.match(buf, i)
+                        if tag:
+                            state = tag.group()
+                            pos = tag.end()
+                        elif not eof and _DOLLAR_PREFIX_RE.match(buf, i):
+                            # метка может продолжиться в следующем блоке
+                            pos = i
+                            break
+                        else:
+                            pos = m.end()  # $1, одиночный $
+                    else:
+                        state = m.group()
+                        pos = m.end()
+
+                elif state in ("'", '"'):
+                    idx = buf.find(state, pos)
+                    if idx < 0:
+                        pos = len(buf)
+                        break
+                    if idx + 1 == len(buf) and not eof:
+                        # удвоенная кавычка может оказаться на границе блоков
+                        pos = idx
+                        break
+                    if idx + 1 < len(buf) and buf[idx + 1] == state:
+                        pos = idx + 2
+                        continue
+                    state = None
+                    pos = idx + 1
+
+                elif state[0] == "$":
+                    idx = buf.find(state, pos)
+                    if idx < 0:
+                        # закрывающая метка может начаться в конце блока
+                        pos = max(pos, len(buf) - len(state) + 1)
+                        break
+                    pos = idx + len(state)
+                    state = None
+
+                elif state == "--":
+                    idx = buf.find("\n", pos)
+                    if idx < 0:
+                        pos = len(buf)
+                        break
+                    state = None
+                    pos = idx + 1
+
+                else:  # "/*"
+                    idx = buf.find("*/", pos)
+                    if idx < 0:
+                        pos = max(pos, len(buf) - 1)
+                        break
+                    state = None
+                    pos = idx + 2
+
+            if eof:
+                tail = buf[start:]
+                if tail.strip():
+                    yield tail
+                return
+
+
+__all__ = ["SQLStreamReader"]
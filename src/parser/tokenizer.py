@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import re
+from array import array
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
 
 
 class TokenType(str, Enum):
@@ -48,6 +49,158 @@ class Token:
         return self.type == TokenType.KEYWORD
 
 
+# Коды типов токенов для компактного представления (TokenArray)
+TOKEN_TYPES: Tuple[TokenType, ...] = tuple(TokenType)
+TOKEN_CODES: Dict[TokenType, int] = {t: code for code, t in enumerate(TOKEN_TYPES)}
+
+_IDENTIFIER = TOKEN_CODES[TokenType.IDENTIFIER]
+_KEYWORD = TOKEN_CODES[TokenType.KEYWORD]
+_QUOTED_IDENTIFIER = TOKEN_CODES[TokenType.QUOTED_IDENTIFIER]
+_STRING = TOKEN_CODES[TokenType.STRING]
+_SEMICOLON = TOKEN_CODES[TokenType.SEMICOLON]
+
+# render(): без пробела перед этими токенами и после LPAREN / DOT
+_NO_SPACE_BEFORE = frozenset(TOKEN_CODES[t] for t in (TokenType.COMMA, TokenType.RPAREN, TokenType.DOT, TokenType.SEMICOLON))
+_NO_SPACE_AFTER = frozenset(TOKEN_CODES[t] for t in (TokenType.LPAREN, TokenType.DOT))
+
+
+class TokenArray(Sequence[Token]):
+    """
+    Компактный поток токенов: коды типов и границы [start, end) в исходном
+    тексте, в параллельных массивах array — несколько байт на токен вместо
+    объекта Token со строкой значения.
+
+    Значения материализуются лениво (value_at, render); регистр приводится
+    при чтении по тем же правилам, что и в iter_tokens. Срез — представление
+    над теми же массивами, без копирования. Индексация по int возвращает
+    Token для совместимости (line/column вычисляются по тексту).
+    """
+
+    __slots__ = ("text", "types", "starts", "ends", "lo", "hi", "preserve_case")
+
+    def __init__(
+        self,
+        text: str,
+        types: array,
+        starts: array,
+        ends: array,
+        lo: int = 0,
+        hi: Optional[int] = None,
+        preserve_case: bool = False,
+    ) -> None:
+        self.text = text
+        self.types = types
+        self.starts = starts
+        self.ends = ends
+        self.lo = lo
+        self.hi = len(types) if hi is None else hi
+        self.preserve_case = preserve_case
+
+    @staticmethod
+    def offsets_for(text: str) -> str:
+        """Код array для смещений в тексте такой длины."""
+        return "I" if len(text) < (1 << 32) else "Q"
+
+    @classmethod
+    def from_tokens(cls, tokens: Sequence[Token]) -> "TokenArray":
+        """
+        Компактная копия готовых токенов (EOF отбрасывается). Значения
+        берутся как есть: текст собирается из них через пробел.
+        """
+        parts: List[str] = []
+        types = array("B")
+        starts = array("Q")
+        ends = array("Q")
+        pos = 0
+        for tok in tokens:
+            if tok.type == TokenType.EOF:
+                continue
+            types.append(TOKEN_CODES[tok.type])
+            starts.append(pos)
+            ends.append(pos + len(tok.value))
+            parts.append(tok.value)
+            pos += len(tok.value) + 1
+        return cls(" ".join(parts), types, starts, ends, preserve_case=True)
+
+    # ---------- Sequence ----------
+
+    def __len__(self) -> int:
+        return self.hi - self.lo
+
+    @overload
+    def __getitem__(self, i: int) -> Token: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "TokenArray": ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Token, "TokenArray"]:
+        n = self.hi - self.lo
+        if isinstance(i, slice):
+            start, stop, step = i.indices(n)
+            if step != 1:
+                raise ValueError("TokenArray: срез с шагом не поддерживается")
+            stop = max(start, stop)
+            return TokenArray(
+                self.text, self.types, self.starts, self.ends,
+                self.lo + start, self.lo + stop, self.preserve_case,
+            )
+
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("TokenArray index out of range")
+
+        pos = self.starts[self.lo + i]
+        line = self.text.count("\n", 0, pos) + 1
+        column = pos - self.text.rfind("\n", 0, pos)
+        return Token(self.type_at(i), self.value_at(i), line, column, pos)
+
+    def __iter__(self) -> Iterator[Token]:
+        for i in range(len(self)):
+            yield self[i]
+
+    # ---------- доступ без материализации Token ----------
+
+    def code_at(self, i: int) -> int:
+        return self.types[self.lo + i]
+
+    def type_at(self, i: int) -> TokenType:
+        return TOKEN_TYPES[self.types[self.lo + i]]
+
+    def position_at(self, i: int) -> int:
+        return self.starts[self.lo + i]
+
+    def raw_at(self, i: int) -> str:
+        """Текст токена без приведения регистра."""
+        k = self.lo + i
+        return self.text[self.starts[k]:self.ends[k]]
+
+    def value_at(self, i: int) -> str:
+        """Значение токена — как Token.value из iter_tokens."""
+        k = self.lo + i
+        value = self.text[self.starts[k]:self.ends[k]]
+        if not self.preserve_case:
+            code = self.types[k]
+            if code == _IDENTIFIER:
+                return value.lower()
+            if code == _KEYWORD:
+                return value.upper()
+        return value
+
+    def render(self) -> str:
+        """То же, что SQLTokenizer.render, без материализации токенов."""
+        parts: List[str] = []
+        types = self.types
+        prev = -1
+        for k in range(self.lo, self.hi):
+            code = types[k]
+            if prev >= 0 and code not in _NO_SPACE_BEFORE and prev not in _NO_SPACE_AFTER:
+                parts.append(" ")
+            parts.append(self.value_at(k - self.lo))
+            prev = code
+        return "".join(parts)
+
+
 class SQLTokenizer:
     """
     Лексический анализатор DDL
@@ -76,6 +229,9 @@ class SQLTokenizer:
 
     CONSTRAINT_KEYWORDS = {"PRIMARY", "FOREIGN", "UNIQUE", "CHECK", "REFERENCES", "DEFAULT", "NOT", "NULL"}
 
+    # Предел кэша классификации слов компактного режима (имена в дампе не ограничены)
+    _WORD_CACHE_LIMIT = 1 << 16
+
     # NEWLINE ДО WHITESPACE, иначе \s+ “съест” \n и NEWLINE никогда не появится
     _TOKEN_SPECS: List[Tuple[str, TokenType]] = [
         (r"--[^\n]*", TokenType.COMMENT),
@@ -84,6 +240,10 @@ class SQLTokenizer:
         (r"[ \t\f\v]+", TokenType.WHITESPACE),
 
         (r"'(?:[^']|'')*'", TokenType.STRING),
+        # $tag$ ... $tag$ (тела функций, DO-блоки): ';' и кавычки внутри —
+        # часть строки. Метка сравнивается с учётом регистра, как в PostgreSQL;
+        # '$' сразу после буквы, цифры или '_' — продолжение имени (a$b), не метка
+        (r"(?-i:(?<![A-Za-z0-9_])\$(?P<dollar_tag>(?:[A-Za-z_][A-Za-z0-9_]*)?)\$[\s\S]*?\$(?P=dollar_tag)\$)", TokenType.STRING),
         (r'"(?:[^"]|"")*"', TokenType.QUOTED_IDENTIFIER),
 
         (r"\d+\.\d+", TokenType.NUMBER),
@@ -98,7 +258,8 @@ class SQLTokenizer:
         (r"\(", TokenType.LPAREN),
         (r"\)", TokenType.RPAREN),
 
-        (r"[A-Za-z_][A-Za-z0-9_]*", TokenType.IDENTIFIER),
+        # '$' допустим в имени после первого символа, как в PostgreSQL (price$, a$b)
+        (r"[A-Za-z_][A-Za-z0-9_$]*", TokenType.IDENTIFIER),
     ]
 
     def __init__(self, preserve_case: bool = False):
@@ -112,12 +273,30 @@ class SQLTokenizer:
         # отображение group name -> TokenType
         self._group_to_type = {f"T{i}": t for i, (_, t) in enumerate(self._TOKEN_SPECS)}
 
+        # компактный режим: group name -> код типа (None — шум, отбрасывается),
+        # исходный текст слова -> код уточнённого типа
+        noise = (TokenType.WHITESPACE, TokenType.COMMENT, TokenType.NEWLINE)
+        self._group_to_code: Dict[str, Optional[int]] = {
+            g: (None if t in noise else TOKEN_CODES[t]) for g, t in self._group_to_type.items()
+        }
+        self._word_codes: Dict[str, int] = {}
+
     def tokenize(self, sql_text: str) -> List[Token]:
         """
         Быстрая токенизация (один проход).
         Возвращает токены без WHITESPACE/COMMENT/NEWLINE
         """
-        tokens: List[Token] = []
+        tokens: List[Token] = list(self.iter_tokens(sql_text))
+        end = len(sql_text)
+        line = sql_text.count("\n") + 1
+        col = end - sql_text.rfind("\n")
+        tokens.append(Token(TokenType.EOF, "", line, col, end))
+        return tokens
+
+    def iter_tokens(self, sql_text: str) -> Iterator[Token]:
+        """
+        Потоковая токенизация: токены выдаются по одному, без EOF.
+        """
         line = 1
         col = 1
 
@@ -129,8 +308,7 @@ class SQLTokenizer:
             if not m:
                 # гарантируем прогресс: 1 символ как OPERATOR, чтобы не зависнуть
                 value = sql_text[pos]
-                tok = Token(TokenType.OPERATOR, value, line, col, pos)
-                tokens.append(tok)
+                yield Token(TokenType.OPERATOR, value, line, col, pos)
                 pos += 1
                 col += 1
                 continue
@@ -145,9 +323,14 @@ class SQLTokenizer:
             value = m.group(group)
 
             # координаты обновляем ДО фильтрации
+            start_line, start_col = line, col
             if base_type == TokenType.NEWLINE:
                 line += 1
                 col = 1
+            elif base_type in (TokenType.STRING, TokenType.COMMENT) and "\n" in value:
+                # многострочные строки ($$-тела) и комментарии
+                line += value.count("\n")
+                col = len(value) - value.rfind("\n")
             else:
                 col += len(value)
 
@@ -167,10 +350,129 @@ class SQLTokenizer:
             if precise == TokenType.KEYWORD and not self.preserve_case:
                 value = value.upper()
 
-            tokens.append(Token(precise, value, line, col - len(value), pos - len(value)))
+            yield Token(precise, value, start_line, start_col, m.start())
 
-        tokens.append(Token(TokenType.EOF, "", line, col, pos))
-        return tokens
+    def iter_statements(self, sql_text: str) -> Iterator[List[Token]]:
+        """
+        Делит поток токенов на операторы по ';'.
+        Каждый оператор — срез токенов вместе с завершающим ';' (если он есть).
+        Точка с запятой внутри строк/идентификаторов в кавычках — часть токена,
+        поэтому деление безопасно.
+        """
+        current: List[Token] = []
+        for tok in self.iter_tokens(sql_text):
+            current.append(tok)
+            if tok.type == TokenType.SEMICOLON:
+                if len(current) > 1:
+                    yield current
+                current = []
+        if current:
+            yield current
+
+    def tokenize_compact(self, sql_text: str) -> TokenArray:
+        """
+        Токенизация в компактный поток (без EOF и без шумовых токенов).
+        """
+        types, starts, ends = self._new_arrays(sql_text)
+        for _ in self._scan_compact(sql_text, types, starts, ends, split=False):
+            pass
+        return TokenArray(sql_text, types, starts, ends, preserve_case=self.preserve_case)
+
+    def iter_compact_statements(self, sql_text: str) -> Iterator[TokenArray]:
+        """
+        То же, что iter_statements, но каждый оператор — TokenArray
+        над исходным текстом (значения не копируются).
+        """
+        types, starts, ends = self._new_arrays(sql_text)
+        for types, starts, ends in self._scan_compact(sql_text, types, starts, ends, split=True):
+            yield TokenArray(sql_text, types, starts, ends, preserve_case=self.preserve_case)
+
+    @staticmethod
+    def _new_arrays(sql_text: str) -> Tuple[array, array, array]:
+        offsets = TokenArray.offsets_for(sql_text)
+        return array("B"), array(offsets), array(offsets)
+
+    def _scan_compact(
+        self,
+        sql_text: str,
+        types: array,
+        starts: array,
+        ends: array,
+        *,
+        split: bool,
+    ) -> Iterator[Tuple[array, array, array]]:
+        """
+        Заполняет массивы токенами. При split=True выдаёт массивы каждого
+        оператора (с завершающим ';') и начинает новые.
+        """
+        match = self._master.match
+        group_to_code = self._group_to_code
+        word_codes = self._word_codes
+        operator = TOKEN_CODES[TokenType.OPERATOR]
+
+        pos = 0
+        n = len(sql_text)
+
+        while pos < n:
+            m = match(sql_text, pos)
+            if not m:
+                # гарантируем прогресс: 1 символ как OPERATOR
+                code: Optional[int] = operator
+                end = pos + 1
+            else:
+                end = m.end()
+                if end == pos:
+                    raise ValueError(f"Tokenizer matched empty token at position {pos}")
+                code = group_to_code[m.lastgroup]  # type: ignore[index]
+                if code == _IDENTIFIER:
+                    word = sql_text[pos:end]
+                    code = word_codes.get(word)
+                    if code is None:
+                        code = TOKEN_CODES[self._determine_token_type(TokenType.IDENTIFIER, word)]
+                        if len(word_codes) < self._WORD_CACHE_LIMIT:
+                            word_codes[word] = code
+
+            if code is not None:
+                types.append(code)
+                starts.append(pos)
+                ends.append(end)
+
+                if split and code == _SEMICOLON:
+                    if len(types) > 1:
+                        yield types, starts, ends
+                    types, starts, ends = self._new_arrays(sql_text)
+
+            pos = end
+
+        if split and types:
+            yield types, starts, ends
+
+    @staticmethod
+    def render(tokens: Sequence[Token]) -> str:
+        """
+        Собирает текст из токенов в каноническом виде:
+        один пробел между токенами, без пробелов перед , ) . ; и после ( .
+        """
+        if isinstance(tokens, TokenArray):
+            return tokens.render()
+
+        parts: List[str] = []
+        prev = None
+
+        for tok in tokens:
+            if tok.type == TokenType.EOF:
+                continue
+
+            if prev is not None:
+                # Не ставим пробел перед некоторыми токенами и после '(' и '.'
+                if tok.type not in (TokenType.COMMA, TokenType.RPAREN, TokenType.DOT, TokenType.SEMICOLON) \
+                        and prev.type not in (TokenType.LPAREN, TokenType.DOT):
+                    parts.append(" ")
+
+            parts.append(tok.value)
+            prev = tok
+
+        return "".join(parts)
 
     def _determine_token_type(self, base_type: TokenType, value: str) -> TokenType:
         if base_type != TokenType.IDENTIFIER:
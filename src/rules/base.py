@@ -5,7 +5,9 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Union
+
+from ..core.models import ObjectType, RelationType
 
 from ..graph.schema_graph import SchemaGraph
 from ..comparison.delta import Delta
@@ -19,6 +21,13 @@ class ConflictLevel(Enum):
     LOW = "low"            # Низкий риск, информационное сообщение
 
 
+# Части Δ — входы правил наряду с графами (graph_a, graph_b)
+DELTA_PARTS: FrozenSet[str] = frozenset({
+    "objects_added", "objects_removed", "objects_modified",
+    "edges_added", "edges_removed",
+})
+
+
 class BaseRule(ABC):
     """
     Абстрактный базовый класс для всех правил обнаружения конфликтов.
@@ -33,6 +42,20 @@ class BaseRule(ABC):
     RULE_DESCRIPTION: str = ""
     DEFAULT_LEVEL: ConflictLevel = ConflictLevel.MEDIUM
 
+    # Срез Δ, который читает правило: часть Δ (objects_added, objects_removed,
+    # objects_modified, edges_added, edges_removed) → типы элементов: ObjectType
+    # для объектов, RelationType для рёбер (None — любые).
+    # Реестр один раз индексирует Δ по частям и типам и пропускает правило,
+    # если его срез пуст. None — срез не объявлен: правило читает всю Δ;
+    # {} — правило Δ не читает (работает только по графам). В обоих случаях
+    # правило выполняется всегда.
+    DELTA_FOOTPRINT: Optional[Mapping[
+        str, Optional[Union[FrozenSet[ObjectType], FrozenSet[RelationType]]]
+    ]] = None
+
+    # Графы, которые читает правило: graph_a, graph_b (по умолчанию — оба)
+    GRAPH_INPUTS: FrozenSet[str] = frozenset({"graph_a", "graph_b"})
+
     REQUIRES_GRAPH_ANALYSIS: bool = True
     REQUIRES_TYPE_COMPATIBILITY: bool = False
     REQUIRES_SEMANTIC_ANALYSIS: bool = False
@@ -60,6 +83,32 @@ class BaseRule(ABC):
         """
         raise NotImplementedError
 
+    @property
+    def inputs(self) -> FrozenSet[str]:
+        """
+        Входы правила: части Δ из DELTA_FOOTPRINT (без среза — все части)
+        и GRAPH_INPUTS. Инкрементальный режим перезапускает правило, только
+        если изменился один из его входов.
+        """
+        footprint = self.DELTA_FOOTPRINT
+        parts = DELTA_PARTS if footprint is None else frozenset(footprint)
+        return parts | self.GRAPH_INPUTS
+
+    def has_input(self, present: Mapping[str, Set[Any]]) -> bool:
+        """
+        Есть ли в Δ объекты из среза правила.
+        present — индекс Δ: часть Δ → типы присутствующих в ней элементов
+        (ObjectType для объектов, RelationType для рёбер).
+        """
+        if not self.DELTA_FOOTPRINT:
+            return True
+
+        for bucket, types in self.DELTA_FOOTPRINT.items():
+            found = present.get(bucket)
+            if found and (types is None or not found.isdisjoint(types)):
+                return True
+        return False
+
     def post_process_conflicts(self, conflicts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Унификация и постобработка: лимиты, level/rule/rule_name.
@@ -126,6 +175,11 @@ class BaseRule(ABC):
             "requires_graph_analysis": self.REQUIRES_GRAPH_ANALYSIS,
             "requires_type_compatibility": self.REQUIRES_TYPE_COMPATIBILITY,
             "requires_semantic_analysis": self.REQUIRES_SEMANTIC_ANALYSIS,
+            "delta_footprint": (
+                {bucket: sorted(t.value for t in types) if types is not None else None
+                 for bucket, types in self.DELTA_FOOTPRINT.items()}
+                if self.DELTA_FOOTPRINT is not None else None
+            ),
             "config": self.config,
             "class_name": self.__class__.__name__,
         }
@@ -4,11 +4,14 @@
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Type
+import os
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
 
 from .base import BaseRule, ConflictLevel
 from ..graph.schema_graph import SchemaGraph
 from ..comparison.delta import Delta
+from ..utils.instrumentation import Instrumentation
 
 
 class RuleRegistry:
@@ -20,6 +23,8 @@ class RuleRegistry:
         self.config = config or {}
         self._rules: Dict[str, BaseRule] = {}
         self._rule_classes: Dict[str, Type[BaseRule]] = {}
+        # замеры по правилам (этапы "rule.<ID>"); задаётся оркестратором
+        self.instrumentation: Optional[Instrumentation] = None
         self._init_defaults()
 
     def _init_defaults(self) -> None:
@@ -28,6 +33,9 @@ class RuleRegistry:
             "default_conflict_level": ConflictLevel.MEDIUM.value,
             "max_total_conflicts": 1000,
             "enable_statistics": True,
+            "execution_mode": "sequential",  # sequential | thread | process
+            "max_workers": None,  # None — min(число правил, число CPU)
+            "skip_empty_inputs": True,  # не выполнять правила с пустым срезом Δ
         }
         for k, v in defaults.items():
             self.config.setdefault(k, v)
@@ -68,13 +76,7 @@ class RuleRegistry:
             return sorted(rules, key=lambda r: r.RULE_ID)
 
         if order == "by_criticality":
-            priority = {
-                ConflictLevel.CRITICAL.value: 0,
-                ConflictLevel.HIGH.value: 1,
-                ConflictLevel.MEDIUM.value: 2,
-                ConflictLevel.LOW.value: 3,
-            }
-            return sorted(rules, key=lambda r: priority.get(r.config.get("level", r.DEFAULT_LEVEL.value), 99))
+            return sorted(rules, key=lambda r: _criticality(r)[0])
 
         # custom: порядок задаётся списком ids
         if order == "custom":
@@ -84,91 +86,177 @@ class RuleRegistry:
 
         return rules
 
+    # ==========================================================
+    # ВЫПОЛНЕНИЕ ПРАВИЛ
+    # ==========================================================
+
+    def _execute(
+        self,
+        rules: List[BaseRule],
+        delta: Delta,
+        graph_a: SchemaGraph,
+        graph_b: SchemaGraph,
+    ) -> List[RuleResult]:
+        """
+        Выполняет правила в режиме config["execution_mode"]:
+        sequential | thread | process.
+
+        Правила — чистые функции (Δ, G_A, G_B), поэтому их можно выполнять
+        параллельно. Результаты возвращаются в порядке rules.
+        """
+        mode = self.config.get("execution_mode", "sequential")
+        if mode not in ("sequential", "thread", "process"):
+            raise ValueError(f"Неизвестный режим выполнения правил: {mode}")
+
+        max_workers = self.config.get("max_workers") or min(len(rules), os.cpu_count() or 1)
+
+        if mode == "sequential" or len(rules) < 2 or max_workers < 2:
+            return [self._run_instrumented(rule, delta, graph_a, graph_b) for rule in rules]
+
+        # пулы импортируются по требованию: concurrent.futures.process
+        # заметно удлиняет старт, а по умолчанию правила идут последовательно
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if mode == "thread":
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(_run_rule, rule, delta, graph_a, graph_b) for rule in rules]
+        else:
+            # Δ и графы передаются каждому процессу один раз (initializer)
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_process_init,
+                initargs=(delta, graph_a, graph_b),
+            ) as pool:
+                futures = [pool.submit(_process_run_rule, rule) for rule in rules]
+
+        results: List[RuleResult] = []
+        for rule, future in zip(rules, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # падение самого процесса/сериализации — изолируем как ошибку правила
+                results.append(_rule_error(rule, e))
+
+        # в пуле память по правилам не разделить — переносим только время
+        if self.instrumentation is not None:
+            for rule, (conflicts, stat) in zip(rules, results):
+                self.instrumentation.record(
+                    f"rule.{rule.RULE_ID}",
+                    stat.get("wall_time", 0.0),
+                    stat.get("cpu_time", 0.0),
+                    conflicts=len(conflicts),
+                )
+        return results
+
+    def _run_instrumented(
+        self,
+        rule: BaseRule,
+        delta: Delta,
+        graph_a: SchemaGraph,
+        graph_b: SchemaGraph,
+    ) -> RuleResult:
+        if self.instrumentation is None:
+            return _run_rule(rule, delta, graph_a, graph_b)
+
+        with self.instrumentation.stage(f"rule.{rule.RULE_ID}") as st:
+            conflicts, stat = _run_rule(rule, delta, graph_a, graph_b)
+            st.count(conflicts=len(conflicts))
+        return conflicts, stat
+
     def apply_all(self, delta: Delta, graph_a: SchemaGraph, graph_b: SchemaGraph) -> Dict[str, Any]:
         if not self._rules:
             return {"conflicts": [], "statistics": [], "summary": {"total_conflicts": 0}}
 
-        enabled = self.get_enabled_rules()
-        ordered = self._order_rules(enabled)
+        return self.merge_results(self.run_rules(delta, graph_a, graph_b))
+
+    def run_rules(
+        self,
+        delta: Delta,
+        graph_a: SchemaGraph,
+        graph_b: SchemaGraph,
+        *,
+        previous: Optional[Dict[str, RuleResult]] = None,
+        changed_inputs: Optional[Set[str]] = None,
+    ) -> Dict[str, RuleResult]:
+        """
+        Выполняет включённые правила; результат — {rule_id: (conflicts, stat)}
+        в порядке _order_rules.
+
+        Правило, срез Δ которого (BaseRule.DELTA_FOOTPRINT) пуст,
+        не выполняется — его результат пустой (applied: False).
+
+        Инкрементальный режим: если задан previous (результаты прошлого
+        запуска), правило перезапускается, только если его входы (inputs)
+        пересекаются с changed_inputs; иначе берётся прошлый результат.
+        """
+        ordered = self._order_rules(self.get_enabled_rules())
+
+        if previous is None or changed_inputs is None:
+            stale = ordered
+        else:
+            stale = [
+                r for r in ordered
+                if r.RULE_ID not in previous or r.inputs & changed_inputs
+            ]
+
+        fresh: Dict[str, RuleResult] = {}
+        if self.config.get("skip_empty_inputs", True):
+            present = index_delta(delta)
+            for r in stale:
+                if not r.has_input(present):
+                    fresh[r.RULE_ID] = _rule_skipped(r)
+            stale = [r for r in stale if r.RULE_ID not in fresh]
+
+        fresh.update(zip((r.RULE_ID for r in stale), self._execute(stale, delta, graph_a, graph_b)))
+        return {
+            r.RULE_ID: fresh[r.RULE_ID] if r.RULE_ID in fresh else previous[r.RULE_ID]
+            for r in ordered
+        }
 
+    def gate(
+        self,
+        delta: Delta,
+        graph_a: SchemaGraph,
+        graph_b: SchemaGraph,
+    ) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """
+        Режим проверки слияния: нужен только merge_blocked.
+
+        Правила выполняются последовательно в порядке критичности
+        (CRITICAL — первыми, затем по RULE_ID), выполнение прекращается
+        на первом критическом конфликте. Уровень конфликта известен только
+        после выполнения (R2 повышает уровень, ошибка правила — SYSTEM
+        CRITICAL), поэтому без блокирующего конфликта выполняются все
+        правила с непустым срезом Δ.
+
+        Возвращает (первый блокирующий конфликт или None, id выполненных правил).
+        """
+        present = index_delta(delta) if self.config.get("skip_empty_inputs", True) else None
+        evaluated: List[str] = []
+
+        for rule in sorted(self.get_enabled_rules(), key=_criticality):
+            if present is not None and not rule.has_input(present):
+                continue
+            evaluated.append(rule.RULE_ID)
+            conflicts, _ = self._run_instrumented(rule, delta, graph_a, graph_b)
+            for c in conflicts:
+                if c.get("level") == ConflictLevel.CRITICAL.value:
+                    return c, evaluated
+
+        return None, evaluated
+
+    def merge_results(self, results: Dict[str, RuleResult]) -> Dict[str, Any]:
+        """
+        Сводит результаты правил (run_rules) в итог apply_all:
+        конфликты, статистика и summary.
+        """
         all_conflicts: List[Dict[str, Any]] = []
         stats: List[Dict[str, Any]] = []
 
-        for rule in ordered:
-            try:
-                raw = rule.apply(delta, graph_a, graph_b)
-
-                # --- НОРМАЛИЗАЦИЯ ВЫХОДА ПРАВИЛА ---
-                if raw is None:
-                    raw = []
-                elif isinstance(raw, list):
-                    # оставляем только dict
-                    raw = [c for c in raw if isinstance(c, dict)]
-                else:
-                    raw = []
-
-                processed = rule.post_process_conflicts(raw)
-
-                if not isinstance(processed, list):
-                    processed = []
-
-                # for c in processed:
-                #     c["rule_info"] = rule.get_info()
-
-                for c in processed:
-                    level = c.get("level")
-
-                    # --- Жёсткая нормализация ---
-                    if isinstance(level, ConflictLevel):
-                        c["level"] = level.value
-                    else:
-                        c["level"] = str(level).lower()
-
-                    # страховка от мусора
-                    if c["level"] not in {lvl.value for lvl in ConflictLevel}:
-                        c["level"] = ConflictLevel.MEDIUM.value
-
-                    c["rule_info"] = rule.get_info()
-
-                all_conflicts.extend(processed)
-
-                stats.append({
-                    "rule_id": rule.RULE_ID,
-                    "rule_name": rule.RULE_NAME,
-                    "applied": True,
-                    "conflicts_found": len(processed),
-                    "details": {
-                        "total_raw": len(raw),
-                        "total_reported": len(processed),
-                    }
-                })
-            # except Exception as e:
-            #     stats.append({
-            #         "rule_id": rule.RULE_ID,
-            #         "rule_name": rule.RULE_NAME,
-            #         "applied": False,
-            #         "error": str(e),
-            #         "conflicts_found": 0
-            #     })
-            except Exception as e:
-                all_conflicts.append({
-                    "rule": "SYSTEM",
-                    "rule_name": "Rule execution error",
-                    "level": ConflictLevel.CRITICAL.value,
-                    "message": f"Ошибка выполнения правила {rule.RULE_ID}: {str(e)}",
-                    "details": {
-                        "rule_id": rule.RULE_ID,
-                        "exception_type": type(e).__name__,
-                    }
-                })
-
-                stats.append({
-                    "rule_id": rule.RULE_ID,
-                    "rule_name": rule.RULE_NAME,
-                    "enabled": True,
-                    "error": str(e),
-                    "conflicts_found": 1
-                })
+        # результаты сливаются в порядке правил независимо от режима выполнения
+        for conflicts, stat in results.values():
+            all_conflicts.extend(conflicts)
+            stats.append(stat)
 
         original_total = len(all_conflicts)
         max_total = int(self.config.get("max_total_conflicts", 1000))
@@ -210,7 +298,148 @@ class RuleRegistry:
             "merge_blocked": critical_count > 0,
 
             "total_rules": len(self._rules),
-            "enabled_rules": len(enabled),
+            "enabled_rules": len(results),
+            "skipped_rules": sum(1 for _, stat in results.values() if stat.get("skipped")),
         }
 
         return {"conflicts": trimmed, "statistics": stats, "summary": summary}
+
+
+# ==========================================================
+# ВЫПОЛНЕНИЕ ОДНОГО ПРАВИЛА
+# ==========================================================
+# Функции уровня модуля: их вызывают пулы потоков и процессов.
+
+RuleResult = Tuple[List[Dict[str, Any]], Dict[str, Any]]
+
+
+def index_delta(delta: Delta) -> Dict[str, Set[Any]]:
+    """
+    Индекс Δ для BaseRule.has_input: часть Δ → типы её элементов
+    (ObjectType для объектов, RelationType для рёбер).
+    Объекты Δ уже разложены по типам (Delta.types_in).
+    """
+    return {
+        bucket: delta.types_in(bucket)
+        for bucket in ("objects_added", "objects_removed", "objects_modified", "edges_added", "edges_removed")
+    }
+
+
+_LEVEL_PRIORITY = {
+    ConflictLevel.CRITICAL.value: 0,
+    ConflictLevel.HIGH.value: 1,
+    ConflictLevel.MEDIUM.value: 2,
+    ConflictLevel.LOW.value: 3,
+}
+
+
+def _criticality(rule: BaseRule) -> Tuple[int, str]:
+    return _LEVEL_PRIORITY.get(rule.config.get("level", rule.DEFAULT_LEVEL.value), 99), rule.RULE_ID
+
+
+def _rule_skipped(rule: BaseRule) -> RuleResult:
+    return [], {
+        "rule_id": rule.RULE_ID,
+        "rule_name": rule.RULE_NAME,
+        "applied": False,
+        "skipped": True,
+        "conflicts_found": 0,
+        "details": {
+            "total_raw": 0,
+            "total_reported": 0,
+        },
+    }
+
+
+def _run_rule(rule: BaseRule, delta: Delta, graph_a: SchemaGraph, graph_b: SchemaGraph) -> RuleResult:
+    """
+    Применяет правило и нормализует его выход.
+    Исключение правила превращается в конфликт SYSTEM и не прерывает остальные.
+    В статистику добавляются wall_time и cpu_time (CPU текущего потока).
+    """
+    wall0 = time.perf_counter()
+    cpu0 = time.thread_time()
+    conflicts, stat = _apply_rule(rule, delta, graph_a, graph_b)
+    stat["wall_time"] = time.perf_counter() - wall0
+    stat["cpu_time"] = time.thread_time() - cpu0
+    return conflicts, stat
+
+
+def _apply_rule(rule: BaseRule, delta: Delta, graph_a: SchemaGraph, graph_b: SchemaGraph) -> RuleResult:
+    try:
+        raw = rule.apply(delta, graph_a, graph_b)
+
+        # --- НОРМАЛИЗАЦИЯ ВЫХОДА ПРАВИЛА ---
+        if raw is None:
+            raw = []
+        elif isinstance(raw, list):
+            # оставляем только dict
+            raw = [c for c in raw if isinstance(c, dict)]
+        else:
+            raw = []
+
+        processed = rule.post_process_conflicts(raw)
+
+        if not isinstance(processed, list):
+            processed = []
+
+        for c in processed:
+            level = c.get("level")
+
+            # --- Жёсткая нормализация ---
+            if isinstance(level, ConflictLevel):
+                c["level"] = level.value
+            else:
+                c["level"] = str(level).lower()
+
+            # страховка от мусора
+            if c["level"] not in {lvl.value for lvl in ConflictLevel}:
+                c["level"] = ConflictLevel.MEDIUM.value
+
+            c["rule_info"] = rule.get_info()
+
+        return processed, {
+            "rule_id": rule.RULE_ID,
+            "rule_name": rule.RULE_NAME,
+            "applied": True,
+            "conflicts_found": len(processed),
+            "details": {
+                "total_raw": len(raw),
+                "total_reported": len(processed),
+            }
+        }
+    except Exception as e:
+        return _rule_error(rule, e)
+
+
+def _rule_error(rule: BaseRule, e: Exception) -> RuleResult:
+    conflict = {
+        "rule": "SYSTEM",
+        "rule_name": "Rule execution error",
+        "level": ConflictLevel.CRITICAL.value,
+        "message": f"Ошибка выполнения правила {rule.RULE_ID}: {str(e)}",
+        "details": {
+            "rule_id": rule.RULE_ID,
+            "exception_type": type(e).__name__,
+        }
+    }
+
+    return [conflict], {
+        "rule_id": rule.RULE_ID,
+        "rule_name": rule.RULE_NAME,
+        "enabled": True,
+        "error": str(e),
+        "conflicts_found": 1
+    }
+
+
+_process_args: Tuple[Any, ...] = ()
+
+
+def _process_init(delta: Delta, graph_a: SchemaGraph, graph_b: SchemaGraph) -> None:
+    global _process_args
+    _process_args = (delta, graph_a, graph_b)
+
+
+def _process_run_rule(rule: BaseRule) -> RuleResult:
+    return _run_rule(rule, *_process_args)
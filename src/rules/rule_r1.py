@@ -13,6 +13,8 @@ class RuleR1(BaseRule):
         "в исходной версии схемы."
     )
     DEFAULT_LEVEL = ConflictLevel.CRITICAL
+    GRAPH_INPUTS = frozenset({"graph_a"})
+    DELTA_FOOTPRINT = {"objects_removed": frozenset({ObjectType.TABLE})}
 
     def apply(
         self,
@@ -23,21 +25,16 @@ class RuleR1(BaseRule):
 
         conflicts = []
 
-        for removed in delta.objects_removed:
-
-            # R1 применим ТОЛЬКО к таблицам
-            if removed.type != ObjectType.TABLE:
-                continue
+        # R1 применим ТОЛЬКО к таблицам
+        for removed in delta.iter_removed(ObjectType.TABLE):
 
             table = graph_a.get_table_of_object(removed)
             if table is None:
                 continue
 
             incoming_refs = [
-                e for e in graph_a.edges
-                if e.relation == RelationType.REFERENCES
-                and e.dst == table.id
-                and e.src != table.id
+                e for e in graph_a.get_incoming(table, relation=RelationType.REFERENCES)
+                if e.src != table.id
             ]
 
             if incoming_refs:
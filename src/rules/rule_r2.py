@@ -20,6 +20,8 @@ class RuleR2(BaseRule):
         "если таблица участвует во внешних ссылках."
     )
     DEFAULT_LEVEL = ConflictLevel.HIGH
+    GRAPH_INPUTS = frozenset({"graph_b"})
+    DELTA_FOOTPRINT = {"objects_modified": frozenset({ObjectType.COLUMN})}
 
     def apply(
         self,
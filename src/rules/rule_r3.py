@@ -13,6 +13,8 @@ class RuleR3(BaseRule):
         "в внешних ключах (как источник или цель)."
     )
     DEFAULT_LEVEL = ConflictLevel.HIGH
+    GRAPH_INPUTS = frozenset({"graph_a"})
+    DELTA_FOOTPRINT = {"objects_removed": frozenset({ObjectType.TABLE})}
 
     def apply(
         self,
@@ -23,10 +25,8 @@ class RuleR3(BaseRule):
 
         conflicts = []
 
-        for obj in delta.objects_removed:
-            #  R3 работает ТОЛЬКО с таблицами
-            if obj.type != ObjectType.TABLE:
-                continue
+        #  R3 работает ТОЛЬКО с таблицами
+        for obj in delta.iter_removed(ObjectType.TABLE):
 
             # входящие REFERENCES (на таблицу кто-то ссылался)
             incoming = graph_a.get_incoming(
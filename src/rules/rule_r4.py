@@ -14,6 +14,14 @@ class RuleR4(BaseRule):
         "участвовавших в ограничениях целостности."
     )
     DEFAULT_LEVEL = ConflictLevel.HIGH
+    # Ограничения целостности, удаление которых сообщает правило
+    CONSTRAINT_TYPES = (
+        ObjectType.PRIMARY_KEY,
+        ObjectType.UNIQUE_CONSTRAINT,
+        ObjectType.FOREIGN_KEY,
+    )
+    GRAPH_INPUTS = frozenset()
+    DELTA_FOOTPRINT = {"objects_removed": frozenset(CONSTRAINT_TYPES)}
 
     def apply(
         self,
@@ -24,14 +32,7 @@ class RuleR4(BaseRule):
 
         conflicts: List[Dict] = []
 
-        for obj in delta.objects_removed:
-            if obj.type not in {
-                ObjectType.PRIMARY_KEY,
-                ObjectType.UNIQUE_CONSTRAINT,
-                ObjectType.FOREIGN_KEY,
-            }:
-                continue
-
+        for obj in delta.iter_removed(*self.CONSTRAINT_TYPES):
             conflicts.append({
                 "rule": self.RULE_ID,
                 "level": self.DEFAULT_LEVEL.value,
@@ -14,6 +14,8 @@ class RuleR5(BaseRule):
     RULE_NAME = "Primary key modification"
     RULE_DESCRIPTION = "Detects changes to primary keys."
     DEFAULT_LEVEL = ConflictLevel.CRITICAL
+    GRAPH_INPUTS = frozenset()
+    DELTA_FOOTPRINT = {"objects_modified": frozenset({ObjectType.PRIMARY_KEY})}
 
     def apply(self, delta: Delta, graph_a, graph_b) -> List[dict]:
         conflicts = []
@@ -10,6 +10,8 @@ class RuleR6(BaseRule):
     RULE_NAME = "Add NOT NULL without default"
     RULE_DESCRIPTION = "Detects adding NOT NULL constraint without default."
     DEFAULT_LEVEL = ConflictLevel.HIGH
+    GRAPH_INPUTS = frozenset()
+    DELTA_FOOTPRINT = {"objects_modified": frozenset({ObjectType.COLUMN})}
 
     def apply(self, delta: Delta, graph_a, graph_b) -> List[dict]:
         conflicts = []
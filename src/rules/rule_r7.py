@@ -2,22 +2,83 @@
 from typing import List
 from src.rules.base import BaseRule, ConflictLevel
 from src.comparison.delta import Delta
+from src.core.constants import SYSTEM_LIMITS
+from src.core.models import ObjectType, RelationType
+from src.graph.schema_graph import FOREIGN_KEY_DEPENDENCIES, FOREIGN_KEY_DEPENDENCIES_WITH_SELF
+from src.utils.naming import object_qualified_name
 
 
 class RuleR7(BaseRule):
     """
     R7: Циклические зависимости.
+
+    relations = "foreign_keys" (по умолчанию) — циклы зависимостей таблиц
+    по внешним ключам (SchemaGraph: FOREIGN_KEY_DEPENDENCIES); список
+    отношений — циклы по самим рёбрам графа (None — все отношения).
+    Ссылки таблицы на саму себя (иерархии: emp.manager_id → emp) —
+    намеренные циклы и по умолчанию не сообщаются; self_references = True
+    включает их.
+
+    scope = "delta" (по умолчанию) — только циклы G_B, проходящие через
+    добавленные миграцией рёбра (Δ.edges_added): циклы, существовавшие
+    в G_A, не сообщаются, а работа пропорциональна изменению.
+    scope = "graph" — все циклы G_B (по одному на компоненту связности).
     """
 
     RULE_ID = "R7"
     RULE_NAME = "Cyclic dependencies"
     RULE_DESCRIPTION = "Detects cyclic dependencies in schema graph."
     DEFAULT_LEVEL = ConflictLevel.CRITICAL
+    GRAPH_INPUTS = frozenset({"graph_b"})
+    # scope = "graph": Δ не читается, правило обходит весь G_B
+    DELTA_FOOTPRINT = {}
+
+    def _init_config(self) -> None:
+        super()._init_config()
+        # None — без ограничения
+        self.config.setdefault("max_cycle_length", SYSTEM_LIMITS["MAX_RECURSION_DEPTH"])
+        self.config.setdefault("max_cycles", None)
+        self.config.setdefault("scope", "delta")
+        # вид графа для поиска циклов: "foreign_keys" или список отношений (None — все)
+        self.config.setdefault("relations", FOREIGN_KEY_DEPENDENCIES)
+        self.config.setdefault("self_references", False)
+
+        relations = self.config.get("relations")
+        if relations == FOREIGN_KEY_DEPENDENCIES:
+            self.relations = (
+                FOREIGN_KEY_DEPENDENCIES_WITH_SELF if self.config.get("self_references")
+                else FOREIGN_KEY_DEPENDENCIES
+            )
+            footprint = frozenset({RelationType.DEPENDS_ON, RelationType.REFERENCES})
+        else:
+            self.relations = (
+                frozenset(RelationType(r) if isinstance(r, str) else r for r in relations)
+                if relations is not None else None
+            )
+            footprint = self.relations
+
+        if self.config.get("scope") == "delta":
+            # без новых рёбер нужных отношений новых циклов нет
+            self.DELTA_FOOTPRINT = {"edges_added": footprint}
 
     def apply(self, delta: Delta, graph_a, graph_b) -> List[dict]:
         conflicts = []
 
-        cycles = graph_b.find_cycles() if hasattr(graph_b, "find_cycles") else []
+        if not hasattr(graph_b, "find_cycles"):
+            cycles = []
+        elif self.config.get("scope") == "delta":
+            cycles = graph_b.find_cycles_through(
+                delta.edges_added,
+                relations=self.relations,
+                max_length=self.config.get("max_cycle_length"),
+                max_cycles=self.config.get("max_cycles"),
+            )
+        else:
+            cycles = graph_b.find_cycles(
+                relations=self.relations,
+                max_length=self.config.get("max_cycle_length"),
+                max_cycles=self.config.get("max_cycles"),
+            )
 
         for cycle in cycles:
             conflicts.append({
@@ -25,7 +86,8 @@ class RuleR7(BaseRule):
                 "level": self.DEFAULT_LEVEL.value,
                 "message": "Cyclic dependency detected in schema graph",
                 "details": {
-                    "cycle": [o.get_full_name() for o in cycle],
+                    "cycle": [object_qualified_name(o) for o in cycle],
+                    "tables": [object_qualified_name(o) for o in cycle[:-1] if o.type == ObjectType.TABLE],
                 },
             })
 
@@ -8,31 +8,49 @@
 - naming: нормализация и сопоставление имён объектов БД
 - type_compatibility: проверка совместимости типов данных PostgreSQL
 - validators: эвристические валидаторы структурных и логических конфликтов
+- instrumentation: замеры времени и памяти по этапам конвейера и правилам
+
+Модули загружаются при первом обращении к имени (src/core/lazy.py):
+например, таблица вердиктов type_compatibility строится, только когда
+она нужна.
 """
 
-from .naming import (
-    normalize_identifier,
-    normalize_schema,
-    split_qualified_name,
-    split_table_column,
-    qualify_table,
-    qualify_column,
-    object_qualified_name,
-    object_key,
-    parse_object_key,
-    guess_parent_table,
-)
-
-from .type_compatibility import (
-    TypeCategory,
-    TypeCompatibilityChecker,
-)
-
-from .validators import (
-    attrs_signature,
-    deep_equal_struct,
-    detect_obvious_constraint_conflict,
-)
+from src.core.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".naming": (
+        "normalize_identifier",
+        "normalize_schema",
+        "split_qualified_name",
+        "split_table_column",
+        "qualify_table",
+        "qualify_column",
+        "object_qualified_name",
+        "object_key",
+        "parse_object_key",
+        "guess_parent_table",
+    ),
+
+    ".type_compatibility": (
+        "TypeCategory",
+        "TypeCompatibilityChecker",
+        "TypeVerdict",
+    ),
+
+    ".validators": (
+        "attrs_signature",
+        "attrs_hash",
+        "deep_equal_struct",
+        "detect_obvious_constraint_conflict",
+    ),
+
+    ".instrumentation": (
+        "Instrumentation",
+        "StageMetrics",
+        "summary_records",
+        "write_jsonl",
+    ),
+})
 
 __all__ = [
     # naming
@@ -50,10 +68,18 @@ __all__ = [
     # type compatibility
     "TypeCategory",
     "TypeCompatibilityChecker",
+    "TypeVerdict",
 
     # validators
     "attrs_signature",
+    "attrs_hash",
     "deep_equal_struct",
     "detect_obvious_constraint_conflict",
+
+    # instrumentation
+    "Instrumentation",
+    "StageMetrics",
+    "summary_records",
+    "write_jsonl",
 ]
 
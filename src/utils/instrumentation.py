@@ -0,0 +1,232 @@
+"""
+utils/instrumentation.py
+
+Замеры производительности по этапам конвейера и по правилам.
+
+Для каждого этапа (stage) накапливаются:
+- wall_time — астрономическое время (perf_counter), с
+- cpu_time — процессорное время (process_time), с
+- peak_memory — пик прироста выделенной памяти (tracemalloc), байты;
+  только при trace_memory=True, т.к. tracemalloc заметно замедляет работу
+- calls — число входов в этап
+- counts — счётчики обработанных сущностей (objects, edges, conflicts, ...)
+
+Этапы могут быть вложенными: пик внутреннего этапа учитывается и во внешнем.
+
+Пример:
+    instr = Instrumentation(trace_memory=True)
+    with instr.stage("parsing") as st:
+        objects = parse(...)
+        st.count(objects=len(objects))
+    instr.summary()            # → dict для блока performance отчёта
+    instr.export_jsonl(path)   # → по строке JSON на этап
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+
+@dataclass
+class StageMetrics:
+    """Накопленные метрики одного этапа."""
+
+    name: str
+    calls: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: Optional[int] = None
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    def count(self, **counts: int) -> None:
+        for k, v in counts.items():
+            self.counts[k] = self.counts.get(k, 0) + int(v)
+
+    def add(self, wall_time: float, cpu_time: float, peak_memory: Optional[int] = None) -> None:
+        self.calls += 1
+        self.wall_time += wall_time
+        self.cpu_time += cpu_time
+        if peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, peak_memory)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "calls": self.calls,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+        }
+        if self.peak_memory is not None:
+            data["peak_memory"] = self.peak_memory
+        if self.counts:
+            data["counts"] = dict(self.counts)
+        return data
+
+
+class _Frame:
+    """Открытый этап на стеке (для учёта пика памяти вложенных этапов)."""
+
+    __slots__ = ("start_current", "peak")
+
+    def __init__(self, start_current: int):
+        self.start_current = start_current
+        self.peak = start_current
+
+
+class Instrumentation:
+    """
+    Сборщик метрик по этапам. Один экземпляр — на один детектор.
+    """
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = False):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self._stages: Dict[str, StageMetrics] = {}
+        self._frames: List[_Frame] = []
+        self._owns_tracing = False
+
+    # -------------------------
+    # сбор
+    # -------------------------
+
+    def metrics(self, name: str) -> StageMetrics:
+        m = self._stages.get(name)
+        if m is None:
+            m = self._stages[name] = StageMetrics(name)
+        return m
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        """
+        Замер этапа целиком: время и (при trace_memory) пик памяти.
+        """
+        m = self.metrics(name)
+        if not self.enabled:
+            yield m
+            return
+
+        frame = self._push_frame() if self.trace_memory else None
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+        try:
+            yield m
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            peak = self._pop_frame(frame) if frame is not None else None
+            m.add(wall, cpu, peak)
+
+    def iterate(self, name: str, iterable: Iterable[T], unit: str = "items") -> Iterator[T]:
+        """
+        Проксирует ленивый итератор и относит к этапу name только время
+        получения элементов (например, токенизацию в потоковом конвейере).
+        Число элементов пишется в counts[unit]. Память здесь не замеряется.
+        """
+        if not self.enabled:
+            yield from iterable
+            return
+
+        m = self.metrics(name)
+        it = iter(iterable)
+        while True:
+            wall0 = time.perf_counter()
+            cpu0 = time.process_time()
+            try:
+                item = next(it)
+            except StopIteration:
+                m.add(time.perf_counter() - wall0, time.process_time() - cpu0)
+                return
+            m.add(time.perf_counter() - wall0, time.process_time() - cpu0)
+            m.count(**{unit: 1})
+            yield item
+
+    def record(self, name: str, wall_time: float, cpu_time: float, **counts: int) -> None:
+        """Добавляет метрики, измеренные вне этого объекта (например, в пуле)."""
+        if not self.enabled:
+            return
+        m = self.metrics(name)
+        m.add(wall_time, cpu_time)
+        m.count(**counts)
+
+    def reset(self) -> None:
+        self._stages.clear()
+
+    # -------------------------
+    # tracemalloc
+    # -------------------------
+
+    def _push_frame(self) -> _Frame:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+        current, peak = tracemalloc.get_traced_memory()
+        if self._frames:
+            outer = self._frames[-1]
+            outer.peak = max(outer.peak, peak)
+        tracemalloc.reset_peak()
+
+        frame = _Frame(current)
+        self._frames.append(frame)
+        return frame
+
+    def _pop_frame(self, frame: _Frame) -> int:
+        _, peak = tracemalloc.get_traced_memory()
+        self._frames.pop()
+        peak = max(frame.peak, peak)
+
+        if self._frames:
+            outer = self._frames[-1]
+            outer.peak = max(outer.peak, peak)
+        elif self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+        return peak - frame.start_current
+
+    # -------------------------
+    # вывод
+    # -------------------------
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Метрики по этапам (в порядке первого входа) — для блока performance."""
+        return {name: m.to_dict() for name, m in self._stages.items()}
+
+    def export_jsonl(self, target: Union[str, Path, IO[str]], **context: Any) -> None:
+        """
+        Дописывает метрики в формате JSON Lines: одна строка на этап.
+        context — дополнительные поля каждой строки (например, run_id).
+        """
+        write_jsonl(summary_records(self.summary(), **context), target)
+
+
+def summary_records(summary: Dict[str, Dict[str, Any]], **context: Any) -> List[Dict[str, Any]]:
+    """
+    Превращает summary() (или блок performance["stages"] готового отчёта)
+    в плоские записи для JSON Lines.
+    """
+    timestamp = datetime.now().isoformat()
+    return [
+        {"timestamp": timestamp, **context, "stage": name, **metrics}
+        for name, metrics in summary.items()
+    ]
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], target: Union[str, Path, IO[str]]) -> None:
+    lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    if isinstance(target, (str, Path)):
+        with open(target, "a", encoding="utf-8") as f:
+            f.write(lines)
+    else:
+        target.write(lines)
+
+
+__all__ = ["Instrumentation", "StageMetrics", "summary_records", "write_jsonl"]
@@ -7,6 +7,8 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Set, List, Tuple, Optional, Any
 from enum import Enum
 import re
@@ -43,6 +45,20 @@ class TypeCategory(Enum):
 _ARRAY_SUFFIX_RE = re.compile(r"\[\s*\]\s*$")
 
 
+@dataclass(frozen=True)
+class TypeVerdict:
+    """
+    Вердикт по изменению типа from → to (элемент матрицы вердиктов).
+    risk: SAFE | WARNING | DANGEROUS | INCOMPATIBLE
+    """
+    compatible: bool
+    narrowing: bool
+    widening: bool
+    risk: str
+    category_from: TypeCategory
+    category_to: TypeCategory
+
+
 class TypeCompatibilityChecker:
     """
     Проверяет совместимость типов данных PostgreSQL.
@@ -246,7 +262,13 @@ class TypeCompatibilityChecker:
         "NUMERIC": {"DOUBLE PRECISION"},
     }
 
+    # Скомпилированные таблицы (см. _compile, строятся при первом вердикте):
+    # канонический тип -> номер и плотная матрица вердиктов [номер A][номер B]
+    _TYPE_IDS: Optional[Dict[str, int]] = None
+    _VERDICTS: List[List["TypeVerdict"]] = []
+
     @classmethod
+    @lru_cache(maxsize=4096)
     def normalize_type(cls, type_str: str) -> str:
         """
         Нормализует строку типа данных.
@@ -255,6 +277,8 @@ class TypeCompatibilityChecker:
         - модификаторы (VARCHAR(255) -> VARCHAR)
         - массивы (integer[] -> INTEGER[])
         - внутренние имена массивов PostgreSQL (_INT4 -> INTEGER[])
+
+        Результат кэшируется: в схеме немного различных строк типов.
         """
         if not type_str:
             return "UNKNOWN"
@@ -288,74 +312,31 @@ class TypeCompatibilityChecker:
 
     @classmethod
     def get_type_category(cls, type_str: str) -> TypeCategory:
-        normalized = cls.normalize_type(type_str)
-        if normalized.endswith("[]"):
-            return TypeCategory.ARRAY
-        base = normalized[:-2] if normalized.endswith("[]") else normalized
-        return cls.TYPE_CATEGORIES.get(base, TypeCategory.UNKNOWN)
+        return cls._category_of(cls.normalize_type(type_str))
 
     @classmethod
     def are_compatible(cls, type_a: str, type_b: str) -> bool:
-        norm_a = cls.normalize_type(type_a)
-        norm_b = cls.normalize_type(type_b)
-
-        if norm_a == norm_b:
-            return True
-
-        if (norm_a, norm_b) in cls.INCOMPATIBLE_PAIRS:
-            return False
-
-        if norm_a in cls.COMPATIBILITY_MATRIX:
-            return norm_b in cls.COMPATIBILITY_MATRIX[norm_a]
-
-        if norm_b in cls.COMPATIBILITY_MATRIX:
-            return norm_a in cls.COMPATIBILITY_MATRIX[norm_b]
-
-        category_a = cls.get_type_category(norm_a)
-        category_b = cls.get_type_category(norm_b)
-
-        if category_a == category_b and category_a != TypeCategory.UNKNOWN:
-            if category_a in (TypeCategory.INTEGER, TypeCategory.DECIMAL, TypeCategory.FLOAT):
-                return cls._are_numeric_types_compatible(norm_a, norm_b)
-            if category_a == TypeCategory.ARRAY:
-                # если оба массивы, но не попали в матрицу — считаем совместимыми только если одинаковая база
-                return norm_a == norm_b
-            return True
-
-        return False
-
-    @classmethod
-    def _are_numeric_types_compatible(cls, type_a: str, type_b: str) -> bool:
-        numeric_types = {
-            "SMALLINT", "INTEGER", "BIGINT",
-            "REAL", "DOUBLE PRECISION",
-            "NUMERIC", "DECIMAL",
-        }
-        return type_a in numeric_types and type_b in numeric_types
+        return cls.verdict(type_a, type_b).compatible
 
     @classmethod
     def is_narrowing_conversion(cls, from_type: str, to_type: str) -> bool:
-        norm_from = cls.normalize_type(from_type)
-        norm_to = cls.normalize_type(to_type)
-        return norm_to in cls.NARROWING_CONVERSIONS.get(norm_from, set())
+        return cls.verdict(from_type, to_type).narrowing
 
     @classmethod
     def is_widening_conversion(cls, from_type: str, to_type: str) -> bool:
-        norm_from = cls.normalize_type(from_type)
-        norm_to = cls.normalize_type(to_type)
-        return norm_to in cls.WIDENING_CONVERSIONS.get(norm_from, set())
+        return cls.verdict(from_type, to_type).widening
 
     @classmethod
     def get_conversion_risk_level(cls, from_type: str, to_type: str) -> str:
-        if not cls.are_compatible(from_type, to_type):
-            return "INCOMPATIBLE"
-        if cls.is_narrowing_conversion(from_type, to_type):
-            return "DANGEROUS"
-        if cls.is_widening_conversion(from_type, to_type):
-            return "SAFE"
-        norm_from = cls.normalize_type(from_type)
-        norm_to = cls.normalize_type(to_type)
-        return "WARNING" if norm_from != norm_to else "SAFE"
+        return cls.verdict(from_type, to_type).risk
+
+    @classmethod
+    def verdict(cls, from_type: str, to_type: str) -> "TypeVerdict":
+        """
+        Вердикт по изменению типа: одна нормализация каждой строки (из кэша)
+        и одно обращение к матрице вердиктов.
+        """
+        return cls._verdict_normalized(cls.normalize_type(from_type), cls.normalize_type(to_type))
 
     @classmethod
     def analyze_type_change(
@@ -367,6 +348,7 @@ class TypeCompatibilityChecker:
     ) -> Dict[str, Any]:
         norm_old = cls.normalize_type(old_type)
         norm_new = cls.normalize_type(new_type)
+        verdict = cls._verdict_normalized(norm_old, norm_new)
 
         analysis: Dict[str, Any] = {
             "old_type": old_type,
@@ -374,12 +356,12 @@ class TypeCompatibilityChecker:
             "normalized_old": norm_old,
             "normalized_new": norm_new,
             "is_same_type": norm_old == norm_new,
-            "are_compatible": cls.are_compatible(old_type, new_type),
-            "conversion_risk": cls.get_conversion_risk_level(old_type, new_type),
-            "is_narrowing": cls.is_narrowing_conversion(old_type, new_type),
-            "is_widening": cls.is_widening_conversion(old_type, new_type),
-            "category_old": cls.get_type_category(old_type).value,
-            "category_new": cls.get_type_category(new_type).value,
+            "are_compatible": verdict.compatible,
+            "conversion_risk": verdict.risk,
+            "is_narrowing": verdict.narrowing,
+            "is_widening": verdict.widening,
+            "category_old": verdict.category_from.value,
+            "category_new": verdict.category_to.value,
         }
 
         if not analysis["are_compatible"]:
@@ -402,6 +384,117 @@ class TypeCompatibilityChecker:
 
         return analysis
 
+    # -------------------------
+    # Скомпилированные таблицы
+    # -------------------------
+
+    @classmethod
+    def _compile(cls) -> None:
+        """
+        Строит таблицы по матрицам класса: номер каждого канонического типа,
+        упомянутого в матрицах, и вердикты для всех пар таких типов.
+        Пары с типами вне таблиц вычисляются по правилам (и кэшируются).
+        """
+        names: Set[str] = set(cls.COMPATIBILITY_MATRIX) | set(cls.TYPE_CATEGORIES)
+        names |= set(cls.NARROWING_CONVERSIONS) | set(cls.WIDENING_CONVERSIONS)
+        names |= set(cls.ARRAY_INTERNAL_ALIASES.values())
+        for targets in (
+            *cls.COMPATIBILITY_MATRIX.values(),
+            *cls.NARROWING_CONVERSIONS.values(),
+            *cls.WIDENING_CONVERSIONS.values(),
+        ):
+            names |= targets
+        for pair in cls.INCOMPATIBLE_PAIRS:
+            names |= set(pair)
+
+        canonical = sorted({cls.normalize_type(name) for name in names})
+        cls._TYPE_IDS = {name: i for i, name in enumerate(canonical)}
+        cls._VERDICTS = [[cls._compute_verdict(a, b) for b in canonical] for a in canonical]
+        cls._verdict_uncompiled.cache_clear()
+
+    @classmethod
+    def _verdict_normalized(cls, norm_from: str, norm_to: str) -> "TypeVerdict":
+        ids = cls._TYPE_IDS
+        if ids is None:
+            cls._compile()
+            ids = cls._TYPE_IDS
+        i = ids.get(norm_from)
+        j = ids.get(norm_to)
+        if i is not None and j is not None:
+            return cls._VERDICTS[i][j]
+        return cls._verdict_uncompiled(norm_from, norm_to)
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _verdict_uncompiled(cls, norm_from: str, norm_to: str) -> "TypeVerdict":
+        return cls._compute_verdict(norm_from, norm_to)
+
+    @classmethod
+    def _compute_verdict(cls, norm_from: str, norm_to: str) -> "TypeVerdict":
+        compatible = cls._are_normalized_compatible(norm_from, norm_to)
+        narrowing = norm_to in cls.NARROWING_CONVERSIONS.get(norm_from, set())
+        widening = norm_to in cls.WIDENING_CONVERSIONS.get(norm_from, set())
+
+        if not compatible:
+            risk = "INCOMPATIBLE"
+        elif narrowing:
+            risk = "DANGEROUS"
+        elif widening:
+            risk = "SAFE"
+        else:
+            risk = "WARNING" if norm_from != norm_to else "SAFE"
+
+        return TypeVerdict(
+            compatible=compatible,
+            narrowing=narrowing,
+            widening=widening,
+            risk=risk,
+            category_from=cls._category_of(norm_from),
+            category_to=cls._category_of(norm_to),
+        )
+
+    @classmethod
+    def _category_of(cls, normalized: str) -> TypeCategory:
+        if normalized.endswith("[]"):
+            return TypeCategory.ARRAY
+        return cls.TYPE_CATEGORIES.get(normalized, TypeCategory.UNKNOWN)
+
+    @classmethod
+    def _are_normalized_compatible(cls, norm_a: str, norm_b: str) -> bool:
+        if norm_a == norm_b:
+            return True
+
+        if (norm_a, norm_b) in cls.INCOMPATIBLE_PAIRS:
+            return False
+
+        if norm_a in cls.COMPATIBILITY_MATRIX:
+            return norm_b in cls.COMPATIBILITY_MATRIX[norm_a]
+
+        if norm_b in cls.COMPATIBILITY_MATRIX:
+            return norm_a in cls.COMPATIBILITY_MATRIX[norm_b]
+
+        category_a = cls._category_of(cls.normalize_type(norm_a))
+        category_b = cls._category_of(cls.normalize_type(norm_b))
+
+        if category_a == category_b and category_a != TypeCategory.UNKNOWN:
+            if category_a in (TypeCategory.INTEGER, TypeCategory.DECIMAL, TypeCategory.FLOAT):
+                return cls._are_numeric_types_compatible(norm_a, norm_b)
+            if category_a == TypeCategory.ARRAY:
+                # если оба массивы, но не попали в матрицу — считаем совместимыми только если одинаковая база
+                return norm_a == norm_b
+            return True
+
+        return False
+
+    @classmethod
+    def _are_numeric_types_compatible(cls, type_a: str, type_b: str) -> bool:
+        numeric_types = {
+            "SMALLINT", "INTEGER", "BIGINT",
+            "REAL", "DOUBLE PRECISION",
+            "NUMERIC", "DECIMAL",
+        }
+        return type_a in numeric_types and type_b in numeric_types
+
     @classmethod
     def find_potential_type_conflicts(cls, type_changes: List[Dict]) -> List[Dict]:
         conflicts: List[Dict] = []
@@ -460,3 +553,4 @@ class TypeCompatibilityChecker:
         if normalized.endswith("[]"):
             return None  # зависит от элементов/overhead
         return size_map.get(normalized)
+
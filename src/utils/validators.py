@@ -59,12 +59,32 @@ def attrs_signature(
     if not attrs:
         return tuple()
 
-    ignore = set(ignore_keys or _DEFAULT_IGNORE_KEYS)
+    ignore = set(_DEFAULT_IGNORE_KEYS if ignore_keys is None else ignore_keys)
     filtered = {k: v for k, v in attrs.items() if k not in ignore}
 
     return _freeze(filtered)
 
 
+def attrs_hash(
+    attrs: Optional[Dict[str, Any]],
+    *,
+    ignore_keys: Optional[Iterable[str]] = None
+) -> int:
+    """
+    Хэш сигнатуры атрибутов (attrs_signature) — одно целое число на объект.
+
+    Равные сигнатуры дают равные хэши; обратное верно с точностью до
+    коллизий. Значения хэша зависят от процесса (PYTHONHASHSEED), поэтому
+    между процессами их можно сравнивать только после пересчёта.
+    Сигнатуры с нехэшируемыми значениями хэшируются по repr.
+    """
+    signature = attrs_signature(attrs, ignore_keys=ignore_keys)
+    try:
+        return hash(signature)
+    except TypeError:
+        return hash(repr(signature))
+
+
 def deep_equal_struct(
     a: Any,
     b: Any,
@@ -280,6 +300,7 @@ def normalize_constraint_expression(expr: str) -> str:
 
 __all__ = [
     "attrs_signature",
+    "attrs_hash",
     "deep_equal_struct",
     "detect_obvious_constraint_conflict",
     "normalize_constraint_expression",